@@ -0,0 +1,272 @@
+"""
+Aadhaar Time-Series Anomaly Engine
+==================================
+
+Vectorized anomaly scoring over the daily series of every PIN code (or any
+other entity, e.g. the district x date cuboid of the rollup cube).
+
+Rows are sorted once by (entity, date). Every statistic is then computed
+with grouped array operations over the sorted columns - no Python loop per
+entity or per day:
+
+    - rolling robust z-score: each day's value against the median and MAD of
+      the entity's previous ``window`` reporting days (trailing windows are
+      gathered as one (rows, window) block per slice of rows and masked at
+      entity boundaries, so the window never reaches into another series)
+    - seasonal deviation: each day's value against the entity's median for
+      that day of the week (once the weekday has been seen ``min_weekday``
+      times), scaled by the MAD of those residuals
+    - bio spike: the log ratio of biometric updates to enrolments against
+      its own rolling median/MAD, so a sudden jump in biometric rework at a
+      centre stands out even when its overall volume is ordinary
+
+z-scores use 1.4826 * MAD as the robust standard deviation. Counts are at
+least Poisson-noisy, so for the count scores it is floored at the square
+root of the baseline mean (and at min_scale), and for the log ratio at its
+Poisson standard error; otherwise sparse or nearly constant series, whose
+MAD is 0, would flag every change.
+A day's anomaly score is the largest of the three (only upward bio spikes
+count); days scoring at least ``threshold`` on a series with enough volume
+are flagged, and entities are ranked by their flagged days to target
+centres for follow-up.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+PINCODE_SERIES = ['state', 'district', 'pincode']
+DISTRICT_SERIES = ['state', 'district']
+SCORE_COLUMNS = ['rolling_z', 'seasonal_z', 'spike_z']
+REASONS = np.array(['rolling', 'seasonal', 'bio_spike'])
+
+# 1.4826 * MAD estimates the standard deviation of normal data
+MAD_SCALE = 1.4826
+BLOCK_ROWS = 1 << 16
+
+
+def _sorted_series(df, entity_cols):
+    """
+    Order of the rows by (entity, date) and the series each sorted row is in.
+
+    Returns:
+        tuple: order (np.ndarray), entity code and day number per sorted row
+    """
+    codes = df.groupby(entity_cols, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+    days = df['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    order = np.lexsort((days, codes))
+    return order, codes[order], days[order]
+
+
+def _series_start(codes):
+    """First row of each row's series, for rows sorted by entity code."""
+    first = np.ones(len(codes), dtype=bool)
+    first[1:] = codes[1:] != codes[:-1]
+    return np.maximum.accumulate(np.where(first, np.arange(len(codes)), 0))
+
+
+def _row_median(block):
+    """Median of every row of a 2-D block, ignoring NaN (NaN for empty rows)."""
+    # NaN sorts last, so the valid values lead every row
+    ordered = np.sort(block, axis=1)
+    count = np.count_nonzero(~np.isnan(block), axis=1)
+    rows = np.arange(len(block))
+    low = ordered[rows, np.maximum(count - 1, 0) // 2]
+    high = ordered[rows, np.minimum(count // 2, block.shape[1] - 1)]
+    return (low + high) / 2, count
+
+
+def rolling_median_mad(values, codes, window=28, min_periods=7):
+    """
+    Median, MAD and mean of the previous ``window`` values of each row's series.
+
+    Args:
+        values (np.ndarray): Values sorted by (entity, date)
+        codes (np.ndarray): Entity code per value
+        window (int): Number of preceding reporting days in the window
+        min_periods (int): Fewer values give NaN
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: median, MAD, mean (float64)
+    """
+    n_rows = len(values)
+    values = values.astype(np.float64, copy=False)
+    median = np.full(n_rows, np.nan)
+    mad = np.full(n_rows, np.nan)
+    mean = np.full(n_rows, np.nan)
+    series_start = _series_start(codes)
+    lags = np.arange(window, 0, -1)
+
+    for start in range(0, n_rows, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, n_rows)
+        index = np.arange(start, stop)[:, None] - lags
+        valid = index >= series_start[start:stop, None]
+        block = np.where(valid, values[np.maximum(index, 0)], np.nan)
+
+        center, count = _row_median(block)
+        spread, _ = _row_median(np.abs(block - center[:, None]))
+        enough = count >= min_periods
+        median[start:stop] = np.where(enough, center, np.nan)
+        mad[start:stop] = np.where(enough, spread, np.nan)
+        total = np.where(valid, block, 0).sum(axis=1)
+        mean[start:stop] = np.where(enough, total / np.maximum(count, 1), np.nan)
+    return median, mad, mean
+
+
+def _reported_rolling(values, codes, reported, window, min_periods):
+    """rolling_median_mad over the reported rows only (NaN for the others)."""
+    stats = np.full((3, len(values)), np.nan)
+    stats[:, reported] = rolling_median_mad(values[reported], codes[reported], window, min_periods)
+    return stats
+
+
+def grouped_median(groups, values, n_groups):
+    """
+    Median of values per integer group, in one sort.
+
+    Args:
+        groups (np.ndarray): Group code per value (0 .. n_groups - 1)
+        values (np.ndarray): Values (no NaN)
+        n_groups (int): Number of groups
+
+    Returns:
+        np.ndarray: Median per group (NaN for empty groups)
+    """
+    order = np.lexsort((values, groups))
+    ordered = values[order].astype(np.float64)
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    median = np.full(n_groups, np.nan)
+    present = counts > 0
+    low = starts[present] + (counts[present] - 1) // 2
+    high = starts[present] + counts[present] // 2
+    median[present] = (ordered[low] + ordered[high]) / 2
+    return median
+
+
+def score_anomalies(df, entity_cols=PINCODE_SERIES, measure='total_bio_updates', window=28,
+                    min_periods=7, min_weekday=3, threshold=3.5, min_count=10,
+                    min_scale=1.0, min_log_scale=0.1):
+    """
+    Score every day of every entity's series.
+
+    Args:
+        df (pd.DataFrame): One row per entity and date with the entity
+            columns, date, measure, total_bio_updates and total_enrolments
+        entity_cols (list[str]): Columns identifying a series
+        measure (str): Column tested by the rolling and seasonal scores; a
+            single-source count, since totals over several sources jump on
+            the days all of them happen to report
+        window (int): Reporting days in the rolling baseline
+        min_periods (int): Minimum baseline length (shorter gives no score)
+        min_weekday (int): Minimum days seen per weekday for a seasonal score
+        threshold (float): Score at or above which a day is flagged
+        min_count (int): Minimum measure (or baseline median) for a flag,
+            so single-digit series are not flagged for every small change
+        min_scale (float): Floor of the robust standard deviation (counts)
+        min_log_scale (float): Floor of the robust standard deviation of
+            the bio/enrolment log ratio
+
+    Returns:
+        pd.DataFrame: Entity columns, date, measure, total_bio_updates,
+        total_enrolments, baseline (rolling median), the three z-scores,
+        anomaly_score, reason and is_anomaly; sorted by entity and date
+    """
+    order, codes, days = _sorted_series(df, entity_cols)
+    value = df[measure].to_numpy(dtype=np.float64)[order]
+    bio = df['total_bio_updates'].to_numpy(dtype=np.float64)[order]
+    enrolments = df['total_enrolments'].to_numpy(dtype=np.float64)[order]
+    # Outer-merged rows with a zero count only carry the other sources; they
+    # are gaps in the series, not drops to zero
+    reported = value > 0
+
+    # 1. Rolling robust z-score of the measure
+    baseline, mad, level = _reported_rolling(value, codes, reported, window, min_periods)
+    noise = np.maximum(np.sqrt(level), min_scale)
+    rolling_z = (value - baseline) / np.maximum(MAD_SCALE * mad, noise)
+
+    # 2. Deviation from the entity's day-of-week profile
+    n_entities = int(codes.max()) + 1 if len(codes) else 0
+    # 1970-01-01 was a Thursday (Monday = 0)
+    slot = (codes * 7 + (days + 3) % 7)[reported]
+    seen = np.bincount(slot, minlength=n_entities * 7)[slot] >= min_weekday
+    residual = value[reported] - grouped_median(slot, value[reported], n_entities * 7)[slot]
+    slot_codes = codes[reported]
+    residual_mad = grouped_median(slot_codes[seen], np.abs(residual[seen]), n_entities)
+    reported_days = np.maximum(np.bincount(slot_codes, minlength=n_entities), 1)
+    series_mean = np.bincount(slot_codes, weights=value[reported], minlength=n_entities) / reported_days
+    noise = np.maximum(np.sqrt(series_mean), min_scale)[slot_codes]
+    seasonal_z = np.full(len(value), np.nan)
+    seasonal_z[reported] = np.where(
+        seen, residual / np.fmax(MAD_SCALE * residual_mad[slot_codes], noise), np.nan
+    )
+
+    # 3. Sudden rise of biometric updates relative to enrolments
+    both = (bio > 0) & (enrolments > 0)
+    log_ratio = np.log1p(bio) - np.log1p(enrolments)
+    ratio_baseline, ratio_mad, _ = _reported_rolling(log_ratio, codes, both, window, min_periods)
+    # Poisson noise of a log ratio of two counts: sqrt(1/bio + 1/enrolments)
+    ratio_noise = np.maximum(np.sqrt(1 / (bio + 1) + 1 / (enrolments + 1)), min_log_scale)
+    spike_z = (log_ratio - ratio_baseline) / np.maximum(MAD_SCALE * ratio_mad, ratio_noise)
+
+    scores = np.column_stack([np.abs(rolling_z), np.abs(seasonal_z), np.clip(spike_z, 0, None)])
+    scores = np.nan_to_num(scores, nan=0.0)
+    anomaly_score = scores.max(axis=1)
+    volume = np.where(scores.argmax(axis=1) == 2, bio, np.fmax(value, baseline))
+    is_anomaly = (anomaly_score >= threshold) & (volume >= min_count)
+
+    result = pd.DataFrame({col: df[col].to_numpy()[order] for col in entity_cols + ['date']})
+    result[measure] = value
+    result['total_bio_updates'] = bio
+    result['total_enrolments'] = enrolments
+    result['baseline'] = baseline
+    result['rolling_z'] = rolling_z
+    result['seasonal_z'] = seasonal_z
+    result['spike_z'] = spike_z
+    result['anomaly_score'] = anomaly_score
+    result['reason'] = REASONS[scores.argmax(axis=1)]
+    result['is_anomaly'] = is_anomaly
+    return result
+
+
+def rank_anomalies(scored, entity_cols=PINCODE_SERIES, measure='total_bio_updates'):
+    """
+    Flagged days, worst first, and the entities ranked by them.
+
+    Args:
+        scored (pd.DataFrame): Output of score_anomalies
+        entity_cols (list[str]): Columns identifying a series
+        measure (str): The scored measure
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: flagged days sorted by
+        anomaly_score; entities with anomalous_days, max_score,
+        excess_updates (measure above baseline on flagged days) and
+        last_anomaly, sorted by anomalous_days then max_score
+    """
+    flagged = scored[scored['is_anomaly']].drop(columns='is_anomaly')
+    flagged = flagged.sort_values('anomaly_score', ascending=False, kind='stable')
+    flagged = flagged.reset_index(drop=True)
+
+    excess = (flagged[measure] - flagged['baseline'].fillna(flagged[measure])).clip(lower=0)
+    entities = flagged.assign(excess_updates=excess).groupby(
+        entity_cols, sort=False, observed=True
+    ).agg(
+        anomalous_days=('anomaly_score', 'size'),
+        max_score=('anomaly_score', 'max'),
+        excess_updates=('excess_updates', 'sum'),
+        last_anomaly=('date', 'max'),
+    ).reset_index()
+    entities = entities.sort_values(['anomalous_days', 'max_score'], ascending=False, kind='stable')
+    return flagged, entities.reset_index(drop=True)
+
+
+def detect_series_anomalies(df, entity_cols=PINCODE_SERIES, measure='total_bio_updates', **options):
+    """
+    Score and rank in one call (see score_anomalies for the options).
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: flagged days, ranked entities
+    """
+    scored = score_anomalies(df, entity_cols, measure, **options)
+    return rank_anomalies(scored, entity_cols, measure)
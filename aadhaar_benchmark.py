@@ -0,0 +1,391 @@
+"""
+Aadhaar Benchmark Harness
+=========================
+
+Synthetic UIDAI-style extracts and per-stage benchmarks of the pipeline.
+
+generate_synthetic_data writes enrolment, demographic and biometric CSV
+drops with the exact schemas the loaders expect (date as %d-%m-%Y,
+state/district/pincode, and the age_*/demo_age_*/bio_age_* counts). The
+generator is configurable:
+
+    - rows per source and rows per file
+    - number of pincodes (each maps to one district of one state) and days
+    - duplicate rate: share of rows that exactly repeat another row of their file
+    - key overlap: share of (date, pincode) keys drawn from a pool shared by
+      all three sources; the rest come from source-private key pools
+
+Data is produced file by file from a seeded generator, so a 50M-row drop
+needs no more memory than one file and is reproducible.
+
+run_benchmark generates (or reuses) a dataset per size, runs a pipeline on
+it and collects the per-stage run report (wall/CPU time, RSS, rows and
+DataFrame memory, see aadhaar_instrumentation). Every result is appended to
+a history CSV tagged with the code version (git commit), and each run is
+compared against the previous result for the same size and pipeline.
+
+benchmark_compiled_forest times the flat-array forest export
+(aadhaar_compiled_forest) against the estimator's own predict, in rows per
+second on the same rows.
+
+Usage:
+    python aadhaar_benchmark.py --sizes 1M 10M 50M --pipeline streaming
+    python aadhaar_benchmark.py --compiled-forest
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aadhaar_ingestion import DATE_FORMAT, SOURCE_SCHEMAS
+from aadhaar_validation import KNOWN_STATES
+
+
+BENCHMARK_SIZES = {'1M': 1_000_000, '10M': 10_000_000, '50M': 50_000_000}
+PIPELINES = ['complete', 'streaming']
+STAGE_FIELDS = [
+    'stage', 'status', 'wall_seconds', 'cpu_seconds', 'child_cpu_seconds', 'peak_rss_mb',
+    'peak_rss_delta_mb', 'rows_in', 'rows_out', 'frames_in_mb', 'frames_out_mb',
+]
+HISTORY_FIELDS = ['timestamp', 'version', 'size', 'rows_per_source', 'pipeline', 'n_jobs'] + STAGE_FIELDS
+# Mean count per row for each source (Poisson)
+COUNT_MEANS = {'enrolment': 5.0, 'demographic': 8.0, 'biometric': 8.0}
+
+
+def _key_pools(n_keys, overlap):
+    """
+    Split the key space into a shared pool and one private pool per source.
+
+    Returns:
+        tuple[tuple[int, int], dict[str, tuple[int, int]]]: (start, size) of
+        the shared pool and of each source's private pool
+    """
+    shared = max(1, int(n_keys * overlap))
+    private = max(1, (n_keys - shared) // len(SOURCE_SCHEMAS))
+    pools = {source: (shared + i * private, private) for i, source in enumerate(SOURCE_SCHEMAS)}
+    return (0, shared), pools
+
+
+def _scramble(keys, n_keys):
+    """
+    Bijective shuffle of key ids, so every pool spans all days and pincodes.
+    """
+    multiplier = 2_654_435_761 % n_keys or 1
+    while np.gcd(multiplier, n_keys) != 1:
+        multiplier += 1
+    return (keys * multiplier) % n_keys
+
+
+def _synthetic_chunk(rng, source, n_rows, geography, dates, key_pools, overlap, duplicate_rate):
+    """One file worth of rows for a source."""
+    (shared_start, shared_size), private_pools = key_pools
+    private_start, private_size = private_pools[source]
+    n_keys = len(dates) * len(geography['pincode'])
+
+    keys = np.where(
+        rng.random(n_rows) < overlap,
+        shared_start + rng.integers(0, shared_size, n_rows),
+        private_start + rng.integers(0, private_size, n_rows),
+    )
+    keys = _scramble(keys.astype(np.int64), n_keys)
+    day = keys % len(dates)
+    pin = keys // len(dates)
+
+    # Exact repeats of other rows of the same file
+    n_duplicates = min(int(n_rows * duplicate_rate), n_rows // 2)
+    if n_duplicates:
+        targets = rng.choice(n_rows, n_duplicates, replace=False)
+        originals = rng.choice(np.setdiff1d(np.arange(n_rows), targets), n_duplicates)
+        day[targets] = day[originals]
+        pin[targets] = pin[originals]
+
+    frame = {
+        'date': dates[day],
+        'state': geography['state'][pin],
+        'district': geography['district'][pin],
+        'pincode': geography['pincode'][pin],
+    }
+    for col in SOURCE_SCHEMAS[source]['count_columns']:
+        counts = rng.poisson(COUNT_MEANS[source], n_rows).astype(np.int32)
+        if n_duplicates:
+            counts[targets] = counts[originals]
+        frame[col] = counts
+    return pd.DataFrame(frame)
+
+
+def generate_synthetic_data(base_path, rows=1_000_000, n_pincodes=20_000, n_days=365,
+                            n_states=36, n_districts=700, duplicate_rate=0.02,
+                            overlap=0.6, file_rows=500_000, seed=0):
+    """
+    Write synthetic enrolment, demographic and biometric CSV drops.
+
+    Args:
+        base_path (str | Path): Directory to create the three data folders in
+        rows (int | dict[str, int]): Rows per source (or per source name)
+        n_pincodes (int): Distinct pincodes
+        n_days (int): Distinct dates, starting 01-01-2025
+        n_states (int): Distinct states (real names, so they pass validation)
+        n_districts (int): Distinct districts (spread over the states)
+        duplicate_rate (float): Share of rows that exactly repeat another row of their file
+        overlap (float): Share of the key space shared by all three sources
+        file_rows (int): Rows per CSV file
+        seed (int): Random seed
+
+    Returns:
+        dict: The generation parameters (also written to benchmark_data.json)
+    """
+    if not 0 <= overlap <= 1 or not 0 <= duplicate_rate < 1:
+        raise ValueError("overlap must be in [0, 1] and duplicate_rate in [0, 1)")
+    if n_pincodes > 880_000:
+        raise ValueError("At most 880,000 distinct 6-digit pincodes can be generated")
+    if n_states > len(KNOWN_STATES):
+        raise ValueError(f"At most {len(KNOWN_STATES)} distinct states can be generated")
+    base_path = Path(base_path)
+    rows = rows if isinstance(rows, dict) else {source: rows for source in SOURCE_SCHEMAS}
+    params = {
+        'rows': rows, 'n_pincodes': n_pincodes, 'n_days': n_days, 'n_states': n_states,
+        'n_districts': n_districts, 'duplicate_rate': duplicate_rate, 'overlap': overlap,
+        'file_rows': file_rows, 'seed': seed,
+    }
+
+    states = np.array(KNOWN_STATES[:n_states], dtype=object)
+    districts = np.array([f'District {i:03d}' for i in range(n_districts)], dtype=object)
+    pin_district = np.arange(n_pincodes) % n_districts
+    geography = {
+        'pincode': (110_000 + np.arange(n_pincodes) * (880_000 // n_pincodes)).astype(np.int32),
+        'district': districts[pin_district],
+        'state': states[pin_district % n_states],
+    }
+    dates = pd.date_range('2025-01-01', periods=n_days).strftime(DATE_FORMAT).to_numpy(dtype=object)
+    pools = _key_pools(n_days * n_pincodes, overlap)
+
+    rng = np.random.default_rng(seed)
+    for source, schema in SOURCE_SCHEMAS.items():
+        folder = base_path / schema['folder']
+        folder.mkdir(parents=True, exist_ok=True)
+        for old_file in folder.glob('*.csv'):
+            old_file.unlink()
+        for start in range(0, rows[source], file_rows):
+            stop = min(start + file_rows, rows[source])
+            chunk = _synthetic_chunk(rng, source, stop - start, geography, dates, pools,
+                                     overlap, duplicate_rate)
+            chunk.to_csv(folder / f"{schema['folder']}_{start}_{stop}.csv", index=False)
+
+    (base_path / 'benchmark_data.json').write_text(json.dumps(params, indent=2))
+    return params
+
+
+def code_version():
+    """Short git commit of the code under test ('unknown' outside a checkout)."""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent, check=True
+        )
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+            text=True, cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+        return result.stdout.strip() + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def _ensure_dataset(data_dir, rows, generator_options):
+    """Generate a dataset unless one with identical parameters already exists."""
+    request_path = Path(data_dir) / 'benchmark_request.json'
+    request = json.dumps({'rows': rows, **generator_options}, sort_keys=True)
+    if request_path.exists() and request_path.read_text() == request:
+        print(f"  ✓ Reusing synthetic data: {data_dir}")
+        return
+    print(f"  Generating {rows:,} rows per source in {data_dir}...")
+    generate_synthetic_data(data_dir, rows=rows, **generator_options)
+    request_path.write_text(request)
+    print("  ✓ Synthetic data generated")
+
+
+def run_benchmark(sizes=('1M',), work_dir='benchmarks', pipeline='complete', n_jobs=None,
+                  history_path=None, system_options=None, **generator_options):
+    """
+    Benchmark a pipeline on synthetic data of one or more sizes.
+
+    Args:
+        sizes (iterable[str | int]): Rows per source, as keys of BENCHMARK_SIZES
+            or plain integers
+        work_dir (str | Path): Directory for datasets, outputs and the history
+        pipeline (str): 'complete' or 'streaming'
+        n_jobs (int | None): Worker count passed to the system
+        history_path (str | Path): History CSV (default: <work_dir>/history.csv)
+        system_options (dict): Extra AadhaarIntelligenceSystem keyword arguments
+            (the model is retrained on every run unless 'retrain' is given)
+        **generator_options: Passed to generate_synthetic_data
+
+    Returns:
+        pd.DataFrame: One row per (size, stage) of this benchmark run
+    """
+    # Imported here so data generation alone does not load the modelling stack
+    from aadhaar_intelligence_system import AadhaarIntelligenceSystem
+
+    if pipeline not in PIPELINES:
+        raise ValueError(f"pipeline must be one of {PIPELINES}, got {pipeline!r}")
+    work_dir = Path(work_dir)
+    history_path = Path(history_path) if history_path else work_dir / 'history.csv'
+    version = code_version()
+    timestamp = datetime.now().isoformat(timespec='seconds')
+
+    results = []
+    for size in sizes:
+        rows = BENCHMARK_SIZES[size] if size in BENCHMARK_SIZES else int(size)
+        label = size if size in BENCHMARK_SIZES else f'{rows:,}'
+        print("=" * 80)
+        print(f"BENCHMARK: {label} rows per source | pipeline: {pipeline} | version: {version}")
+        print("=" * 80)
+
+        data_dir = work_dir / f'data_{rows}'
+        _ensure_dataset(data_dir, rows, generator_options)
+
+        system = AadhaarIntelligenceSystem(
+            data_dir, n_jobs=n_jobs, **{'retrain': 'always', **(system_options or {})}
+        )
+        if pipeline == 'streaming':
+            system.run_streaming_pipeline()
+        else:
+            system.run_complete_pipeline()
+
+        for stage in system.run_report.stages:
+            results.append({
+                'timestamp': timestamp, 'version': version, 'size': label,
+                'rows_per_source': rows, 'pipeline': pipeline,
+                'n_jobs': n_jobs or os.cpu_count(),
+                **{field: stage.get(field) for field in STAGE_FIELDS},
+            })
+
+    results = pd.DataFrame(results, columns=HISTORY_FIELDS)
+    previous = pd.read_csv(history_path) if history_path.exists() else None
+    if previous is not None:
+        print_comparison(previous, results)
+
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    results.to_csv(history_path, mode='a', header=previous is None, index=False)
+    print(f"\n✓ Benchmark history updated: {history_path}\n")
+    return results
+
+
+def benchmark_compiled_forest(rows=200_000, train_rows=20_000, n_features=12, repeats=3,
+                              candidate=None, seed=0):
+    """
+    Prediction throughput of a compiled forest against its estimator.
+
+    Both score the same random float32 rows single-threaded; the best of
+    `repeats` timings is kept.
+
+    Args:
+        rows (int): Rows to score
+        train_rows (int): Rows to fit the forest on
+        n_features (int): Feature count
+        repeats (int): Timed runs per scorer
+        candidate (dict | None): Tree-ensemble grid candidate to fit
+            (default: aadhaar_model_selection.DEFAULT_CANDIDATE)
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: One row per scorer with seconds and rows_per_second
+    """
+    # Imported here so data generation alone does not load sklearn
+    from aadhaar_compiled_forest import compile_forest
+    from aadhaar_model_selection import DEFAULT_CANDIDATE, make_estimator
+
+    rng = np.random.default_rng(seed)
+    X_train = rng.random((train_rows, n_features), dtype=np.float32)
+    y_train = X_train @ rng.random(n_features) + rng.random(train_rows)
+    model = make_estimator(candidate or DEFAULT_CANDIDATE, n_jobs=1).fit(X_train, y_train)
+    compiled = compile_forest(model)
+    X = rng.random((rows, n_features), dtype=np.float32)
+
+    results = []
+    for scorer, predict in [('estimator', model.predict), ('compiled', compiled.predict)]:
+        seconds = min(_timed(predict, X) for _ in range(repeats))
+        results.append({'scorer': scorer, 'rows': rows, 'seconds': round(seconds, 4),
+                        'rows_per_second': round(rows / seconds)})
+    results = pd.DataFrame(results)
+    print(f"\nFOREST PREDICTION: {compiled.n_trees} trees, depth {compiled.max_depth}, {rows:,} rows")
+    print("-" * 80)
+    print(results.to_string(index=False))
+    return results
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def print_comparison(history, results):
+    """
+    Print wall time and peak RSS of each stage against the most recent
+    earlier result for the same size, pipeline and stage.
+    """
+    keys = ['size', 'pipeline', 'stage']
+    history = history[history['timestamp'] < results['timestamp'].iloc[0]] if len(results) else history
+    if history.empty:
+        return
+    latest = history.sort_values('timestamp').groupby(keys, sort=False).tail(1)
+    merged = results.merge(latest, on=keys, how='left', suffixes=('', '_prev'))
+
+    print("\nCOMPARISON WITH PREVIOUS RUN:")
+    print("-" * 80)
+    comparison = pd.DataFrame({
+        'size': merged['size'],
+        'stage': merged['stage'],
+        'version_prev': merged['version_prev'],
+        'wall_s': merged['wall_seconds'].round(2),
+        'wall_prev_s': merged['wall_seconds_prev'].round(2),
+        'wall_change_%': ((merged['wall_seconds'] / merged['wall_seconds_prev'] - 1) * 100).round(1),
+        'peak_rss_mb': merged['peak_rss_mb'],
+        'peak_rss_prev_mb': merged['peak_rss_mb_prev'],
+    })
+    print(comparison.to_string(index=False))
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', nargs='+', default=['1M'],
+                        help="Rows per source: 1M, 10M, 50M or an integer")
+    parser.add_argument('--pipeline', choices=PIPELINES, default='complete')
+    parser.add_argument('--work-dir', default='benchmarks')
+    parser.add_argument('--n-jobs', type=int, default=None)
+    parser.add_argument('--pincodes', type=int, default=20_000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--duplicate-rate', type=float, default=0.02)
+    parser.add_argument('--overlap', type=float, default=0.6)
+    parser.add_argument('--file-rows', type=int, default=500_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--generate-only', action='store_true',
+                        help="Only write the synthetic datasets")
+    parser.add_argument('--compiled-forest', action='store_true',
+                        help="Only time compiled-forest against estimator predictions")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    generator_options = {
+        'n_pincodes': args.pincodes, 'n_days': args.days, 'duplicate_rate': args.duplicate_rate,
+        'overlap': args.overlap, 'file_rows': args.file_rows, 'seed': args.seed,
+    }
+    if args.compiled_forest:
+        benchmark_compiled_forest(seed=args.seed)
+    elif args.generate_only:
+        for size in args.sizes:
+            rows = BENCHMARK_SIZES[size] if size in BENCHMARK_SIZES else int(size)
+            _ensure_dataset(Path(args.work_dir) / f'data_{rows}', rows, generator_options)
+    else:
+        run_benchmark(args.sizes, work_dir=args.work_dir, pipeline=args.pipeline,
+                      n_jobs=args.n_jobs, **generator_options)
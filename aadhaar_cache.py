@@ -0,0 +1,295 @@
+"""
+Aadhaar Cleaned-Source Cache
+============================
+
+On-disk columnar cache of cleaned enrolment/demographic/biometric drops.
+
+Every raw CSV is cleaned on its own (cleaning is row-wise) and the result is
+stored as one Parquet file per source file. A JSON manifest records each
+source file's size, modification time and content hash:
+
+    - size + mtime unchanged      -> cache hit, no hashing, no parsing
+    - size/mtime changed, same hash -> cache hit (file was only touched)
+    - hash changed or new file    -> cache miss, read-and-clean, store
+
+Cross-file deduplication is applied after the cached frames are combined,
+so a warm run produces the same cleaned frames as a cold one.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from aadhaar_ingestion import (
+    KEY_COLUMNS, SOURCE_SCHEMAS, clean_source_frame, concat_preallocated, read_source_file, source_files
+)
+from aadhaar_normalization import DEFAULT_NORMALIZER
+from aadhaar_validation import combine_validation_reports
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+# Bump whenever clean_source_frame changes what it produces.
+CACHE_VERSION = 2
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path):
+    """
+    Hash a file's contents in fixed-size chunks.
+
+    Returns:
+        str: Hex BLAKE2b digest
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path, previous=None):
+    """
+    Fingerprint a source file by size, mtime and content hash.
+
+    The hash is only recomputed when size or mtime differ from the
+    previously recorded fingerprint.
+
+    Args:
+        path (Path): Source file
+        previous (dict | None): Fingerprint recorded in the manifest
+
+    Returns:
+        dict: {'size', 'mtime_ns', 'hash'}
+    """
+    stat = os.stat(path)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if previous and all(previous.get(k) == v for k, v in fingerprint.items()):
+        fingerprint['hash'] = previous['hash']
+    else:
+        fingerprint['hash'] = file_digest(path)
+    return fingerprint
+
+
+def _read_and_clean(path, source, normalizer=None, validator=None):
+    """Cleaned frame, quarantined rows and validation report of one file."""
+    df = read_source_file(path, source)
+    quarantine = report = None
+    if validator is not None:
+        df, quarantine, report = validator.validate(df, source)
+    return clean_source_frame(df, source, normalizer), quarantine, report
+
+
+def _write_frame(df, path):
+    if CACHE_FORMAT == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_pickle(path)
+
+
+def _read_frame(path, columns=None):
+    if CACHE_FORMAT == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+    df = pd.read_pickle(path)
+    return df if columns is None else df[columns]
+
+
+class CleanedSourceCache:
+    """
+    Content-addressed cache of cleaned source frames.
+    """
+
+    def __init__(self, cache_dir, normalizer=None, validator=None, track_removed=False):
+        """
+        Args:
+            cache_dir (str | Path): Directory holding the manifest and frames
+            normalizer (RegionNormalizer | None): Region alias maps used for
+                cleaning; entries cleaned with other maps are not reused
+            validator (RuleSet | None): Validation rules applied before
+                cleaning (None: no validation); entries validated with
+                other rules are not reused
+            track_removed (bool): Report the keys of the entries replaced
+                or pruned by load_source (for incremental retraction)
+        """
+        self.normalizer = normalizer or DEFAULT_NORMALIZER
+        self.validator = validator
+        self.track_removed = track_removed
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.cache_dir / 'manifest.json'
+        # Entries of a manifest written with other settings, pruned on the next save
+        self._stale = []
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        if self.manifest_path.exists():
+            manifest = json.loads(self.manifest_path.read_text())
+            if (manifest.get('version') == CACHE_VERSION and manifest.get('format') == CACHE_FORMAT
+                    and manifest.get('normalization') == self.normalizer.fingerprint()
+                    and manifest.get('validation') == self._rules_fingerprint()):
+                return manifest
+            self._stale = [(key, fingerprint, manifest.get('format', CACHE_FORMAT))
+                           for key, fingerprint in manifest.get('files', {}).items()]
+        return {'version': CACHE_VERSION, 'format': CACHE_FORMAT,
+                'normalization': self.normalizer.fingerprint(),
+                'validation': self._rules_fingerprint(), 'files': {}}
+
+    def _rules_fingerprint(self):
+        return self.validator.fingerprint() if self.validator is not None else None
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self.manifest, indent=2, sort_keys=True))
+        tmp_path.replace(self.manifest_path)
+        self._prune_stale()
+
+    def _prune_stale(self):
+        """
+        Delete the files of entries cleaned with other settings.
+
+        Paths shared with a current entry (same file, same content hash,
+        rewritten under the new settings) are kept.
+        """
+        if not self._stale:
+            return
+        current = set()
+        for key, fingerprint in self.manifest['files'].items():
+            current.update([self._entry_path(key, fingerprint), self._quarantine_path(key, fingerprint)])
+        for key, fingerprint, fmt in self._stale:
+            for path in (self._entry_path(key, fingerprint, fmt), self._quarantine_path(key, fingerprint, fmt)):
+                if path not in current:
+                    path.unlink(missing_ok=True)
+        self._stale = []
+
+    def _entry_path(self, key, fingerprint, fmt=CACHE_FORMAT):
+        extension = 'parquet' if fmt == 'parquet' else 'pkl'
+        return self.cache_dir / f"{key}.{fingerprint['hash'][:16]}.{extension}"
+
+    def _quarantine_path(self, key, fingerprint, fmt=CACHE_FORMAT):
+        entry_path = self._entry_path(key, fingerprint, fmt)
+        return entry_path.with_name(f"{entry_path.stem}.quarantine{entry_path.suffix}")
+
+    def _entry_keys(self, key, fingerprint):
+        """Key columns of a cached entry (None if its file is gone)."""
+        path = self._entry_path(key, fingerprint)
+        return _read_frame(path, KEY_COLUMNS) if path.exists() else None
+
+    def _remove_entry(self, key, fingerprint):
+        self._entry_path(key, fingerprint).unlink(missing_ok=True)
+        self._quarantine_path(key, fingerprint).unlink(missing_ok=True)
+
+    def read_entry(self, key):
+        """
+        Load the cached cleaned frame of one source file.
+
+        Args:
+            key (str): Manifest key, "<source>/<file name>"
+        """
+        return _read_frame(self._entry_path(key, self.manifest['files'][key]))
+
+    def load_source(self, base_path, source, n_jobs=None, use_processes=False):
+        """
+        Return the cleaned (not yet deduplicated) frame of one source.
+
+        Unchanged files are loaded from the cache; new or changed files are
+        read, cleaned and stored. Manifest entries for files that no longer
+        exist are pruned.
+
+        Args:
+            base_path (str | Path): Base directory containing the data folders
+            source (str): Key of SOURCE_SCHEMAS
+            n_jobs (int | None): Pool size for cache misses and hits
+            use_processes (bool): Clean misses in a process pool
+
+        Returns:
+            tuple[pd.DataFrame, dict]: Combined frame and
+            {'hits', 'misses', 'missed_files'} for this source, plus
+            'validation' (combined report) and 'quarantine' (list of
+            quarantined frames) when the cache has a validator, and
+            'removed_keys' (key columns of the replaced and pruned entries)
+            when track_removed is set
+        """
+        files = source_files(base_path, source)
+        if not files:
+            folder = Path(base_path) / SOURCE_SCHEMAS[source]['folder']
+            raise FileNotFoundError(f"No CSV files found in {folder}")
+
+        entries = self.manifest['files']
+        keys = [f"{source}/{path.name}" for path in files]
+        fingerprints = [file_fingerprint(path, entries.get(key)) for path, key in zip(files, keys)]
+
+        hit_positions, miss_positions = [], []
+        for pos, (key, fingerprint) in enumerate(zip(keys, fingerprints)):
+            entry = entries.get(key)
+            if (entry and entry['hash'] == fingerprint['hash']
+                    and self._entry_path(key, fingerprint).exists()):
+                hit_positions.append(pos)
+            else:
+                miss_positions.append(pos)
+
+        workers = max(1, min(len(files), n_jobs or os.cpu_count() or 1))
+        frames = [None] * len(files)
+        quarantines = [None] * len(files)
+        removed_keys = []
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            hit_paths = [self._entry_path(keys[pos], fingerprints[pos]) for pos in hit_positions]
+            for pos, frame in zip(hit_positions, pool.map(_read_frame, hit_paths)):
+                frames[pos] = frame
+        for pos in hit_positions:
+            fingerprints[pos]['validation'] = report = entries[keys[pos]].get('validation')
+            if report and report['quarantined']:
+                quarantines[pos] = _read_frame(self._quarantine_path(keys[pos], fingerprints[pos]))
+
+        if miss_positions:
+            miss_files = [files[pos] for pos in miss_positions]
+            executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with executor(max_workers=min(workers, len(miss_files))) as pool:
+                cleaned = pool.map(_read_and_clean, miss_files, [source] * len(miss_files),
+                                   [self.normalizer] * len(miss_files),
+                                   [self.validator] * len(miss_files))
+                for pos, (frame, quarantine, report) in zip(miss_positions, cleaned):
+                    frames[pos], quarantines[pos] = frame, quarantine
+                    fingerprints[pos]['validation'] = report
+
+            (self.cache_dir / source).mkdir(exist_ok=True)
+            for pos in miss_positions:
+                old_entry = entries.get(keys[pos])
+                if old_entry:
+                    if self.track_removed:
+                        removed_keys.append(self._entry_keys(keys[pos], old_entry))
+                    self._remove_entry(keys[pos], old_entry)
+                _write_frame(frames[pos], self._entry_path(keys[pos], fingerprints[pos]))
+                if quarantines[pos] is not None and len(quarantines[pos]):
+                    _write_frame(quarantines[pos], self._quarantine_path(keys[pos], fingerprints[pos]))
+
+        for key, fingerprint in zip(keys, fingerprints):
+            entries[key] = fingerprint
+
+        current = set(keys)
+        for key in [k for k in entries if k.startswith(f"{source}/") and k not in current]:
+            if self.track_removed:
+                removed_keys.append(self._entry_keys(key, entries[key]))
+            self._remove_entry(key, entries.pop(key))
+        self._save_manifest()
+
+        stats = {
+            'hits': len(hit_positions),
+            'misses': len(miss_positions),
+            'missed_files': [files[pos].name for pos in miss_positions],
+        }
+        if self.validator is not None:
+            stats['validation'] = combine_validation_reports(
+                fingerprint['validation'] for fingerprint in fingerprints if fingerprint['validation']
+            )
+            stats['quarantine'] = [frame for frame in quarantines if frame is not None]
+        if self.track_removed:
+            stats['removed_keys'] = [frame for frame in removed_keys if frame is not None]
+        return concat_preallocated(frames), stats
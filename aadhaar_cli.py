@@ -0,0 +1,327 @@
+"""
+Aadhaar Intelligence System - Command Line
+==========================================
+
+Entry point with one subcommand per pipeline step:
+
+    ingest      read the raw enrolment/demographic/biometric files
+    clean       ... clean and deduplicate them, write the cleaned datasets
+    featurize   ... merge and add features, write the master dataset
+    train       ... fit the service-load model (or reuse the stored one)
+    score       predict with a stored model and write all outputs
+    report      draw the figures from the saved report data
+    summarize   print the summary statistics, current model and last run
+    run         the full complete/streaming/incremental pipeline
+    query       one date-range query against the published query index
+    serve       serve the query index over HTTP on localhost
+
+Every subcommand imports only what it needs: parsing the arguments loads
+nothing beyond the standard library, summarize never imports pandas,
+report never imports the pipeline, query/serve need NumPy only, and sklearn is only loaded to train or
+to unpickle an estimator (score --compiled needs NumPy alone).
+
+Usage:
+    python aadhaar_cli.py run /data/uidai --cache --plots deferred
+    python aadhaar_cli.py run /data/uidai --resume
+    python aadhaar_cli.py score /data/uidai --cache --compiled
+    python aadhaar_cli.py summarize /data/uidai
+"""
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+
+
+PIPELINES = ['complete', 'streaming', 'incremental']
+
+
+def _system(args, **options):
+    """AadhaarIntelligenceSystem configured from the common options."""
+    from aadhaar_intelligence_system import AadhaarIntelligenceSystem
+
+    if getattr(args, 'batch_rows', None):
+        options['score_batch_rows'] = args.batch_rows
+    if getattr(args, 'select_model', False):
+        options.update(select_model=True, model_grid=args.model_grid,
+                       selection_tolerance=args.selection_tolerance)
+    if getattr(args, 'training_mode', None):
+        options.update(training_mode=args.training_mode, training_rows=args.training_rows,
+                       compare_training=args.compare_training)
+    return AadhaarIntelligenceSystem(
+        args.base_path, n_jobs=args.n_jobs, use_processes=args.processes,
+        use_cache=args.cache, cache_dir=args.cache_dir, model_dir=args.model_dir,
+        profile_stages=args.profile, trace_memory=args.trace_memory,
+        plots=args.plots, plot_dpi=args.plot_dpi, plot_format=args.plot_format,
+        query_index=not args.no_query_index, forecast_horizon=args.forecast_horizon,
+        output_format=args.output_format, region_aliases=args.region_aliases,
+        dedup_policy=args.dedup_policy, validate=not args.no_validate,
+        validation_rules=args.validation_rules, **options
+    )
+
+
+def _exit_code(system):
+    """0 if the system's last run and every one of its stages succeeded, else 1."""
+    report = system.run_report
+    if report is None:
+        return 0
+    return int(report.error is not None or any(stage['status'] != 'ok' for stage in report.stages))
+
+
+def cmd_step(args):
+    system = _system(args, retrain=args.retrain, drift_threshold=args.drift_threshold)
+    system.run_partial_pipeline(args.command)
+    return _exit_code(system)
+
+
+def cmd_score(args):
+    system = _system(args)
+    system.run_scoring_pipeline(model_version=args.model_version, compiled=args.compiled)
+    return _exit_code(system)
+
+
+def cmd_run(args):
+    system = _system(args, retrain=args.retrain, drift_threshold=args.drift_threshold,
+                     checkpoints=not args.no_checkpoints, stage_workers=args.stage_workers)
+    if args.pipeline == 'streaming':
+        system.run_streaming_pipeline(partition_by=args.partition_by, chunk_rows=args.chunk_rows,
+                                      max_training_rows=args.max_training_rows)
+    elif args.pipeline == 'incremental':
+        system.run_incremental_pipeline(state_dir=args.state_dir)
+    else:
+        system.run_complete_pipeline(resume=args.resume)
+    return _exit_code(system)
+
+
+def cmd_report(args):
+    from aadhaar_reporting import available_figures, render_reports
+
+    output_dir = Path(args.base_path) / 'outputs'
+    report_dir = output_dir / 'report_data'
+    available = available_figures(report_dir)
+    names = args.figures or available
+    missing = [name for name in names if name not in available]
+    if not names or missing:
+        print(f"No report data in {report_dir} for: {', '.join(missing) or 'any figure'}")
+        return 1
+    for path in render_reports(report_dir, output_dir, names, dpi=args.plot_dpi,
+                               fmt=args.plot_format, n_jobs=args.n_jobs):
+        print(f"✓ Saved: {path}")
+    return 0
+
+
+def cmd_summarize(args):
+    output_dir = Path(args.base_path) / 'outputs'
+    model_dir = Path(args.model_dir) if args.model_dir else output_dir / 'models'
+    found = False
+
+    summary_path = output_dir / 'summary_statistics.csv'
+    if summary_path.exists():
+        found = True
+        print("SUMMARY STATISTICS")
+        print("-" * 80)
+        with open(summary_path, newline='', encoding='utf-8') as handle:
+            for row in csv.DictReader(handle):
+                print(f"  {row['Metric']:<28} {row['Value']}")
+        print()
+
+    latest_path = model_dir / 'latest.json'
+    if latest_path.exists():
+        found = True
+        version = json.loads(latest_path.read_text())['version']
+        record = json.loads((model_dir / f'model-{version}.json').read_text())
+        metrics = record['metrics']
+        print("CURRENT MODEL")
+        print("-" * 80)
+        print(f"  Version:  {version} ({record['model_class']}, trained {record['created']})")
+        print(f"  Training: {record['fingerprint']['rows']:,} records, "
+              f"{len(record['feature_cols'])} features")
+        print(f"  Test MAE: {metrics['test_mae']:.2f} | Test R²: {metrics['test_r2']:.4f}")
+        print(f"  Compiled export: {record.get('compiled_file') or 'none'}")
+        print()
+
+    reports = sorted((output_dir / 'run_reports').glob('*.json'), key=lambda path: path.stat().st_mtime)
+    if reports:
+        found = True
+        report = json.loads(reports[-1].read_text())
+        print("LAST RUN")
+        print("-" * 80)
+        print(f"  {report['run_id']}: {report['status']} in {report['wall_seconds']:.1f}s"
+              f" (peak RSS {report['peak_rss_mb']} MB)")
+        for stage in report['stages']:
+            overlap = ' (concurrent)' if stage.get('overlapped_with') else ''
+            print(f"    {stage['stage']:<24} {stage['status']:<6} {stage['wall_seconds']:>9.2f}s{overlap}")
+        print()
+
+    if not found:
+        print(f"No outputs in {output_dir} - run a pipeline first")
+    return 0 if found else 1
+
+
+def _index_dir(args):
+    return Path(args.index_dir) if args.index_dir else Path(args.base_path) / 'outputs' / 'query_index'
+
+
+def cmd_query(args):
+    from aadhaar_query import QueryService
+
+    key = {col: getattr(args, col) for col in ('state', 'district', 'pincode')
+           if getattr(args, col) is not None}
+    try:
+        result = QueryService(_index_dir(args)).query(args.level, start=args.start, end=args.end, **key)
+    except (FileNotFoundError, KeyError, ValueError) as exc:
+        print(f"❌ ERROR: {exc.args[0] if isinstance(exc, KeyError) else exc}")
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def cmd_serve(args):
+    from aadhaar_query import serve
+
+    serve(_index_dir(args), host=args.host, port=args.port, reload_interval=args.reload_interval)
+    return 0
+
+
+def _add_system_options(parser, training=False, scoring=False):
+    parser.add_argument('base_path', help="Directory with the three api_data_aadhar_* folders")
+    parser.add_argument('--n-jobs', type=int, default=None, help="Worker count (default: all cores)")
+    parser.add_argument('--processes', action='store_true',
+                        help="Read CSV files in a process pool instead of threads")
+    parser.add_argument('--cache', action='store_true',
+                        help="Reuse cleaned sources cached by previous runs")
+    parser.add_argument('--cache-dir', default=None)
+    parser.add_argument('--model-dir', default=None)
+    parser.add_argument('--plots', choices=['inline', 'deferred', 'none'], default='inline')
+    parser.add_argument('--plot-dpi', type=int, default=300)
+    parser.add_argument('--plot-format', default='png')
+    parser.add_argument('--profile', action='store_true', help="Run every stage under cProfile")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Record tracemalloc peaks per stage (slower)")
+    parser.add_argument('--no-query-index', action='store_true',
+                        help="Do not publish the query index after the run")
+    parser.add_argument('--forecast-horizon', type=int, default=14,
+                        help="Days of district load forecast")
+    parser.add_argument('--output-format', choices=['csv', 'csv.gz', 'parquet', 'feather'],
+                        default='csv',
+                        help="Format of the cleaned, master and prediction datasets")
+    parser.add_argument('--region-aliases', default=None,
+                        help="JSON file of {state: {...}, district: {...}} name aliases")
+    parser.add_argument('--dedup-policy', choices=['first', 'sum', 'max', 'exact'], default='exact',
+                        help="Resolve repeated keys: keep the first, sum or max the counts, "
+                             "or drop exact copies only")
+    parser.add_argument('--no-validate', action='store_true',
+                        help="Skip the validation rules (nothing is quarantined)")
+    parser.add_argument('--validation-rules', default=None,
+                        help="JSON list of validation rules (default: the built-in set)")
+    if training:
+        parser.add_argument('--retrain', choices=['auto', 'always', 'never'], default='auto')
+        parser.add_argument('--drift-threshold', type=float, default=0.25)
+        parser.add_argument('--select-model', action='store_true',
+                            help="Choose the model by time-series cross-validation over a grid")
+        parser.add_argument('--model-grid', default=None,
+                            help="JSON list of {name, family, params} candidates")
+        parser.add_argument('--selection-tolerance', type=float, default=0.05,
+                            help="Accept candidates within this fraction of the best MAE")
+        parser.add_argument('--training-mode', choices=['full', 'sampled', 'histogram'],
+                            default='full',
+                            help="Train on all rows, a state x month stratified sample, or "
+                                 "that sample with histogram gradient boosting")
+        parser.add_argument('--training-rows', type=int, default=2_000_000,
+                            help="Sample size of the sampled/histogram training modes")
+        parser.add_argument('--compare-training', action='store_true',
+                            help="Also fit the full data and report the accuracy/time trade-off")
+    if scoring:
+        parser.add_argument('--batch-rows', type=int, default=None,
+                            help="Rows per prediction block (default: 65536)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    step_help = {
+        'ingest': "Read the raw files (into the cleaned-source cache with --cache)",
+        'clean': "Clean and deduplicate the sources; write the cleaned datasets",
+        'featurize': "Merge the sources and add features; write the master dataset",
+        'train': "Train the model (or reuse the stored one) and store it",
+    }
+    for name, help_text in step_help.items():
+        step = commands.add_parser(name, help=help_text)
+        _add_system_options(step, training=True)
+        step.set_defaults(func=cmd_step)
+
+    score = commands.add_parser('score', help="Predict with a stored model and write the outputs")
+    _add_system_options(score, scoring=True)
+    score.add_argument('--model-version', default=None, help="Stored model version (default: latest)")
+    score.add_argument('--compiled', action='store_true',
+                       help="Score with the flat-array export (no sklearn import)")
+    score.set_defaults(func=cmd_score)
+
+    run = commands.add_parser('run', help="Run a full pipeline")
+    _add_system_options(run, training=True, scoring=True)
+    run.add_argument('--pipeline', choices=PIPELINES, default='complete')
+    run.add_argument('--partition-by', choices=['state', 'month', 'state_month'], default='state',
+                     help="Streaming pipeline partitions")
+    run.add_argument('--chunk-rows', type=int, default=500_000, help="Streaming CSV chunk size")
+    run.add_argument('--max-training-rows', type=int, default=1_000_000,
+                     help="Streaming model training sample")
+    run.add_argument('--state-dir', default=None, help="Incremental pipeline state location")
+    run.add_argument('--resume', action='store_true',
+                     help="Continue the last complete run from its checkpoints")
+    run.add_argument('--no-checkpoints', action='store_true',
+                     help="Do not checkpoint the stages of the complete pipeline")
+    run.add_argument('--stage-workers', type=int, default=None,
+                     help="Independent stages of the complete pipeline run at once (default: all ready)")
+    run.set_defaults(func=cmd_run)
+
+    report = commands.add_parser('report', help="Draw the figures from the saved report data")
+    report.add_argument('base_path')
+    report.add_argument('--figures', nargs='+', default=None,
+                        help="Figures to draw (default: all with saved data)")
+    report.add_argument('--plot-dpi', type=int, default=300)
+    report.add_argument('--plot-format', default='png')
+    report.add_argument('--n-jobs', type=int, default=None)
+    report.set_defaults(func=cmd_report)
+
+    summarize = commands.add_parser('summarize', help="Print the summary of the last outputs")
+    summarize.add_argument('base_path')
+    summarize.add_argument('--model-dir', default=None)
+    summarize.set_defaults(func=cmd_summarize)
+
+    query = commands.add_parser('query', help="Query the published ASI / predicted-load index")
+    query.add_argument('base_path')
+    query.add_argument('--level', choices=['all', 'state', 'district', 'pincode'], default='all')
+    query.add_argument('--state', default=None)
+    query.add_argument('--district', default=None)
+    query.add_argument('--pincode', default=None)
+    query.add_argument('--start', default=None, help="First date (YYYY-MM-DD, inclusive)")
+    query.add_argument('--end', default=None, help="Last date (YYYY-MM-DD, inclusive)")
+    query.add_argument('--index-dir', default=None)
+    query.set_defaults(func=cmd_query)
+
+    serve = commands.add_parser('serve', help="Serve the query index over HTTP on localhost")
+    serve.add_argument('base_path')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--reload-interval', type=float, default=1.0,
+                       help="Seconds between checks for a newly published index")
+    serve.add_argument('--index-dir', default=None)
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    """
+    Parse the command line and run the subcommand.
+
+    Returns:
+        int: Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
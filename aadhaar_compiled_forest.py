@@ -0,0 +1,208 @@
+"""
+Aadhaar Compiled Forest
+=======================
+
+Flat-array form of a fitted tree-ensemble regressor (RandomForest,
+ExtraTrees or a single DecisionTree) for lightweight, low-latency scoring.
+
+All nodes of all trees are stored in parallel arrays:
+
+    feature   int32    split feature of each node
+    threshold float32  split threshold (go left when x <= threshold)
+    left      int32    global index of the left child; the right child
+                       always follows it (nodes are renumbered level by
+                       level so that siblings are adjacent)
+    value     float32  prediction of each node
+
+plus the global index of every tree's root. Leaves point to themselves with
+an infinite threshold, so descending all trees for all rows a fixed number
+of times (the maximum tree depth) parks every (tree, row) pair on its leaf
+without per-tree Python code. Each descent step is three gathers and an
+add: (feature, threshold) of the current node as one packed 8-byte load,
+the row's feature value, and the next node = left + (x > threshold). Rows
+are walked through all trees in blocks of about BLOCK_ELEMENTS (tree, row)
+pairs, so a block's rows and (tree, row) buffers stay cache-resident. The
+buffers are reused across descent steps, and the gathers skip bounds
+checks (np.take with mode='clip'): every index is in range by
+construction. On the default 100-tree, depth-15 forest this scores about
+20% more rows per second than the estimator's own predict on one core
+(see aadhaar_benchmark.benchmark_compiled_forest).
+
+The artifact is a small .npz file and needs only NumPy to load and evaluate.
+
+Trees compare float32 features against float64 thresholds. A threshold is
+rounded down to the largest float32 not above it, which gives exactly the
+same left/right decisions for every float32 input. Only the leaf values are
+rounded to float32, so predictions agree with the estimator within float32
+precision.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+
+BLOCK_ELEMENTS = 1 << 16
+
+
+class CompiledForest:
+    """
+    Vectorized evaluator over the flat node arrays of a tree ensemble.
+    """
+
+    ARRAYS = ('feature', 'threshold', 'left', 'value', 'roots')
+
+    def __init__(self, feature, threshold, left, value, roots, max_depth, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+
+        # (feature, threshold) pairs packed into one int64 per node
+        split = np.empty((len(feature), 2), dtype=np.int32)
+        split[:, 0] = feature
+        split[:, 1] = threshold.view(np.int32)
+        self._split = split.view(np.int64).ravel()
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def predict(self, X):
+        """
+        Mean prediction of all trees.
+
+        Args:
+            X (np.ndarray): (n_rows, n_features) feature matrix
+
+        Returns:
+            np.ndarray: float64 predictions
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got shape {X.shape}")
+
+        n_rows = len(X)
+        total = np.zeros(n_rows, dtype=np.float64)
+        rows_per_block = max(1, BLOCK_ELEMENTS // self.n_trees)
+        for start in range(0, n_rows, rows_per_block):
+            block = X[start:start + rows_per_block]
+            total[start:start + len(block)] = self._block_sum(block)
+        return total / self.n_trees
+
+    def _block_sum(self, X):
+        """Sum over all trees of the leaf values of a block of rows."""
+        n_trees, n_rows = self.n_trees, len(X)
+        flat = X.ravel()
+        row_offsets = np.arange(n_rows, dtype=np.int32) * self.n_features
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        split = np.empty((n_trees, n_rows), dtype=np.int64)
+        packed = split.view(np.int32).reshape(n_trees, n_rows, 2)
+        index = np.empty((n_trees, n_rows), dtype=np.int32)
+        values = np.empty((n_trees, n_rows), dtype=np.float32)
+        go_right = np.empty((n_trees, n_rows), dtype=bool)
+        for _ in range(self.max_depth):
+            np.take(self._split, nodes, out=split, mode='clip')
+            np.add(row_offsets, packed[:, :, 0], out=index)
+            np.take(flat, index, out=values, mode='clip')
+            np.greater(values, packed[:, :, 1].view(np.float32), out=go_right)
+            np.take(self.left, nodes, out=nodes, mode='clip')
+            nodes += go_right
+        return self.value[nodes].sum(axis=0, dtype=np.float64)
+
+    def save(self, path):
+        """
+        Write the arrays to a compressed .npz file.
+        """
+        np.savez_compressed(
+            path, max_depth=self.max_depth, n_features=self.n_features,
+            **{name: getattr(self, name) for name in self.ARRAYS}
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a forest written by save().
+        """
+        with np.load(Path(path)) as data:
+            return cls(
+                max_depth=int(data['max_depth']), n_features=int(data['n_features']),
+                **{name: data[name] for name in cls.ARRAYS}
+            )
+
+
+def _float32_floor(threshold):
+    """Largest float32 values not above the given float64 thresholds."""
+    rounded = threshold.astype(np.float32)
+    too_high = rounded.astype(np.float64) > threshold
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+
+def _breadth_first_order(tree):
+    """
+    Node order of a tree, level by level, with siblings adjacent.
+
+    Returns:
+        np.ndarray: Original node ids in their new order
+    """
+    children_left, children_right = tree.children_left, tree.children_right
+    levels = [np.array([0])]
+    while levels[-1].size:
+        parents = levels[-1][children_left[levels[-1]] >= 0]
+        children = np.empty(2 * len(parents), dtype=np.int64)
+        children[0::2] = children_left[parents]
+        children[1::2] = children_right[parents]
+        levels.append(children)
+    return np.concatenate(levels)
+
+
+def compile_forest(model):
+    """
+    Convert a fitted single-output tree regressor into a CompiledForest.
+
+    Args:
+        model: Fitted RandomForestRegressor, ExtraTreesRegressor or
+            DecisionTreeRegressor
+
+    Returns:
+        CompiledForest
+    """
+    trees = [est.tree_ for est in getattr(model, 'estimators_', [model])]
+    if any(tree.n_outputs != 1 for tree in trees):
+        raise ValueError("Only single-output regressors can be compiled")
+
+    sizes = np.array([tree.node_count for tree in trees], dtype=np.int64)
+    roots = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    if sizes.sum() >= 2 ** 31:
+        raise OverflowError("Forest has too many nodes for int32 indices")
+
+    feature, threshold, left, value = [], [], [], []
+    for tree, root in zip(trees, roots):
+        order = _breadth_first_order(tree)
+        new_id = np.empty(tree.node_count, dtype=np.int64)
+        new_id[order] = np.arange(tree.node_count) + root
+
+        children = tree.children_left[order]
+        is_leaf = children < 0
+        feature.append(np.where(is_leaf, 0, tree.feature[order]))
+        threshold.append(np.where(is_leaf, np.inf, tree.threshold[order]))
+        left.append(np.where(is_leaf, new_id[order], new_id[np.maximum(children, 0)]))
+        value.append(tree.value[order, 0, 0])
+
+    return CompiledForest(
+        feature=np.concatenate(feature).astype(np.int32),
+        threshold=_float32_floor(np.concatenate(threshold)),
+        left=np.concatenate(left).astype(np.int32),
+        value=np.concatenate(value).astype(np.float32),
+        roots=roots.astype(np.int32),
+        max_depth=max(tree.max_depth for tree in trees),
+        n_features=trees[0].n_features,
+    )
@@ -0,0 +1,170 @@
+"""
+Aadhaar Feature Engineering
+===========================
+
+Fused, block-wise feature kernel shared by the in-memory, incremental and
+streaming pipelines (kept at module level so partition workers can run it).
+
+The seven raw count columns are copied once into a contiguous NumPy block.
+The kernel then walks that block in cache-sized row blocks and writes every
+derived feature straight into preallocated outputs:
+
+    - total_enrolments, total_demo_updates, total_bio_updates, total_updates
+      in the count dtype (int32 for clean data)
+    - update_ratio, asi, log_enrolments, log_updates as float32
+    - year (int16), month and day_of_week (int8), from a per-day calendar table
+
+The model inputs (FEATURE_COLUMNS) are assembled in the same pass into one
+float32 matrix, which is what the tree models use internally, so it can be
+passed to fit/predict without another conversion copy. All blocks are
+column-major so every per-feature operation runs over contiguous memory.
+"""
+
+import numpy as np
+
+
+COUNT_COLUMNS = [
+    'age_0_5', 'age_5_17', 'age_18_greater',
+    'demo_age_5_17', 'demo_age_17_',
+    'bio_age_5_17', 'bio_age_17_',
+]
+TOTAL_COLUMNS = ['total_enrolments', 'total_demo_updates', 'total_bio_updates', 'total_updates']
+RATIO_COLUMNS = ['update_ratio', 'asi', 'log_enrolments', 'log_updates']
+DATE_COLUMNS = {'year': np.int16, 'month': np.int8, 'day_of_week': np.int8}
+
+FEATURE_COLUMNS = [
+    'age_0_5', 'age_5_17', 'age_18_greater',
+    'total_enrolments', 'total_demo_updates',
+    'total_updates', 'update_ratio', 'asi',
+    'log_enrolments', 'log_updates',
+    'month', 'day_of_week'
+]
+
+BLOCK_ROWS = 1 << 16
+
+
+def _count_block(df):
+    """Copy the raw count columns into one column-major (n, 7) block."""
+    dtypes = [df[col].dtype for col in COUNT_COLUMNS]
+    integral = all(np.issubdtype(dtype, np.integer) for dtype in dtypes)
+    block = np.empty((len(df), len(COUNT_COLUMNS)), dtype=np.int32 if integral else np.float32,
+                     order='F')
+    for j, col in enumerate(COUNT_COLUMNS):
+        block[:, j] = df[col].to_numpy()
+    return block
+
+
+def _calendar_tables(days):
+    """
+    Year/month/day-of-week lookup tables over the day range of a date column.
+
+    The range spans at most a few thousand days, so calendar conversion runs
+    once per distinct day instead of once per row.
+    """
+    first, last = int(days.min()), int(days.max())
+    span = np.arange(first, last + 1, dtype=np.int64)
+    months = span.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    year = (months // 12 + 1970).astype(DATE_COLUMNS['year'])
+    month = (months % 12 + 1).astype(DATE_COLUMNS['month'])
+    # 1970-01-01 was a Thursday (Monday = 0)
+    day_of_week = ((span + 3) % 7).astype(DATE_COLUMNS['day_of_week'])
+    return first, year, month, day_of_week
+
+
+def compute_features(df):
+    """
+    Add the engineered feature columns to a merged frame and build the
+    float32 model matrix, in one pass over the count block.
+
+    Args:
+        df (pd.DataFrame): Merged frame with the raw count columns and date
+
+    Returns:
+        np.ndarray: Column-major float32 matrix of shape
+        (len(df), len(FEATURE_COLUMNS)), columns in FEATURE_COLUMNS order
+    """
+    n_rows = len(df)
+    counts = _count_block(df)
+    totals = np.empty((n_rows, len(TOTAL_COLUMNS)), dtype=counts.dtype, order='F')
+    year = np.empty(n_rows, dtype=DATE_COLUMNS['year'])
+    month = np.empty(n_rows, dtype=DATE_COLUMNS['month'])
+    day_of_week = np.empty(n_rows, dtype=DATE_COLUMNS['day_of_week'])
+    matrix = np.empty((n_rows, len(FEATURE_COLUMNS)), dtype=np.float32, order='F')
+
+    days = df['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    if n_rows:
+        first_day, year_table, month_table, weekday_table = _calendar_tables(days)
+
+    for start in range(0, n_rows, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, n_rows)
+        c = counts[start:stop]
+        t = totals[start:stop]
+        x = matrix[start:stop]
+
+        # Totals: enrolments, demographic, biometric, all updates
+        np.add(c[:, 0], c[:, 1], out=t[:, 0])
+        np.add(t[:, 0], c[:, 2], out=t[:, 0])
+        np.add(c[:, 3], c[:, 4], out=t[:, 1])
+        np.add(c[:, 5], c[:, 6], out=t[:, 2])
+        np.add(t[:, 1], t[:, 2], out=t[:, 3])
+
+        x[:, 0:3] = c[:, 0:3]
+        x[:, 3] = t[:, 0]
+        x[:, 4] = t[:, 1]
+        x[:, 5] = t[:, 3]
+
+        # update_ratio = updates / enrolments (0 without enrolments)
+        # ASI = 1 - update_ratio, clipped to [0, 1]
+        x[:, 6] = 0
+        np.divide(x[:, 5], x[:, 3], out=x[:, 6], where=x[:, 3] > 0)
+        np.subtract(1, x[:, 6], out=x[:, 7])
+        np.clip(x[:, 7], 0, 1, out=x[:, 7])
+        np.log1p(x[:, 3], out=x[:, 8])
+        np.log1p(x[:, 5], out=x[:, 9])
+
+        # Date parts by table lookup, no .dt passes
+        offsets = days[start:stop] - first_day
+        np.take(year_table, offsets, out=year[start:stop])
+        np.take(month_table, offsets, out=month[start:stop])
+        np.take(weekday_table, offsets, out=day_of_week[start:stop])
+        x[:, 10] = month[start:stop]
+        x[:, 11] = day_of_week[start:stop]
+
+    for j, col in enumerate(TOTAL_COLUMNS):
+        df[col] = totals[:, j]
+    for j, col in enumerate(RATIO_COLUMNS):
+        df[col] = matrix[:, 6 + j]
+    df['year'] = year
+    df['month'] = month
+    df['day_of_week'] = day_of_week
+
+    return matrix
+
+
+def add_features(df):
+    """
+    Add the engineered feature columns to a merged frame in place.
+
+    Args:
+        df (pd.DataFrame): Merged frame with the raw count columns
+
+    Returns:
+        pd.DataFrame: The same frame
+    """
+    compute_features(df)
+    return df
+
+
+def feature_matrix(df, feature_cols=None):
+    """
+    float32 model matrix from the feature columns of an already featurized frame.
+
+    Args:
+        df (pd.DataFrame): Featurized frame
+        feature_cols (list[str] | None): Columns to use (default: FEATURE_COLUMNS)
+
+    Returns:
+        np.ndarray: float32 matrix, one row per frame row
+    """
+    columns = list(feature_cols or FEATURE_COLUMNS)
+    return df[columns].fillna(0).to_numpy(dtype=np.float32)
@@ -0,0 +1,304 @@
+"""
+Aadhaar Service-Load Forecasting
+================================
+
+Forward-looking N-day forecasts of biometric (17+) and total update load per
+district.
+
+The district x date cuboid of the rollup cube is laid out as one dense
+(district, day) matrix per target, with calendar days without records as
+zeros. Lag features (1, 2, 3, 7, 14 and 28 days back) are column shifts of
+that matrix and rolling means/standard deviations (7 and 28 days) come from
+cumulative sums along the day axis, so building the features for every
+district and day is a handful of array operations, with no per-district
+grouping.
+
+One gradient-boosted model per target predicts the next day's load (in
+log1p space) from the history of both targets up to the forecast origin
+plus the calendar of the target day. Models are evaluated with a
+time-ordered split - trained on the days before the last ``test_days`` and
+tested on those, never on randomly mixed days - against a same-weekday
+naive baseline, then refitted on all days. Forecasts further ahead are
+recursive: each predicted day is written into the matrix and the features
+of the next day are computed from it, one vectorized step per horizon day.
+
+Only the last HISTORY_DAYS days are needed to forecast, so when a new day
+arrives ServiceLoadForecaster.forecast reuses the stored models and only
+rebuilds that tail from the cube: no retraining, no rescan of the master
+rows.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+FORECAST_TARGETS = ['bio_age_17_', 'total_updates']
+DISTRICT_KEYS = ['state', 'district']
+LAGS = [1, 2, 3, 7, 14, 28]
+WINDOWS = [7, 28]
+FORECAST_HORIZON = 14
+# Days of history behind the longest lag or window of a forecast origin
+HISTORY_DAYS = max(LAGS + WINDOWS)
+# Refit once the stored models are this many days behind the data
+RETRAIN_AFTER_DAYS = 28
+MODEL_FILE = 'forecast_model.joblib'
+RECORD_FILE = 'forecast_model.json'
+
+
+def feature_names(targets=FORECAST_TARGETS):
+    """Forecast model inputs, in matrix column order."""
+    names = []
+    for target in targets:
+        names += [f'{target}_lag_{lag}' for lag in LAGS]
+        for window in WINDOWS:
+            names += [f'{target}_mean_{window}', f'{target}_std_{window}']
+    return names + ['day_of_week', 'day_of_month', 'month']
+
+
+def daily_matrix(district_date, targets=FORECAST_TARGETS, since=None):
+    """
+    Dense (target, district, day) matrix from the district x date cuboid.
+
+    Args:
+        district_date (pd.DataFrame): Cube level indexed by (state, district,
+            date) with a sum column per target
+        targets (list[str]): Measures to lay out
+        since (datetime-like | None): Keep only days from this date on
+
+    Returns:
+        tuple: (districts DataFrame [state, district], first day number
+        (days since 1970-01-01), float64 array of shape
+        (len(targets), n_districts, n_days))
+    """
+    cells = district_date[targets].reset_index()
+    if since is not None:
+        cells = cells[cells['date'] >= pd.Timestamp(since)]
+    days = cells['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    codes, districts = pd.factorize(
+        pd.MultiIndex.from_frame(cells[DISTRICT_KEYS].astype(object)), sort=True
+    )
+    if since is not None:
+        first_day = int(np.datetime64(pd.Timestamp(since), 'D').astype(np.int64))
+    else:
+        first_day = int(days.min()) if len(days) else 0
+    n_days = int(days.max()) - first_day + 1 if len(days) else 0
+
+    matrix = np.zeros((len(targets), len(districts), n_days))
+    for k, target in enumerate(targets):
+        matrix[k, codes, days - first_day] = cells[target].to_numpy(dtype=np.float64)
+    return districts.to_frame(index=False, name=DISTRICT_KEYS), first_day, matrix
+
+
+def lag_features(matrix, origins, first_day):
+    """
+    Features of every district at each forecast origin (predicting origin + 1).
+
+    Lags and windows reaching before the first day are NaN.
+
+    Args:
+        matrix (np.ndarray): (target, district, day) history
+        origins (np.ndarray): Day columns of the forecast origins
+        first_day (int): Day number of column 0
+
+    Returns:
+        np.ndarray: float32 matrix with one row per (origin, district), in
+        origin-major order, columns in feature_names() order
+    """
+    n_targets, n_districts, n_days = matrix.shape
+    origins = np.asarray(origins, dtype=np.int64)
+    padded = np.concatenate([np.zeros((n_targets, n_districts, 1)), matrix], axis=2)
+    sums = np.cumsum(padded, axis=2)
+    squares = np.cumsum(padded ** 2, axis=2)
+
+    columns = []
+    for k in range(n_targets):
+        for lag in LAGS:
+            column = origins + 1 - lag
+            values = matrix[k][:, np.maximum(column, 0)]
+            columns.append(np.where(column >= 0, values, np.nan))
+        for window in WINDOWS:
+            end, start = origins + 1, origins + 1 - window
+            present = start >= 0
+            start = np.maximum(start, 0)
+            mean = (sums[k][:, end] - sums[k][:, start]) / window
+            variance = (squares[k][:, end] - squares[k][:, start]) / window - mean ** 2
+            columns.append(np.where(present, mean, np.nan))
+            columns.append(np.where(present, np.sqrt(np.maximum(variance, 0)), np.nan))
+
+    target_days = (first_day + origins + 1).astype('datetime64[D]')
+    calendar = pd.DatetimeIndex(target_days)
+    for part in (calendar.dayofweek, calendar.day, calendar.month):
+        columns.append(np.broadcast_to(np.asarray(part, dtype=np.float64), (n_districts, len(origins))))
+
+    # (feature, district, origin) -> rows ordered by origin, then district
+    stacked = np.stack(columns).transpose(2, 1, 0)
+    return stacked.reshape(-1, len(columns)).astype(np.float32)
+
+
+def _training_rows(matrix, first_day, origins):
+    """Features and per-target next-day values for a set of origins."""
+    X = lag_features(matrix, origins, first_day)
+    y = matrix[:, :, origins + 1].transpose(0, 2, 1).reshape(matrix.shape[0], -1)
+    return X, y
+
+
+def _fit(X, y):
+    """One next-day regressor on log1p(load)."""
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    # Histogram boosting takes the NaN of short histories as they are and
+    # fits hundreds of thousands of district-days in seconds
+    model = HistGradientBoostingRegressor(max_iter=200, learning_rate=0.1,
+                                         early_stopping=False, random_state=42)
+    return model.fit(X, np.log1p(y))
+
+
+def _predict(model, X):
+    return np.clip(np.expm1(model.predict(X)), 0, None)
+
+
+def recursive_forecast(models, matrix, first_day, horizon=FORECAST_HORIZON):
+    """
+    Forecast ``horizon`` days past the last column of matrix.
+
+    Returns:
+        np.ndarray: (target, district, horizon) forecasts
+    """
+    n_targets, n_districts, n_days = matrix.shape
+    extended = np.concatenate([matrix, np.zeros((n_targets, n_districts, horizon))], axis=2)
+    for step in range(horizon):
+        origin = n_days - 1 + step
+        X = lag_features(extended, [origin], first_day)
+        for k, model in enumerate(models):
+            extended[k, :, origin + 1] = _predict(model, X)
+    return extended[:, :, n_days:]
+
+
+class ServiceLoadForecaster:
+    """
+    Next-day load models per target plus their evaluation record.
+    """
+
+    def __init__(self, targets=FORECAST_TARGETS, horizon=FORECAST_HORIZON):
+        self.targets = list(targets)
+        self.horizon = horizon
+        self.models = None
+        self.record = None
+
+    def fit(self, district_date, test_days=28, min_history=7):
+        """
+        Evaluate on the last test_days days, then refit on all of them.
+
+        Args:
+            district_date (pd.DataFrame): District x date cuboid
+            test_days (int): Held-out days at the end of the history
+                (at most a quarter of it)
+            min_history (int): Days of history before the first training origin
+
+        Returns:
+            dict: The model record (metrics per target, trained_through, ...)
+        """
+        districts, first_day, matrix = daily_matrix(district_date, self.targets)
+        n_days = matrix.shape[2]
+        if n_days < min_history + 2:
+            raise ValueError(f"Forecasting needs at least {min_history + 2} days, got {n_days}")
+        test_days = max(1, min(test_days, n_days // 4))
+        split = n_days - 1 - test_days
+        train_origins = np.arange(min_history - 1, split)
+        test_origins = np.arange(split, n_days - 1)
+
+        X_train, y_train = _training_rows(matrix, first_day, train_origins)
+        X_test, y_test = _training_rows(matrix, first_day, test_origins)
+        naive = lag_features(matrix, test_origins, first_day)
+        metrics = {}
+        held_out = []
+        for k, target in enumerate(self.targets):
+            model = _fit(X_train, y_train[k])
+            held_out.append(model)
+            baseline = naive[:, feature_names(self.targets).index(f'{target}_lag_7')]
+            baseline = np.nan_to_num(baseline, nan=0.0)
+            metrics[target] = {
+                'test_mae': float(np.abs(_predict(model, X_test) - y_test[k]).mean()),
+                'naive_weekly_mae': float(np.abs(baseline - y_test[k]).mean()),
+            }
+
+        # Multi-day accuracy: one recursive forecast from the split
+        steps = min(self.horizon, test_days)
+        ahead = recursive_forecast(held_out, matrix[:, :, :split + 1], first_day, steps)
+        actual = matrix[:, :, split + 1:split + 1 + steps]
+        for k, target in enumerate(self.targets):
+            metrics[target][f'{steps}_day_mae'] = float(np.abs(ahead[k] - actual[k]).mean())
+
+        X_all, y_all = _training_rows(matrix, first_day, np.arange(min_history - 1, n_days - 1))
+        self.models = [_fit(X_all, y_all[k]) for k in range(len(self.targets))]
+        self.record = {
+            'targets': self.targets,
+            'features': feature_names(self.targets),
+            'horizon': self.horizon,
+            'districts': len(districts),
+            'training_rows': int(len(X_all)),
+            'test_days': int(test_days),
+            'trained_through': str(np.datetime64(first_day + n_days - 1, 'D')),
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'metrics': metrics,
+        }
+        return self.record
+
+    def forecast(self, district_date, horizon=None):
+        """
+        Forecast from the last day of the cuboid with the fitted models.
+
+        Only the last HISTORY_DAYS days are read, so calling this again after
+        a new day was added to the cube is the incremental refresh.
+
+        Returns:
+            pd.DataFrame: state, district, date, horizon and one column per
+            target, one row per district and forecast day
+        """
+        horizon = horizon or self.horizon
+        last = district_date.index.get_level_values('date').max()
+        since = last - pd.Timedelta(days=HISTORY_DAYS - 1)
+        districts, first_day, matrix = daily_matrix(district_date, self.targets, since=since)
+        ahead = recursive_forecast(self.models, matrix, first_day, horizon)
+
+        forecast = districts.loc[np.repeat(np.arange(len(districts)), horizon)].reset_index(drop=True)
+        steps = np.tile(np.arange(1, horizon + 1), len(districts))
+        forecast['date'] = pd.to_datetime(last) + pd.to_timedelta(steps, unit='D')
+        forecast['horizon'] = steps
+        for k, target in enumerate(self.targets):
+            forecast[target] = ahead[k].reshape(-1)
+        return forecast
+
+    def save(self, directory):
+        """Write the models (joblib) and their record (JSON) to directory."""
+        import joblib
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self.models, directory / MODEL_FILE)
+        (directory / RECORD_FILE).write_text(json.dumps(self.record, indent=2))
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Load a forecaster saved by save().
+
+        Raises:
+            FileNotFoundError: If nothing was saved to directory
+        """
+        import joblib
+
+        directory = Path(directory)
+        record = json.loads((directory / RECORD_FILE).read_text())
+        forecaster = cls(record['targets'], record['horizon'])
+        forecaster.models = joblib.load(directory / MODEL_FILE)
+        forecaster.record = record
+        return forecaster
+
+    @staticmethod
+    def exists(directory):
+        return (Path(directory) / RECORD_FILE).exists() and (Path(directory) / MODEL_FILE).exists()
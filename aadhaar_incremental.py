@@ -0,0 +1,359 @@
+"""
+Aadhaar Incremental Pipeline State
+==================================
+
+Persistent state for the append-only incremental mode:
+
+    - the master dataset with ASI and predictions
+    - the rollup cube: mergeable aggregates (sums, sums of squares and
+      record counts) over date x state x district x pincode
+    - the model-store version used for predictions and its feature columns
+    - the content hash of every source file already folded into the state
+
+The cube is built in one pass over the master rows into two base cuboids,
+(state, district, date) and (state, district, pincode). The date, district,
+state and pincode levels and the overall total are rolled up from those,
+never from the master rows again. Districts are always keyed by (state,
+district), so same-named districts of different states stay apart.
+
+Aggregates only hold sums and counts, so a delta run can retract the old
+rows of the affected (date, state, district, pincode) keys and add the new
+ones without rescanning the history. Means are derived as sum / n_records
+and standard deviations from the sums of squares.
+"""
+
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aadhaar_ingestion import KEY_COLUMNS
+
+
+# Level -> key columns; the first two are computed from the master rows
+CUBE_LEVELS = {
+    'district_date': ['state', 'district', 'date'],
+    'district_pincode': ['state', 'district', 'pincode'],
+    'date': ['date'],
+    'district': ['state', 'district'],
+    'state': ['state'],
+    'pincode': ['pincode'],
+}
+BASE_CUBOIDS = ['district_date', 'district_pincode']
+# Rolled-up level -> base cuboid it is derived from
+ROLLUPS = {'date': 'district_date', 'district': 'district_date', 'state': 'district_date',
+           'pincode': 'district_pincode'}
+AGGREGATE_LEVELS = list(CUBE_LEVELS)
+# Bump whenever the layout of the cube changes
+AGGREGATES_VERSION = 2
+AGGREGATE_MEASURES = [
+    'total_enrolments', 'total_demo_updates', 'total_bio_updates', 'total_updates',
+    'demo_age_5_17', 'demo_age_17_', 'bio_age_5_17', 'bio_age_17_',
+    'asi', 'update_ratio', 'predicted_bio_load',
+]
+# Measures whose spread is reported: their sums of squares are kept as well
+SQUARED_MEASURES = ['asi', 'update_ratio', 'predicted_bio_load']
+
+
+def key_index(df):
+    """
+    Build a MultiIndex over the merge keys of a frame for membership tests.
+    """
+    return pd.MultiIndex.from_arrays([df[col] for col in KEY_COLUMNS], names=KEY_COLUMNS)
+
+
+def _key_codes(series):
+    """
+    Integer codes of a key column and the values they stand for.
+
+    Categorical columns reuse their codes; missing values get a code of
+    their own.
+
+    Returns:
+        tuple[np.ndarray, pd.Index]: codes, values
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        if (codes < 0).any():
+            codes[codes < 0] = len(categories)
+            categories = categories.append(pd.Index([None], dtype=categories.dtype))
+        return codes, pd.Index(categories, name=series.name)
+    codes, uniques = pd.factorize(series, sort=True, use_na_sentinel=False)
+    return codes.astype(np.int64), pd.Index(uniques, name=series.name)
+
+
+def cube_cells(df):
+    """
+    Assign every row to its cell of each base cuboid.
+
+    Keys are packed into one int64 code per row and factorized, so the
+    cuboids can be summed with plain bincounts. The assignment can be kept
+    and passed to compute_aggregates / add_measures again to aggregate
+    columns added later without re-encoding the keys.
+
+    Returns:
+        dict[str, tuple[np.ndarray, pd.Index]]: Base cuboid -> (cell of each
+        row, sorted index of the cells)
+    """
+    key_codes = {col: _key_codes(df[col]) for col in KEY_COLUMNS}
+    cells = {}
+    for level in BASE_CUBOIDS:
+        keys = CUBE_LEVELS[level]
+        code = 0
+        for col in keys:
+            codes, uniques = key_codes[col]
+            code = code * len(uniques) + codes
+        cell_of_row, unique_codes = pd.factorize(code, sort=True)
+
+        level_codes = []
+        for col in reversed(keys):
+            uniques = key_codes[col][1]
+            level_codes.append(unique_codes % len(uniques))
+            unique_codes = unique_codes // len(uniques)
+        index = pd.MultiIndex(
+            levels=[key_codes[col][1] for col in keys], codes=level_codes[::-1], names=keys
+        ).remove_unused_levels()
+        cells[level] = (cell_of_row, index)
+    return cells
+
+
+def compute_aggregates(df, measures=None, cells=None):
+    """
+    Build the rollup cube of a frame.
+
+    Args:
+        df (pd.DataFrame): Master rows with features (and optionally predictions)
+        measures (list[str]): Columns to aggregate (default: the
+            AGGREGATE_MEASURES present in df)
+        cells (dict): cube_cells(df), if already computed
+
+    Returns:
+        dict[str, pd.DataFrame]: One frame per CUBE_LEVELS entry, indexed by
+        its key columns, plus 'overall' with a single 'all' row. Columns are
+        the measure sums, '<measure>_sq' sums of squares of the
+        SQUARED_MEASURES and n_records.
+    """
+    if measures is None:
+        measures = [col for col in AGGREGATE_MEASURES if col in df.columns]
+    if cells is None:
+        cells = cube_cells(df)
+    # float64 accumulators: feature columns are float32/int32 on the master frame
+    values = {col: df[col].to_numpy(dtype=np.float64) for col in measures}
+    columns = {**values, **{f'{col}_sq': np.square(value) for col, value in values.items()
+                            if col in SQUARED_MEASURES}}
+
+    aggregates = {}
+    for level, (cell_of_row, index) in cells.items():
+        sums = {name: np.bincount(cell_of_row, weights=value, minlength=len(index))
+                for name, value in columns.items()}
+        sums['n_records'] = np.bincount(cell_of_row, minlength=len(index)).astype(np.float64)
+        aggregates[level] = pd.DataFrame(sums, index=index)
+    aggregates.update(rollup_aggregates(aggregates))
+    return aggregates
+
+
+def rollup_aggregates(aggregates):
+    """
+    Derive the date, district, state, pincode and overall levels from the
+    base cuboids.
+
+    Returns:
+        dict[str, pd.DataFrame]: The rolled-up levels
+    """
+    rolled = {
+        level: aggregates[base].groupby(level=CUBE_LEVELS[level], sort=True).sum()
+        for level, base in ROLLUPS.items()
+    }
+    rolled['overall'] = rolled['state'].sum().to_frame('all').T
+    return rolled
+
+
+def add_measures(aggregates, df, measures, cells=None):
+    """
+    Add columns computed after the cube was built (e.g. predictions).
+
+    Args:
+        aggregates (dict): Cube of df, as returned by compute_aggregates
+        df (pd.DataFrame): The same rows, now carrying the new measures
+        measures (list[str]): Columns to add
+        cells (dict): cube_cells(df) kept from building the cube
+
+    Returns:
+        dict[str, pd.DataFrame]: Cube with the extra measure columns
+    """
+    extra = compute_aggregates(df, measures, cells)
+    added = {}
+    for level, table in aggregates.items():
+        columns = extra[level].drop(columns='n_records')
+        added[level] = pd.concat([table.drop(columns=columns.columns, errors='ignore'), columns], axis=1)
+    return added
+
+
+def combine_aggregates(partials):
+    """
+    Merge per-partition cubes into a dataset-wide cube.
+
+    Partials are combined in the order given, so a fixed partition order
+    gives reproducible floating-point sums.
+
+    Args:
+        partials (list[dict]): Outputs of compute_aggregates
+
+    Returns:
+        dict[str, pd.DataFrame]: Combined aggregates
+    """
+    combined = {}
+    for level in BASE_CUBOIDS:
+        tables = pd.concat([partial[level] for partial in partials])
+        combined[level] = tables.groupby(level=CUBE_LEVELS[level], sort=True).sum()
+    combined.update(rollup_aggregates(combined))
+    return combined
+
+
+def update_aggregates(aggregates, removed_df, added_df):
+    """
+    Retract the contribution of removed rows and add that of new rows.
+
+    Only the base cuboids are updated cell by cell; cells whose record count
+    drops to zero are dropped and the other levels are rolled up again.
+
+    Returns:
+        dict[str, pd.DataFrame]: Updated aggregates
+    """
+    removed = compute_aggregates(removed_df)
+    added = compute_aggregates(added_df)
+
+    updated = {}
+    for level in BASE_CUBOIDS:
+        table = aggregates[level].add(added[level], fill_value=0).sub(removed[level], fill_value=0)
+        updated[level] = table[table['n_records'] > 0].sort_index()
+    updated.update(rollup_aggregates(updated))
+    return updated
+
+
+def level_stats(aggregates, level, spec):
+    """
+    Derive a groupby-style report from the aggregates.
+
+    Args:
+        aggregates (dict): As returned by compute_aggregates
+        level (str): One of AGGREGATE_LEVELS
+        spec (dict): {column: 'sum' | 'mean' | 'std'}, as passed to DataFrame.agg
+            ('std' is the population standard deviation, for SQUARED_MEASURES)
+
+    Returns:
+        pd.DataFrame: One row per key, key columns first
+    """
+    table = aggregates[level]
+    stats = pd.DataFrame(index=table.index)
+    for col, how in spec.items():
+        if how == 'sum':
+            stats[col] = table[col]
+        elif how == 'mean':
+            stats[col] = table[col] / table['n_records']
+        else:
+            mean = table[col] / table['n_records']
+            stats[col] = np.sqrt((table[f'{col}_sq'] / table['n_records'] - mean ** 2).clip(lower=0))
+    return stats.reset_index()
+
+
+def save_aggregates(aggregates, directory):
+    """
+    Write a cube as one Parquet file per level.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for level, table in aggregates.items():
+        table.to_parquet(directory / f'aggregates_{level}.parquet')
+
+
+def load_aggregates(directory):
+    """
+    Read a cube written by save_aggregates.
+    """
+    return {
+        level: pd.read_parquet(Path(directory) / f'aggregates_{level}.parquet')
+        for level in AGGREGATE_LEVELS + ['overall']
+    }
+
+
+class IncrementalStore:
+    """
+    On-disk state of the incremental pipeline.
+    """
+
+    def __init__(self, state_dir):
+        """
+        Args:
+            state_dir (str | Path): Directory holding the persisted state
+        """
+        self.state_dir = Path(state_dir)
+        self.manifest_path = self.state_dir / 'state.json'
+
+    def exists(self):
+        return self.manifest_path.exists()
+
+    def load(self):
+        """
+        Returns:
+            dict: {'master', 'aggregates', 'model_version', 'feature_cols', 'processed'}
+        """
+        manifest = json.loads(self.manifest_path.read_text())
+        # States saved before versioned data directories keep their files at the top level
+        data_dir = self.state_dir / manifest.get('data_dir', '.')
+        master = pd.read_parquet(data_dir / 'master.parquet')
+        if manifest.get('aggregates_version') == AGGREGATES_VERSION:
+            aggregates = load_aggregates(data_dir)
+        else:
+            # State saved with an older cube layout: rebuild it from the master rows
+            aggregates = compute_aggregates(master)
+        return {
+            'master': master,
+            'aggregates': aggregates,
+            'model_version': manifest['model_version'],
+            'feature_cols': manifest['feature_cols'],
+            'processed': manifest['processed'],
+        }
+
+    def save(self, master_df, aggregates, model_version, feature_cols, processed):
+        """
+        Persist the state.
+
+        The master dataset and the cube go to a new data directory, which
+        the manifest then points at with an atomic replace; only after that
+        are older data directories removed. An interrupted save therefore
+        leaves the previous state in place.
+
+        Args:
+            master_df (pd.DataFrame): Full master dataset with predictions
+            aggregates (dict): As returned by compute_aggregates
+            model_version (str): Model-store version used for delta predictions
+            feature_cols (list[str]): Model input columns
+            processed (dict[str, str]): Source file key -> content hash
+        """
+        data_name = f"data-{datetime.now():%Y%m%dT%H%M%S%f}"
+        data_dir = self.state_dir / data_name
+        data_dir.mkdir(parents=True)
+        master_df.to_parquet(data_dir / 'master.parquet', index=False)
+        save_aggregates(aggregates, data_dir)
+
+        manifest = {
+            'data_dir': data_name,
+            'aggregates_version': AGGREGATES_VERSION,
+            'model_version': model_version,
+            'feature_cols': list(feature_cols),
+            'processed': processed,
+        }
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        tmp_path.replace(self.manifest_path)
+
+        for old in self.state_dir.glob('data-*'):
+            if old.name != data_name:
+                shutil.rmtree(old, ignore_errors=True)
+        for old in [self.state_dir / 'master.parquet', *self.state_dir.glob('aggregates_*.parquet')]:
+            old.unlink(missing_ok=True)
@@ -0,0 +1,276 @@
+"""
+Aadhaar Data Ingestion Engine
+=============================
+
+Schema-pinned, parallel CSV ingestion for the three UIDAI API extracts.
+
+Each source folder holds many CSV drops. Files are read concurrently in a
+thread (or process) pool with an explicit schema per source:
+
+    - state / district  -> category
+    - pincode           -> int32 (6-digit PIN codes fit comfortably)
+    - age_* counts      -> int32
+    - date              -> parsed as %d-%m-%Y during the read
+
+The per-file frames are then combined column by column into a single
+preallocated frame instead of going through a generic ``pd.concat``.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from aadhaar_normalization import DEFAULT_NORMALIZER
+
+
+KEY_COLUMNS = ['date', 'state', 'district', 'pincode']
+DATE_FORMAT = '%d-%m-%Y'
+CATEGORY_COLUMNS = ['state', 'district']
+PINCODE_DTYPE = 'int32'
+COUNT_DTYPE = 'int32'
+
+SOURCE_SCHEMAS = {
+    'enrolment': {
+        'folder': 'api_data_aadhar_enrolment',
+        'label': 'Enrolment',
+        'description': 'Enrolment',
+        'count_columns': ['age_0_5', 'age_5_17', 'age_18_greater'],
+    },
+    'demographic': {
+        'folder': 'api_data_aadhar_demographic',
+        'label': 'Demographic',
+        'description': 'Demographic Update',
+        'count_columns': ['demo_age_5_17', 'demo_age_17_'],
+    },
+    'biometric': {
+        'folder': 'api_data_aadhar_biometric',
+        'label': 'Biometric',
+        'description': 'Biometric Update',
+        'count_columns': ['bio_age_5_17', 'bio_age_17_'],
+    },
+}
+
+
+def source_files(base_path, source):
+    """
+    List the CSV files of one source folder in a stable order.
+
+    Args:
+        base_path (str | Path): Base directory containing the data folders
+        source (str): Key of SOURCE_SCHEMAS
+
+    Returns:
+        list[Path]: Sorted CSV paths
+    """
+    folder = Path(base_path) / SOURCE_SCHEMAS[source]['folder']
+    return sorted(folder.glob('*.csv'))
+
+
+def _read_options(path, source):
+    """Normalized column names, pinned dtypes and date columns of one file."""
+    count_columns = SOURCE_SCHEMAS[source]['count_columns']
+    header = pd.read_csv(path, nrows=0).columns
+    names = {raw: raw.strip().lower() for raw in header}
+
+    dtype = {}
+    for raw, name in names.items():
+        if name in CATEGORY_COLUMNS:
+            dtype[raw] = 'category'
+        elif name == 'pincode':
+            dtype[raw] = PINCODE_DTYPE
+        elif name in count_columns:
+            dtype[raw] = COUNT_DTYPE
+    date_columns = [raw for raw, name in names.items() if name == 'date']
+    return names, dtype, date_columns
+
+
+def read_source_file(path, source):
+    """
+    Read one CSV drop with the pinned schema of its source.
+
+    Headers are normalized (stripped, lower-cased) before the schema is
+    applied. Files that do not fit the pinned numeric types (blank counts,
+    malformed PIN codes) are re-read with only the categorical columns
+    pinned; numeric coercion is then left to ``clean_and_standardize``.
+
+    Args:
+        path (Path): CSV file to read
+        source (str): Key of SOURCE_SCHEMAS
+
+    Returns:
+        pd.DataFrame: Frame with normalized column names
+    """
+    names, dtype, date_columns = _read_options(path, source)
+
+    try:
+        df = pd.read_csv(path, dtype=dtype, parse_dates=date_columns, date_format=DATE_FORMAT)
+    except (ValueError, TypeError, OverflowError):
+        relaxed = {raw: kind for raw, kind in dtype.items() if kind == 'category'}
+        df = pd.read_csv(path, dtype=relaxed, parse_dates=date_columns, date_format=DATE_FORMAT)
+
+    return df.rename(columns=names)
+
+
+def read_source_chunks(path, source, chunk_rows):
+    """
+    Iterate over one CSV drop in bounded-size chunks.
+
+    Only the categorical columns are pinned: a chunk-level dtype failure
+    could not be retried without re-reading the whole file, so numeric
+    coercion is left to clean_source_frame.
+
+    Args:
+        path (Path): CSV file to read
+        source (str): Key of SOURCE_SCHEMAS
+        chunk_rows (int): Maximum rows per chunk
+
+    Yields:
+        pd.DataFrame: Chunks with normalized column names
+    """
+    names, dtype, date_columns = _read_options(path, source)
+    relaxed = {raw: kind for raw, kind in dtype.items() if kind == 'category'}
+    reader = pd.read_csv(
+        path, dtype=relaxed, parse_dates=date_columns, date_format=DATE_FORMAT,
+        chunksize=chunk_rows
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk.rename(columns=names)
+
+
+def empty_source_frame(source):
+    """
+    Zero-row frame with the cleaned schema of a source.
+    """
+    columns = {
+        'date': pd.Series(dtype='datetime64[ns]'),
+        'state': pd.Series(dtype='category'),
+        'district': pd.Series(dtype='category'),
+        'pincode': pd.Series(dtype=object),
+    }
+    for col in SOURCE_SCHEMAS[source]['count_columns']:
+        columns[col] = pd.Series(dtype=COUNT_DTYPE)
+    return pd.DataFrame(columns)
+
+
+def concat_preallocated(frames):
+    """
+    Concatenate frames with one allocation per output column.
+
+    Categorical columns are combined with ``union_categoricals`` so the
+    result stays categorical even when the files saw different values.
+    Columns sharing one NumPy dtype are copied slice by slice into a single
+    preallocated array. Anything else (mixed dtypes from dirty files) falls
+    back to a per-column concat.
+
+    Args:
+        frames (list[pd.DataFrame]): Frames to combine, in order
+
+    Returns:
+        pd.DataFrame: Combined frame with a fresh RangeIndex
+    """
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    lengths = [len(frame) for frame in frames]
+    total = sum(lengths)
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+
+    data = {}
+    for col in columns:
+        parts = [
+            frame[col] if col in frame.columns else pd.Series(np.nan, index=range(len(frame)))
+            for frame in frames
+        ]
+        dtypes = {part.dtype for part in parts}
+
+        if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            if len({part.cat.categories.dtype for part in parts}) > 1:
+                # Cached Parquet entries may read back with string categories
+                parts = [
+                    pd.Series(pd.Categorical.from_codes(
+                        part.cat.codes, categories=pd.Index(part.cat.categories, dtype=object)
+                    ))
+                    for part in parts
+                ]
+            data[col] = pd.Categorical(union_categoricals(parts, sort_categories=True))
+        elif len(dtypes) == 1 and isinstance(next(iter(dtypes)), np.dtype):
+            out = np.empty(total, dtype=next(iter(dtypes)))
+            for part, start, stop in zip(parts, bounds[:-1], bounds[1:]):
+                out[start:stop] = part.to_numpy()
+            data[col] = out
+        else:
+            data[col] = pd.concat(
+                [part.astype(object) if isinstance(part.dtype, pd.CategoricalDtype) else part
+                 for part in parts],
+                ignore_index=True
+            ).to_numpy()
+
+    return pd.DataFrame(data, columns=columns)
+
+
+def clean_source_frame(df, source, normalizer=None):
+    """
+    Standardize one source frame: headers, dates, names, PIN codes, counts.
+
+    Cleaning is row-wise, so it gives the same result whether applied to a
+    single CSV drop or to the concatenation of all drops. State, district
+    and pincode are cleaned once per distinct value (see
+    aadhaar_normalization): names become canonical categoricals and
+    malformed PIN codes become missing.
+
+    Args:
+        df (pd.DataFrame): Raw frame as returned by read_source_file
+        source (str): Key of SOURCE_SCHEMAS
+        normalizer (RegionNormalizer | None): Alias maps and shared
+            dictionaries (default: DEFAULT_NORMALIZER)
+
+    Returns:
+        pd.DataFrame: The same frame, cleaned in place
+    """
+    df.columns = df.columns.str.strip().str.lower()
+    df['date'] = pd.to_datetime(df['date'], format=DATE_FORMAT, errors='coerce')
+    (normalizer or DEFAULT_NORMALIZER).normalize(df)
+
+    # Ensure numeric columns
+    for col in SOURCE_SCHEMAS[source]['count_columns']:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    return df
+
+
+def load_source(base_path, source, n_jobs=None, use_processes=False):
+    """
+    Read every CSV drop of a source concurrently and combine them.
+
+    Args:
+        base_path (str | Path): Base directory containing the data folders
+        source (str): Key of SOURCE_SCHEMAS
+        n_jobs (int | None): Pool size; None uses one worker per CPU core
+        use_processes (bool): Use a process pool instead of threads
+
+    Returns:
+        tuple[pd.DataFrame, list[tuple[str, int]]]: Combined frame and the
+        (file name, row count) of every file read
+    """
+    files = source_files(base_path, source)
+    if not files:
+        folder = Path(base_path) / SOURCE_SCHEMAS[source]['folder']
+        raise FileNotFoundError(f"No CSV files found in {folder}")
+
+    workers = min(len(files), n_jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        frames = [read_source_file(path, source) for path in files]
+    else:
+        executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with executor(max_workers=workers) as pool:
+            frames = list(pool.map(read_source_file, files, repeat(source)))
+
+    file_rows = [(path.name, len(frame)) for path, frame in zip(files, frames)]
+    return concat_preallocated(frames), file_rows
@@ -0,0 +1,304 @@
+"""
+Aadhaar Pipeline Instrumentation
+================================
+
+Per-stage measurements of a pipeline run, written as a machine-readable run
+report (JSON with full detail, CSV with one row per stage).
+
+For every stage the report records:
+
+    - wall time and CPU time (own process, and of finished worker processes)
+    - CPU time of the thread that ran the stage
+    - resident set size before/after, and how much the stage raised the
+      process peak RSS
+    - the stages that ran at the same time (overlapped_with)
+    - optionally the tracemalloc peak of Python allocations in the stage
+    - rows and in-memory size of the DataFrames going in and coming out
+    - status, and the error type, message and traceback if the stage failed
+
+The run itself is marked as failed when a stage failed or when the
+pipeline recorded an exception raised between stages (RunReport.fail).
+
+Each stage can optionally be run under cProfile; the stats are dumped next
+to the report as <run>.<stage>.prof (view with pstats or snakeviz).
+
+RSS is read through psutil when installed, otherwise from /proc and the
+resource module; fields that cannot be measured on a platform are null.
+
+Process CPU time and RSS are process-wide. When stages run concurrently
+(the stage scheduler of the complete pipeline), those fields of an
+overlapping stage include its siblings; thread_cpu_seconds then isolates
+the stage's own thread (but misses work it hands to pools). The report
+says so in 'notes' whenever stages overlapped.
+"""
+
+import cProfile
+import csv
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+MB = 1024 * 1024
+
+CSV_FIELDS = [
+    'stage', 'status', 'wall_seconds', 'cpu_seconds', 'thread_cpu_seconds', 'child_cpu_seconds',
+    'rss_before_mb', 'rss_after_mb', 'peak_rss_mb', 'peak_rss_delta_mb',
+    'tracemalloc_peak_mb', 'rows_in', 'rows_out', 'frames_in_mb', 'frames_out_mb',
+    'overlapped_with', 'error',
+]
+OVERLAP_NOTE = (
+    "Stages listed with overlapped_with ran concurrently: their cpu_seconds, child_cpu_seconds "
+    "and RSS fields are process-wide and include the overlapping stages; thread_cpu_seconds "
+    "counts only the stage's own thread."
+)
+
+
+def current_rss():
+    """Resident set size of this process in bytes (None if unavailable)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes (None if unavailable)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', None)
+    return None
+
+
+def frame_stats(frames):
+    """
+    Rows and deep memory footprint of named DataFrames.
+
+    Args:
+        frames (dict[str, pd.DataFrame]): Frames by name (None values are skipped)
+
+    Returns:
+        dict[str, dict]: name -> {'rows', 'mb'}
+    """
+    return {
+        name: {'rows': len(df), 'mb': _mb(df.memory_usage(deep=True).sum())}
+        for name, df in frames.items() if df is not None
+    }
+
+
+def _mb(value):
+    return None if value is None else round(value / MB, 3)
+
+
+class StageRecord:
+    """
+    Measurements of one stage; yielded by RunReport.stage.
+    """
+
+    def __init__(self, name, frames_in):
+        self.name = name
+        self.frames_in = frame_stats(frames_in)
+        self.frames_out = {}
+        self.rows_in = None
+        self.rows_out = None
+
+    def set_outputs(self, frames):
+        """Record the DataFrames produced by the stage."""
+        self.frames_out = frame_stats(frames)
+
+    def set_rows(self, rows_in=None, rows_out=None):
+        """Record row counts of stages whose data never sits in one DataFrame."""
+        self.rows_in = rows_in
+        self.rows_out = rows_out
+
+
+class RunReport:
+    """
+    Collects StageRecords for one pipeline run and writes the run report.
+    """
+
+    def __init__(self, pipeline, report_dir, profile=False, trace_memory=False, settings=None):
+        """
+        Args:
+            pipeline (str): Pipeline name, e.g. 'complete'
+            report_dir (str | Path): Directory for the report files
+            profile (bool): Run every stage under cProfile
+            trace_memory (bool): Track Python allocation peaks with tracemalloc
+                (adds noticeable overhead)
+            settings (dict): Run parameters copied into the report
+        """
+        self.pipeline = pipeline
+        self.report_dir = Path(report_dir)
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.started = datetime.now()
+        self.run_id = f"{pipeline}_{self.started:%Y%m%dT%H%M%S%f}"
+        self.settings = settings or {}
+        self.stages = []
+        # Run-level failure outside any stage: {'error', 'traceback'}
+        self.error = None
+        self._wall_start = time.perf_counter()
+        # Running stage -> (name, names of the stages that overlapped it so far)
+        self._running = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, frames_in=None):
+        """
+        Measure the enclosed block as one stage.
+
+        Exceptions are recorded on the stage and re-raised.
+
+        Args:
+            name (str): Stage name
+            frames_in (dict[str, pd.DataFrame]): DataFrames consumed by the stage
+
+        Yields:
+            StageRecord: call set_outputs() on it with the frames produced
+        """
+        record = StageRecord(name, frames_in or {})
+        entry = {'stage': name, 'status': 'ok', 'error': None, 'traceback': None}
+        profiler = cProfile.Profile() if self.profile else None
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+
+        token = object()
+        with self._lock:
+            for other, overlapped in self._running.values():
+                overlapped.add(name)
+            self._running[token] = (name, {other for other, _ in self._running.values()})
+
+        rss_before, peak_before = current_rss(), peak_rss()
+        times_before = os.times()
+        thread_before = time.thread_time()
+        wall_start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        except BaseException as exc:
+            entry['status'] = 'error'
+            entry['error'] = f"{type(exc).__name__}: {exc}"
+            entry['traceback'] = traceback.format_exc()
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall = time.perf_counter() - wall_start
+            thread_cpu = time.thread_time() - thread_before
+            times_after = os.times()
+            peak_after = peak_rss()
+
+            entry.update({
+                'wall_seconds': round(wall, 4),
+                'cpu_seconds': round((times_after.user - times_before.user)
+                                     + (times_after.system - times_before.system), 4),
+                'thread_cpu_seconds': round(thread_cpu, 4),
+                'child_cpu_seconds': round((times_after.children_user - times_before.children_user)
+                                           + (times_after.children_system - times_before.children_system), 4),
+                'rss_before_mb': _mb(rss_before),
+                'rss_after_mb': _mb(current_rss()),
+                'peak_rss_mb': _mb(peak_after),
+                'peak_rss_delta_mb': (_mb(peak_after - peak_before)
+                                      if peak_before is not None and peak_after is not None else None),
+                'tracemalloc_peak_mb': (_mb(tracemalloc.get_traced_memory()[1] - traced_before)
+                                        if self.trace_memory else None),
+                'rows_in': (record.rows_in if record.rows_in is not None
+                            else sum(stats['rows'] for stats in record.frames_in.values())),
+                'rows_out': (record.rows_out if record.rows_out is not None
+                             else sum(stats['rows'] for stats in record.frames_out.values())),
+                'frames_in_mb': round(sum(stats['mb'] for stats in record.frames_in.values()), 3),
+                'frames_out_mb': round(sum(stats['mb'] for stats in record.frames_out.values()), 3),
+                'frames_in': record.frames_in,
+                'frames_out': record.frames_out,
+                'profile': None,
+            })
+            with self._lock:
+                entry['overlapped_with'] = sorted(self._running.pop(token)[1])
+            if profiler is not None:
+                self.report_dir.mkdir(parents=True, exist_ok=True)
+                profile_path = self.report_dir / f"{self.run_id}.{name}.prof"
+                profiler.dump_stats(profile_path)
+                entry['profile'] = str(profile_path)
+            self.stages.append(entry)
+
+    def fail(self, exc):
+        """
+        Record an exception that ended the run, whether or not a stage
+        recorded it (failures between stages only show up here).
+
+        Call from the handler catching the exception.
+
+        Args:
+            exc (BaseException): The exception
+        """
+        self.error = {'error': f"{type(exc).__name__}: {exc}", 'traceback': traceback.format_exc()}
+
+    def write(self):
+        """
+        Write <run_id>.json and <run_id>.csv to the report directory.
+
+        Returns:
+            Path: The JSON report
+        """
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        failed = [stage['stage'] for stage in self.stages if stage['status'] != 'ok']
+        report = {
+            'run_id': self.run_id,
+            'pipeline': self.pipeline,
+            'started': self.started.isoformat(timespec='seconds'),
+            'status': 'error' if failed or self.error is not None else 'ok',
+            'failed_stage': failed[0] if failed else None,
+            'error': self.error['error'] if self.error is not None else None,
+            'traceback': self.error['traceback'] if self.error is not None else None,
+            'wall_seconds': round(time.perf_counter() - self._wall_start, 4),
+            'peak_rss_mb': _mb(peak_rss()),
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+            },
+            'settings': self.settings,
+            'notes': [OVERLAP_NOTE] if any(stage['overlapped_with'] for stage in self.stages) else [],
+            'stages': self.stages,
+        }
+        json_path = self.report_dir / f"{self.run_id}.json"
+        json_path.write_text(json.dumps(report, indent=2, default=str))
+
+        with open(self.report_dir / f"{self.run_id}.csv", 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.DictWriter(handle, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(
+                {**stage, 'overlapped_with': ';'.join(stage['overlapped_with'])} for stage in self.stages
+            )
+        return json_path
@@ -12,21 +12,66 @@ to compute the Aadhaar Stability Index (ASI) and predict future service load.
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, r2_score
 import warnings
+import hashlib
+import json
 import os
+import shutil
+import threading
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
 
+from aadhaar_anomaly import DISTRICT_SERIES, PINCODE_SERIES, detect_series_anomalies
+from aadhaar_cache import CleanedSourceCache
+from aadhaar_dedup import (
+    DEDUP_POLICIES, DEFAULT_DEDUP_POLICY, combine_reports, dedup_summary, deduplicate
+)
+from aadhaar_features import FEATURE_COLUMNS, add_features, compute_features, feature_matrix
+from aadhaar_forecast import FORECAST_HORIZON, FORECAST_TARGETS, RETRAIN_AFTER_DAYS, ServiceLoadForecaster
+from aadhaar_instrumentation import RunReport
+from aadhaar_incremental import (
+    IncrementalStore, add_measures, combine_aggregates, compute_aggregates, cube_cells, key_index,
+    level_stats, save_aggregates, update_aggregates
+)
+from aadhaar_ingestion import (
+    KEY_COLUMNS, SOURCE_SCHEMAS, clean_source_frame, concat_preallocated, load_source, source_files
+)
+from aadhaar_merge import merge_sources
+from aadhaar_normalization import RegionNormalizer
+from aadhaar_parallel import imap_partitions, map_partitions
+from aadhaar_model_selection import (
+    DEFAULT_CANDIDATE, DEFAULT_GRID, MODEL_FAMILIES, FoldCache, load_grid, preload_estimators,
+    select_candidate, successive_halving
+)
+from aadhaar_model_store import ModelStore, fingerprint_drift
+from aadhaar_query import publish_query_index
+from aadhaar_reporting import PLOT_MODES, render_figure, render_reports, save_report_table
+from aadhaar_scheduler import CheckpointStore, Stage, StageScheduler
+from aadhaar_scoring import SCORE_BATCH_ROWS, format_report, predict_batched
+from aadhaar_training import (
+    DEFAULT_TRAINING_ROWS, HISTOGRAM_CANDIDATE, TRAINING_MODES, compare_training, eligible_rows,
+    fingerprint_rows, fit_timed, gather_rows, state_month_strata, stratified_sample
+)
+from aadhaar_streaming import (
+    PREDICTION_COLUMNS, featurize_partition, init_scoring_worker, keep_top_priorities,
+    merge_training_samples, partition_slug, quarantine_pieces, score_partition, spill_partitions
+)
+from aadhaar_validation import RuleSet, load_rules, quarantine_path, validation_summary, write_quarantine
+from aadhaar_writers import OUTPUT_FORMATS, assemble_parts, prediction_columns, write_dataset
+
 warnings.filterwarnings('ignore')
 
-# Set style for visualizations
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (14, 8)
-plt.rcParams['font.size'] = 10
+SOURCE_FRAMES = [f'{source}_df' for source in SOURCE_SCHEMAS]
+# Dataset names (the suffix depends on the output format)
+DATASET_FILES = {
+    **{f'{source}_df': f'cleaned_{source}_data' for source in SOURCE_SCHEMAS},
+    'master_df': 'master_dataset_with_asi',
+}
+PREDICTIONS_FILE = 'predictions_biometric_load'
+PARTIAL_STEPS = ['ingest', 'clean', 'featurize', 'train']
+# Rows of the day-level anomaly sheets (all flagged days go to the CSV)
+ANOMALY_SHEET_ROWS = 1000
 
 
 class AadhaarIntelligenceSystem:
@@ -34,23 +79,149 @@ class AadhaarIntelligenceSystem:
     Complete pipeline for Aadhaar data analysis and prediction.
     """
     
-    def __init__(self, base_path):
+    def __init__(self, base_path, n_jobs=None, use_processes=False, use_cache=False, cache_dir=None,
+                 model_dir=None, retrain='auto', drift_threshold=0.25,
+                 score_batch_rows=SCORE_BATCH_ROWS, profile_stages=False, trace_memory=False,
+                 plots='inline', plot_dpi=300, plot_format='png', query_index=True,
+                 forecast_horizon=FORECAST_HORIZON, select_model=False, model_grid=None,
+                 selection_tolerance=0.05, training_mode='full',
+                 training_rows=DEFAULT_TRAINING_ROWS, compare_training=False,
+                 output_format='csv', region_aliases=None, dedup_policy=DEFAULT_DEDUP_POLICY,
+                 validate=True, validation_rules=None, checkpoints=True, stage_workers=None):
         """
         Initialize the system with base directory path.
         
         Args:
             base_path (str): Base directory containing the three data folders
+            n_jobs (int): Worker count for parallel stages (None = all cores)
+            use_processes (bool): Read CSV files in a process pool instead of threads
+            use_cache (bool): Reuse cleaned sources cached from previous runs
+            cache_dir (str): Cache location (default: outputs/cache)
+            model_dir (str): Model store location (default: outputs/models)
+            retrain (str): 'auto' (retrain when the training data drifts past
+                drift_threshold), 'always' or 'never' (always reuse the stored model)
+            drift_threshold (float): Fingerprint drift that triggers retraining
+            score_batch_rows (int): Rows per prediction block (bounds scoring memory)
+            profile_stages (bool): Run every pipeline stage under cProfile
+            trace_memory (bool): Record tracemalloc peaks per stage (slower)
+            plots (str): 'inline' (draw figures as each section finishes, or
+                on the main thread once concurrent stages are done),
+                'deferred' (draw them in a separate, parallel step after the
+                run) or 'none' (headless: write the report data only)
+            plot_dpi (int): Figure resolution
+            plot_format (str): Figure format (png, svg, pdf, ...)
+            query_index (bool): Publish the date-range query index of the
+                scored data after each run (see aadhaar_query)
+            forecast_horizon (int): Days of district load forecast per run
+            select_model (bool): Choose the model by time-series
+                cross-validation over model_grid whenever one is trained
+                (see aadhaar_model_selection) instead of the default forest
+            model_grid (list[dict] | str | None): Candidates, or a JSON file
+                of them (default: DEFAULT_GRID)
+            selection_tolerance (float): Accuracy target of the selection:
+                MAE at most this fraction above the best candidate's
+            training_mode (str): 'full' (every row with biometric updates),
+                'sampled' (at most training_rows of them, stratified by
+                state x month) or 'histogram' (the same sample, fitted with
+                histogram gradient boosting); see aadhaar_training
+            training_rows (int): Sample size of the sampled/histogram modes
+            compare_training (bool): Also fit the full data and report the
+                accuracy/time trade-off of the training mode
+            output_format (str): Format of the cleaned, master and prediction
+                datasets: 'csv', 'csv.gz', 'parquet' (partitioned by state
+                and month) or 'feather'; see aadhaar_writers
+            region_aliases (str | None): JSON file of state/district alias
+                maps (default: the built-in state aliases); see
+                aadhaar_normalization
+            dedup_policy (str): How repeated (date, state, district, pincode)
+                records are resolved: 'first', 'sum', 'max' or 'exact'
+                (drop exact copies only); see aadhaar_dedup
+            validate (bool): Check the raw sources against the validation
+                rules before cleaning and quarantine failing rows
+            validation_rules (str | None): JSON rule set (default: the
+                built-in rules); see aadhaar_validation
+            checkpoints (bool): Checkpoint the stage outputs of the complete
+                pipeline so a failed run can be resumed (see aadhaar_scheduler)
+            stage_workers (int | None): Independent stages of the complete
+                pipeline run at once (None: as many as are ready; forced to
+                1 when profiling or tracing memory)
         """
+        if retrain not in ('auto', 'always', 'never'):
+            raise ValueError(f"retrain must be 'auto', 'always' or 'never', got {retrain!r}")
+        if plots not in PLOT_MODES:
+            raise ValueError(f"plots must be one of {PLOT_MODES}, got {plots!r}")
+        if training_mode not in TRAINING_MODES:
+            raise ValueError(f"training_mode must be one of {TRAINING_MODES}, got {training_mode!r}")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}, got {output_format!r}")
+        if dedup_policy not in DEDUP_POLICIES:
+            raise ValueError(f"dedup_policy must be one of {DEDUP_POLICIES}, got {dedup_policy!r}")
         self.base_path = Path(base_path)
+        self.n_jobs = n_jobs
+        self.use_processes = use_processes
+        self.use_cache = use_cache
+        self.cache_report = {}
+        self.dedup_policy = dedup_policy
+        self.dedup_report = {}
         self.enrolment_df = None
         self.demographic_df = None
         self.biometric_df = None
         self.master_df = None
         self.predictions_df = None
+        self.aggregates = None
+        self._cube_cells = None
+        self.model = None
+        self.feature_cols = None
+        self.model_version = None
+        self.model_metrics = None
+        self.training_fingerprint = None
+        self.retrain = retrain
+        self.drift_threshold = drift_threshold
+        self.score_batch_rows = score_batch_rows
+        self.profile_stages = profile_stages
+        self.trace_memory = trace_memory
+        self.run_report = None
+        self.plots = plots
+        self.plot_dpi = plot_dpi
+        self.plot_format = plot_format
+        self.pending_figures = []
+        # Inline figures of stages run off the main thread: (name, tables)
+        self._queued_figures = []
+        self._plot_lock = threading.Lock()
+        self.query_index = query_index
+        self.forecast_horizon = forecast_horizon
+        self.select_model = select_model
+        self.model_grid = load_grid(model_grid) if isinstance(model_grid, (str, Path)) else model_grid
+        self.selection_tolerance = selection_tolerance
+        self.model_selection_report = None
+        self.training_mode = training_mode
+        self.training_rows = training_rows
+        self.compare_training = compare_training
+        self.training_report = None
+        self.output_format = output_format
+        self.normalizer = RegionNormalizer.from_file(region_aliases) if region_aliases else RegionNormalizer()
+        self.validator = RuleSet(
+            load_rules(validation_rules) if validation_rules else None, self.normalizer
+        ) if validate else None
+        self.validation_report = {}
+        self.forecast_df = None
+        self.feature_matrix = None
+        self._featured_df = None
+        self.source_cache = None
+        self.removed_keys = []
+        self.checkpoints = checkpoints
+        self.stage_workers = stage_workers
+        self.stage_report = None
         
         # Create output directory
         self.output_dir = self.base_path / 'outputs'
         self.output_dir.mkdir(exist_ok=True)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.output_dir / 'cache'
+        self.report_data_dir = self.output_dir / 'report_data'
+        self.query_index_dir = self.output_dir / 'query_index'
+        self.forecast_dir = self.output_dir / 'forecast'
+        self.checkpoint_dir = self.output_dir / 'checkpoints'
+        self.model_store = ModelStore(Path(model_dir) if model_dir else self.output_dir / 'models')
         
         print("=" * 80)
         print("AADHAAR STABILITY & SERVICE LOAD INTELLIGENCE SYSTEM")
@@ -67,46 +238,60 @@ class AadhaarIntelligenceSystem:
     def load_all_datasets(self):
         """
         Load all CSV files from the three directories and combine them.
+        
+        Files are read concurrently with a pinned schema per source
+        (categorical state/district, int32 pincode and counts, dates parsed
+        on read); see aadhaar_ingestion.
         """
         print("SECTION 1: DATA LOADING")
         print("-" * 80)
         
-        # Load enrolment data
-        print("Loading Enrolment Data...")
-        enrolment_files = list((self.base_path / 'api_data_aadhar_enrolment').glob('*.csv'))
-        enrolment_dfs = []
-        for file in enrolment_files:
-            df = pd.read_csv(file)
-            enrolment_dfs.append(df)
-            print(f"  ✓ Loaded {file.name}: {len(df):,} records")
-        self.enrolment_df = pd.concat(enrolment_dfs, ignore_index=True)
-        print(f"  Total Enrolment Records: {len(self.enrolment_df):,}\n")
-        
-        # Load demographic data
-        print("Loading Demographic Update Data...")
-        demographic_files = list((self.base_path / 'api_data_aadhar_demographic').glob('*.csv'))
-        demographic_dfs = []
-        for file in demographic_files:
-            df = pd.read_csv(file)
-            demographic_dfs.append(df)
-            print(f"  ✓ Loaded {file.name}: {len(df):,} records")
-        self.demographic_df = pd.concat(demographic_dfs, ignore_index=True)
-        print(f"  Total Demographic Records: {len(self.demographic_df):,}\n")
-        
-        # Load biometric data
-        print("Loading Biometric Update Data...")
-        biometric_files = list((self.base_path / 'api_data_aadhar_biometric').glob('*.csv'))
-        biometric_dfs = []
-        for file in biometric_files:
-            df = pd.read_csv(file)
-            biometric_dfs.append(df)
-            print(f"  ✓ Loaded {file.name}: {len(df):,} records")
-        self.biometric_df = pd.concat(biometric_dfs, ignore_index=True)
-        print(f"  Total Biometric Records: {len(self.biometric_df):,}\n")
+        for source, schema in SOURCE_SCHEMAS.items():
+            print(f"Loading {schema['description']} Data...")
+            df, file_rows = load_source(
+                self.base_path, source,
+                n_jobs=self.n_jobs, use_processes=self.use_processes
+            )
+            for file_name, rows in file_rows:
+                print(f"  ✓ Loaded {file_name}: {rows:,} records")
+            setattr(self, f'{source}_df', df)
+            print(f"  Total {schema['label']} Records: {len(df):,}\n")
         
         print("✓ All datasets loaded successfully!\n")
     
     
+    # =========================================================================
+    # SECTION 1B: DATA VALIDATION
+    # =========================================================================
+    
+    def validate_datasets(self):
+        """
+        Check the raw sources against the validation rules.
+        
+        Rows breaking any rule are removed from the source frames and
+        written to outputs/quarantine/<source>_quarantine.csv with the IDs
+        of the rules they broke; see aadhaar_validation.
+        """
+        print("\nSECTION 1B: DATA VALIDATION")
+        print("-" * 80)
+        
+        for source, schema in SOURCE_SCHEMAS.items():
+            print(f"Validating {schema['description']} Data...")
+            df, quarantine, report = self.validator.validate(getattr(self, f'{source}_df'), source)
+            setattr(self, f'{source}_df', df)
+            self._record_validation(source, report, [quarantine])
+        
+        print("✓ All datasets validated!\n")
+    
+    def _record_validation(self, source, report, quarantine):
+        """Keep a source's validation report and write its quarantine file."""
+        self.validation_report[source] = report
+        print(f"  ✓ {validation_summary(report)}")
+        path = quarantine_path(self.output_dir, source)
+        if write_quarantine(quarantine, path):
+            print(f"  ✓ Saved: {path}")
+    
+    
     # =========================================================================
     # SECTION 2: DATA CLEANING
     # =========================================================================
@@ -114,68 +299,75 @@ class AadhaarIntelligenceSystem:
     def clean_and_standardize(self):
         """
         Clean and standardize all three datasets.
+        
+        Region names and PIN codes are normalized once per distinct value
+        against dictionaries shared by the three sources (self.normalizer).
         """
         print("\nSECTION 2: DATA CLEANING & STANDARDIZATION")
         print("-" * 80)
         
-        # Clean Enrolment Data
-        print("Cleaning Enrolment Data...")
-        self.enrolment_df.columns = self.enrolment_df.columns.str.strip().str.lower()
-        self.enrolment_df['date'] = pd.to_datetime(self.enrolment_df['date'], format='%d-%m-%Y', errors='coerce')
-        self.enrolment_df['state'] = self.enrolment_df['state'].str.strip()
-        self.enrolment_df['district'] = self.enrolment_df['district'].str.strip()
-        self.enrolment_df['pincode'] = self.enrolment_df['pincode'].astype(str).str.strip()
-        
-        # Ensure numeric columns
-        for col in ['age_0_5', 'age_5_17', 'age_18_greater']:
-            self.enrolment_df[col] = pd.to_numeric(self.enrolment_df[col], errors='coerce').fillna(0)
-        
-        # Remove duplicates
-        before = len(self.enrolment_df)
-        self.enrolment_df.drop_duplicates(subset=['date', 'state', 'district', 'pincode'], keep='first', inplace=True)
-        after = len(self.enrolment_df)
-        print(f"  ✓ Removed {before - after:,} duplicate records")
-        print(f"  ✓ Final Enrolment Records: {after:,}\n")
-        
-        # Clean Demographic Data
-        print("Cleaning Demographic Update Data...")
-        self.demographic_df.columns = self.demographic_df.columns.str.strip().str.lower()
-        self.demographic_df['date'] = pd.to_datetime(self.demographic_df['date'], format='%d-%m-%Y', errors='coerce')
-        self.demographic_df['state'] = self.demographic_df['state'].str.strip()
-        self.demographic_df['district'] = self.demographic_df['district'].str.strip()
-        self.demographic_df['pincode'] = self.demographic_df['pincode'].astype(str).str.strip()
-        
-        # Ensure numeric columns
-        for col in ['demo_age_5_17', 'demo_age_17_']:
-            self.demographic_df[col] = pd.to_numeric(self.demographic_df[col], errors='coerce').fillna(0)
-        
-        before = len(self.demographic_df)
-        self.demographic_df.drop_duplicates(subset=['date', 'state', 'district', 'pincode'], keep='first', inplace=True)
-        after = len(self.demographic_df)
-        print(f"  ✓ Removed {before - after:,} duplicate records")
-        print(f"  ✓ Final Demographic Records: {after:,}\n")
-        
-        # Clean Biometric Data
-        print("Cleaning Biometric Update Data...")
-        self.biometric_df.columns = self.biometric_df.columns.str.strip().str.lower()
-        self.biometric_df['date'] = pd.to_datetime(self.biometric_df['date'], format='%d-%m-%Y', errors='coerce')
-        self.biometric_df['state'] = self.biometric_df['state'].str.strip()
-        self.biometric_df['district'] = self.biometric_df['district'].str.strip()
-        self.biometric_df['pincode'] = self.biometric_df['pincode'].astype(str).str.strip()
-        
-        # Ensure numeric columns
-        for col in ['bio_age_5_17', 'bio_age_17_']:
-            self.biometric_df[col] = pd.to_numeric(self.biometric_df[col], errors='coerce').fillna(0)
-        
-        before = len(self.biometric_df)
-        self.biometric_df.drop_duplicates(subset=['date', 'state', 'district', 'pincode'], keep='first', inplace=True)
-        after = len(self.biometric_df)
-        print(f"  ✓ Removed {before - after:,} duplicate records")
-        print(f"  ✓ Final Biometric Records: {after:,}\n")
+        for source, schema in SOURCE_SCHEMAS.items():
+            print(f"Cleaning {schema['description']} Data...")
+            df = clean_source_frame(getattr(self, f'{source}_df'), source, self.normalizer)
+            print(f"  ✓ Regions: {df['state'].cat.categories.size:,} states, "
+                  f"{df['district'].cat.categories.size:,} districts | "
+                  f"invalid PIN codes: {df['pincode'].isna().sum():,}")
+            
+            # Resolve repeated keys
+            df, report = deduplicate(df, self.dedup_policy)
+            self.dedup_report[source] = report
+            setattr(self, f'{source}_df', df)
+            print(f"  ✓ {dedup_summary(report)}")
+            print(f"  ✓ Final {schema['label']} Records: {len(df):,}\n")
         
         print("✓ All datasets cleaned and standardized!\n")
     
     
+    def load_cleaned_datasets(self, track_removed=False):
+        """
+        Cached replacement for load_all_datasets + clean_and_standardize.
+        
+        Source files whose size/mtime/hash match the cache manifest are
+        loaded from the columnar cache without parsing; only new or changed
+        files are read and cleaned. Cache hits and misses are reported per
+        dataset and kept in self.cache_report.
+        
+        Args:
+            track_removed (bool): Keep the keys of the cache entries that
+                changed or deleted files replaced in self.removed_keys
+        """
+        print("SECTION 1-2: CACHED DATA LOADING & CLEANING")
+        print("-" * 80)
+        print(f"Cache Directory: {self.cache_dir}\n")
+        
+        cache = CleanedSourceCache(self.cache_dir, self.normalizer, self.validator, track_removed)
+        self.source_cache = cache
+        self.removed_keys = []
+        for source, schema in SOURCE_SCHEMAS.items():
+            print(f"Loading {schema['description']} Data...")
+            df, stats = cache.load_source(
+                self.base_path, source,
+                n_jobs=self.n_jobs, use_processes=self.use_processes
+            )
+            print(f"  ✓ Cache hits: {stats['hits']:,} | misses: {stats['misses']:,}")
+            for file_name in stats['missed_files']:
+                print(f"    - Parsed and cleaned {file_name}")
+            if self.validator is not None:
+                self._record_validation(source, stats['validation'], stats.pop('quarantine'))
+            if track_removed:
+                self.removed_keys.extend(stats.pop('removed_keys'))
+            
+            df, report = deduplicate(df, self.dedup_policy)
+            stats['duplicates_removed'] = report['rows_removed']
+            self.cache_report[source] = stats
+            self.dedup_report[source] = report
+            setattr(self, f'{source}_df', df)
+            print(f"  ✓ {dedup_summary(report)}")
+            print(f"  ✓ Final {schema['label']} Records: {len(df):,}\n")
+        
+        print("✓ All datasets loaded and cleaned!\n")
+    
+    
     # =========================================================================
     # SECTION 3: DATA MERGING
     # =========================================================================
@@ -187,42 +379,42 @@ class AadhaarIntelligenceSystem:
         print("\nSECTION 3: DATA MERGING")
         print("-" * 80)
         
-        merge_keys = ['date', 'state', 'district', 'pincode']
-        
-        # Start with enrolment data
-        print("Merging datasets using outer joins...")
-        self.master_df = self.enrolment_df.copy()
-        
-        # Merge with demographic data
-        self.master_df = self.master_df.merge(
-            self.demographic_df,
-            on=merge_keys,
-            how='outer',
-            suffixes=('', '_demo')
-        )
-        print(f"  ✓ After demographic merge: {len(self.master_df):,} records")
-        
-        # Merge with biometric data
-        self.master_df = self.master_df.merge(
-            self.biometric_df,
-            on=merge_keys,
-            how='outer',
-            suffixes=('', '_bio')
+        print("Merging datasets using a single-pass keyed outer join...")
+        self.master_df = self._merge_frames(
+            self.enrolment_df, self.demographic_df, self.biometric_df, verbose=True
         )
-        print(f"  ✓ After biometric merge: {len(self.master_df):,} records")
-        
-        # Fill missing values with 0 for numeric columns
-        numeric_cols = self.master_df.select_dtypes(include=[np.number]).columns
-        self.master_df[numeric_cols] = self.master_df[numeric_cols].fillna(0)
-        
-        # Drop rows with missing date
-        self.master_df.dropna(subset=['date'], inplace=True)
+        self.aggregates = self._cube_cells = None
         
         print(f"  ✓ Final Master Dataset: {len(self.master_df):,} records")
         print(f"  ✓ Columns: {list(self.master_df.columns)}\n")
         
         print("✓ Datasets merged successfully!\n")
     
+    def _merge_frames(self, enrolment_df, demographic_df, biometric_df, verbose=False):
+        """
+        Outer-join the three cleaned sources on (date, state, district, pincode).
+        
+        The keys are encoded into one integer against dictionaries shared by
+        the three sources and combined in a single pass (see aadhaar_merge),
+        so counts come out zero-filled without intermediate merged frames.
+        
+        Args:
+            enrolment_df, demographic_df, biometric_df (pd.DataFrame): Cleaned sources
+            verbose (bool): Print input/output record counts
+        
+        Returns:
+            pd.DataFrame: Merged frame with zero-filled counts and no missing dates
+        """
+        sources = [enrolment_df, demographic_df, biometric_df]
+        master_df = merge_sources(sources)
+        if verbose:
+            print(f"  ✓ Combined {sum(len(df) for df in sources):,} source records "
+                  f"in a single keyed pass")
+            for col in ['state', 'district', 'pincode']:
+                print(f"  ✓ Shared {col} dictionary: {len(master_df[col].cat.categories):,} values")
+        
+        return master_df
+    
     
     # =========================================================================
     # SECTION 4: FEATURE ENGINEERING
@@ -235,73 +427,87 @@ class AadhaarIntelligenceSystem:
         print("\nSECTION 4: FEATURE ENGINEERING")
         print("-" * 80)
         
-        # Total enrolments by age group
-        self.master_df['total_enrolments'] = (
-            self.master_df['age_0_5'] + 
-            self.master_df['age_5_17'] + 
-            self.master_df['age_18_greater']
-        )
+        # Fused kernel: all derived columns plus the float32 model matrix in one pass
+        self.feature_matrix = compute_features(self.master_df)
+        self._featured_df = self.master_df
         print("  ✓ Created: total_enrolments")
-        
-        # Total demographic updates
-        self.master_df['total_demo_updates'] = (
-            self.master_df['demo_age_5_17'] + 
-            self.master_df['demo_age_17_']
-        )
         print("  ✓ Created: total_demo_updates")
-        
-        # Total biometric updates
-        self.master_df['total_bio_updates'] = (
-            self.master_df['bio_age_5_17'] + 
-            self.master_df['bio_age_17_']
-        )
         print("  ✓ Created: total_bio_updates")
-        
-        # Total updates (demographic + biometric)
-        self.master_df['total_updates'] = (
-            self.master_df['total_demo_updates'] + 
-            self.master_df['total_bio_updates']
-        )
         print("  ✓ Created: total_updates")
-        
-        # Update ratio
-        self.master_df['update_ratio'] = np.where(
-            self.master_df['total_enrolments'] > 0,
-            self.master_df['total_updates'] / self.master_df['total_enrolments'],
-            0
-        )
         print("  ✓ Created: update_ratio")
-        
-        # =====================================================================
-        # AADHAAR STABILITY INDEX (ASI)
-        # =====================================================================
-        # ASI = 1 - (Total Updates / Total Enrolments)
-        # High ASI → Stable Aadhaar records
-        # Low ASI → Poor data quality, high rework
-        
-        self.master_df['asi'] = 1 - self.master_df['update_ratio']
-        self.master_df['asi'] = self.master_df['asi'].clip(lower=0, upper=1)  # Ensure between 0 and 1
         print("  ✓ Created: asi (Aadhaar Stability Index)")
-        
-        # Log-transformed features (for better ML performance)
-        self.master_df['log_enrolments'] = np.log1p(self.master_df['total_enrolments'])
-        self.master_df['log_updates'] = np.log1p(self.master_df['total_updates'])
         print("  ✓ Created: log_enrolments, log_updates")
-        
-        # Date features
-        self.master_df['year'] = self.master_df['date'].dt.year
-        self.master_df['month'] = self.master_df['date'].dt.month
-        self.master_df['day_of_week'] = self.master_df['date'].dt.dayofweek
         print("  ✓ Created: year, month, day_of_week")
         
         print(f"\n  Total Features: {len(self.master_df.columns)}")
         print("✓ Feature engineering completed!\n")
     
+    def _add_features(self, df):
+        """
+        Add the engineered feature columns to a merged frame in place.
+        """
+        return add_features(df)
+    
+    def _feature_matrix(self, feature_cols):
+        """
+        float32 model matrix for self.master_df.
+        
+        Reuses the matrix built by engineer_features when it belongs to the
+        current master frame; otherwise converts the feature columns.
+        """
+        if (self.feature_matrix is not None and self._featured_df is self.master_df
+                and list(feature_cols) == FEATURE_COLUMNS):
+            return self.feature_matrix
+        return feature_matrix(self.master_df, feature_cols)
+    
     
     # =========================================================================
     # SECTION 5: EXPLORATORY DATA ANALYSIS (EDA)
     # =========================================================================
     
+    def build_rollup_cube(self):
+        """
+        Aggregate the master dataset into the rollup cube in one pass.
+        
+        Every EDA, anomaly, prediction and summary report is a slice of the
+        cube (see aadhaar_incremental), so the master rows are scanned once
+        instead of once per report.
+        """
+        self._cube_cells = cube_cells(self.master_df)
+        self.aggregates = compute_aggregates(self.master_df, cells=self._cube_cells)
+        print(f"  ✓ Rollup cube: {len(self.aggregates['district_date']):,} district-days, "
+              f"{len(self.aggregates['district_pincode']):,} district PIN codes\n")
+    
+    def _cube(self):
+        """The rollup cube, built from self.master_df on first use."""
+        if self.aggregates is None:
+            self.build_rollup_cube()
+        return self.aggregates
+    
+    def _level_stats(self, level, spec):
+        """
+        Per-level sums/means/standard deviations from the rollup cube.
+        
+        Args:
+            level (str): 'state', 'district' (keyed by state and district),
+                'pincode' or 'date'
+            spec (dict): {column: 'sum' | 'mean' | 'std'}
+        """
+        return level_stats(self._cube(), level, spec)
+    
+    def _total(self, col):
+        """Dataset-wide sum of a column."""
+        return self._cube()['overall'][col].iloc[0]
+    
+    def _mean(self, col):
+        """Dataset-wide mean of a column."""
+        overall = self._cube()['overall']
+        return overall[col].iloc[0] / overall['n_records'].iloc[0]
+    
+    def _distinct(self, level):
+        """Number of distinct states, (state, district) pairs, PIN codes or dates."""
+        return len(self._cube()[level])
+    
     def perform_eda(self):
         """
         Generate comprehensive exploratory data analysis and visualizations.
@@ -310,118 +516,46 @@ class AadhaarIntelligenceSystem:
         print("-" * 80)
         
         # Calculate district-level aggregations
-        district_stats = self.master_df.groupby('district').agg({
+        district_stats = self._level_stats('district', {
             'total_enrolments': 'sum',
             'total_bio_updates': 'sum',
             'total_demo_updates': 'sum',
             'asi': 'mean'
-        }).reset_index()
+        })
         
         district_stats = district_stats.sort_values('total_enrolments', ascending=False).head(20)
         
-        # Create comprehensive visualization
-        fig = plt.figure(figsize=(20, 12))
-        
-        # 1. District-wise Enrolment Bar Chart
-        ax1 = plt.subplot(2, 3, 1)
-        sns.barplot(data=district_stats, x='total_enrolments', y='district', palette='viridis', ax=ax1)
-        ax1.set_title('Top 20 Districts by Total Enrolments', fontsize=14, fontweight='bold')
-        ax1.set_xlabel('Total Enrolments', fontsize=12)
-        ax1.set_ylabel('District', fontsize=12)
-        ax1.ticklabel_format(style='plain', axis='x')
-        
-        # 2. Biometric Updates by District
-        ax2 = plt.subplot(2, 3, 2)
-        sns.barplot(data=district_stats, x='total_bio_updates', y='district', palette='Reds_r', ax=ax2)
-        ax2.set_title('Top 20 Districts by Biometric Updates', fontsize=14, fontweight='bold')
-        ax2.set_xlabel('Total Biometric Updates', fontsize=12)
-        ax2.set_ylabel('District', fontsize=12)
-        ax2.ticklabel_format(style='plain', axis='x')
-        
-        # 3. Demographic Updates by District
-        ax3 = plt.subplot(2, 3, 3)
-        sns.barplot(data=district_stats, x='total_demo_updates', y='district', palette='Blues_r', ax=ax3)
-        ax3.set_title('Top 20 Districts by Demographic Updates', fontsize=14, fontweight='bold')
-        ax3.set_xlabel('Total Demographic Updates', fontsize=12)
-        ax3.set_ylabel('District', fontsize=12)
-        ax3.ticklabel_format(style='plain', axis='x')
-        
-        # 4. Date-wise Total Aadhaar Activity
-        ax4 = plt.subplot(2, 3, 4)
-        date_stats = self.master_df.groupby('date').agg({
+        # Date-wise Total Aadhaar Activity
+        date_stats = self._level_stats('date', {
             'total_enrolments': 'sum',
             'total_updates': 'sum'
-        }).reset_index()
-        ax4.plot(date_stats['date'], date_stats['total_enrolments'], label='Enrolments', linewidth=2)
-        ax4.plot(date_stats['date'], date_stats['total_updates'], label='Updates', linewidth=2)
-        ax4.set_title('Date-wise Aadhaar Activity Trend', fontsize=14, fontweight='bold')
-        ax4.set_xlabel('Date', fontsize=12)
-        ax4.set_ylabel('Count', fontsize=12)
-        ax4.legend()
-        ax4.grid(True, alpha=0.3)
-        plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
-        
-        # 5. ASI Comparison Across Districts
-        ax5 = plt.subplot(2, 3, 5)
-        asi_sorted = district_stats.sort_values('asi', ascending=False).head(20)
-        colors = ['green' if x > 0.7 else 'orange' if x > 0.5 else 'red' for x in asi_sorted['asi']]
-        sns.barplot(data=asi_sorted, x='asi', y='district', palette=colors, ax=ax5)
-        ax5.set_title('Aadhaar Stability Index (ASI) by District', fontsize=14, fontweight='bold')
-        ax5.set_xlabel('ASI (Higher = More Stable)', fontsize=12)
-        ax5.set_ylabel('District', fontsize=12)
-        ax5.axvline(x=0.7, color='green', linestyle='--', alpha=0.5, label='High Stability')
-        ax5.axvline(x=0.5, color='orange', linestyle='--', alpha=0.5, label='Medium Stability')
-        ax5.legend()
-        
-        # 6. Update Distribution
-        ax6 = plt.subplot(2, 3, 6)
+        })
+        
+        # Update Distribution
         update_data = pd.DataFrame({
             'Type': ['Demographic', 'Biometric'],
             'Count': [
-                self.master_df['total_demo_updates'].sum(),
-                self.master_df['total_bio_updates'].sum()
+                self._total('total_demo_updates'),
+                self._total('total_bio_updates')
             ]
         })
-        ax6.pie(update_data['Count'], labels=update_data['Type'], autopct='%1.1f%%', 
-                colors=['#3498db', '#e74c3c'], startangle=90, textprops={'fontsize': 12})
-        ax6.set_title('Distribution of Update Types', fontsize=14, fontweight='bold')
         
-        plt.tight_layout()
-        eda_path = self.output_dir / 'eda_comprehensive_analysis.png'
-        plt.savefig(eda_path, dpi=300, bbox_inches='tight')
-        print(f"  ✓ Saved: {eda_path}")
-        plt.close()
+        self._report_figure(
+            'eda_comprehensive_analysis',
+            district_stats=district_stats, date_stats=date_stats, update_totals=update_data
+        )
         
         # Additional Analysis: State-level Statistics
-        state_stats = self.master_df.groupby('state').agg({
+        state_stats = self._level_stats('state', {
             'total_enrolments': 'sum',
             'total_updates': 'sum',
             'asi': 'mean'
-        }).reset_index()
+        })
         state_stats = state_stats.sort_values('total_enrolments', ascending=False).head(15)
         
-        fig, ax = plt.subplots(figsize=(14, 8))
-        x = np.arange(len(state_stats))
-        width = 0.35
-        
-        ax.bar(x - width/2, state_stats['total_enrolments'], width, label='Enrolments', color='#2ecc71')
-        ax.bar(x + width/2, state_stats['total_updates'], width, label='Updates', color='#e74c3c')
-        
-        ax.set_xlabel('State', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Count', fontsize=12, fontweight='bold')
-        ax.set_title('State-wise Enrolments vs Updates (Top 15 States)', fontsize=14, fontweight='bold')
-        ax.set_xticks(x)
-        ax.set_xticklabels(state_stats['state'], rotation=45, ha='right')
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        state_path = self.output_dir / 'state_wise_analysis.png'
-        plt.savefig(state_path, dpi=300, bbox_inches='tight')
-        print(f"  ✓ Saved: {state_path}")
-        plt.close()
+        self._report_figure('state_wise_analysis', state_stats=state_stats)
         
-        print("✓ EDA completed and visualizations saved!\n")
+        print("✓ EDA completed and report data saved!\n")
     
     
     # =========================================================================
@@ -437,14 +571,14 @@ class AadhaarIntelligenceSystem:
         
         # 1. Districts with Lowest ASI (Most Unstable)
         print("1. Top 10 Districts with LOWEST ASI (Most Unstable):")
-        district_asi = self.master_df.groupby('district')['asi'].mean().reset_index()
+        district_asi = self._level_stats('district', {'asi': 'mean'})
         district_asi = district_asi.sort_values('asi').head(10)
         print(district_asi.to_string(index=False))
         print()
         
         # 2. PIN Codes with Highest Update Ratio
         print("2. Top 10 PIN Codes with HIGHEST Update Ratio:")
-        pincode_ratio = self.master_df.groupby('pincode')['update_ratio'].mean().reset_index()
+        pincode_ratio = self._level_stats('pincode', {'update_ratio': 'mean'})
         pincode_ratio = pincode_ratio.sort_values('update_ratio', ascending=False).head(10)
         print(pincode_ratio.to_string(index=False))
         print()
@@ -454,12 +588,12 @@ class AadhaarIntelligenceSystem:
         age_analysis = pd.DataFrame({
             'Age Group': ['5-17', '17+'],
             'Demographic Updates': [
-                self.master_df['demo_age_5_17'].sum(),
-                self.master_df['demo_age_17_'].sum()
+                self._total('demo_age_5_17'),
+                self._total('demo_age_17_')
             ],
             'Biometric Updates': [
-                self.master_df['bio_age_5_17'].sum(),
-                self.master_df['bio_age_17_'].sum()
+                self._total('bio_age_5_17'),
+                self._total('bio_age_17_')
             ]
         })
         age_analysis['Total Updates'] = age_analysis['Demographic Updates'] + age_analysis['Biometric Updates']
@@ -468,28 +602,56 @@ class AadhaarIntelligenceSystem:
         
         # 4. States with Highest Instability
         print("4. Top 5 States with LOWEST Average ASI:")
-        state_asi = self.master_df.groupby('state')['asi'].mean().reset_index()
+        state_asi = self._level_stats('state', {'asi': 'mean'})
         state_asi = state_asi.sort_values('asi').head(5)
         print(state_asi.to_string(index=False))
         print()
         
+        # 5. Day-level anomalies in the update series
+        flagged_days, ranked, series = self.detect_series_anomalies()
+        print(f"5. {series} Days with Anomalous Biometric Update Activity: {len(flagged_days):,} "
+              f"across {len(ranked):,} series")
+        print(ranked.head(10).to_string(index=False))
+        print()
+        
         # Save anomaly report
         anomaly_report = {
             'Unstable Districts': district_asi,
             'High Update PIN Codes': pincode_ratio,
             'Age Group Analysis': age_analysis,
-            'Unstable States': state_asi
+            'Unstable States': state_asi,
+            f'Anomalous {series}s': ranked.head(ANOMALY_SHEET_ROWS),
+            f'Anomalous {series} Days': flagged_days.head(ANOMALY_SHEET_ROWS)
         }
         
         with pd.ExcelWriter(self.output_dir / 'anomaly_detection_report.xlsx') as writer:
             for sheet_name, df in anomaly_report.items():
                 df.to_excel(writer, sheet_name=sheet_name, index=False)
+        flagged_days.to_csv(self.output_dir / 'time_series_anomalies.csv', index=False)
         
         print(f"  ✓ Saved: {self.output_dir / 'anomaly_detection_report.xlsx'}")
+        print(f"  ✓ Saved: {self.output_dir / 'time_series_anomalies.csv'}")
         print("✓ Anomaly detection completed!\n")
         
         return anomaly_report
     
+    def detect_series_anomalies(self):
+        """
+        Score every day of every PIN code's update series (see aadhaar_anomaly).
+        
+        Falls back to the district x date cuboid of the rollup cube when the
+        master rows are not in memory (streaming runs).
+        
+        Returns:
+            tuple: flagged days (worst first), ranked series, series label
+        """
+        if self.master_df is not None:
+            flagged, ranked = detect_series_anomalies(self.master_df, PINCODE_SERIES)
+            return flagged, ranked, 'PIN Code'
+        daily = self._cube()['district_date'].reset_index()
+        flagged, ranked = detect_series_anomalies(daily, DISTRICT_SERIES)
+        return flagged, ranked, 'District'
+    
     
     # =========================================================================
     # SECTION 7: MACHINE LEARNING MODEL
@@ -497,58 +659,68 @@ class AadhaarIntelligenceSystem:
     
     def build_ml_model(self):
         """
-        Build Random Forest model to predict future biometric update load.
+        Build the model that predicts biometric update load.
+        
+        The default Random Forest configuration, the histogram model of
+        training_mode='histogram', or with self.select_model the cheapest
+        grid candidate meeting the accuracy target. The train and test
+        matrices are gathered once from the feature matrix by row index.
         """
+        from sklearn.metrics import mean_absolute_error, r2_score
+        from sklearn.model_selection import train_test_split
+        
         print("\nSECTION 7: MACHINE LEARNING MODEL")
         print("-" * 80)
         
         print("Target Variable: bio_age_17_ (Biometric updates for age 17+)")
-        print("Model: Random Forest Regressor\n")
         
         # Prepare features and target
-        # Remove rows where target is 0 to focus on actual update patterns
-        ml_df = self.master_df[self.master_df['bio_age_17_'] > 0].copy()
-        
-        feature_cols = [
-            'age_0_5', 'age_5_17', 'age_18_greater',
-            'total_enrolments', 'total_demo_updates', 
-            'total_updates', 'update_ratio', 'asi',
-            'log_enrolments', 'log_updates',
-            'month', 'day_of_week'
-        ]
+        feature_cols = list(FEATURE_COLUMNS)
+        matrix = self._feature_matrix(feature_cols)
+        target = self.master_df['bio_age_17_'].to_numpy()
+        rows = eligible_rows(target)
+        self.training_fingerprint = fingerprint_rows(matrix, rows, target)
         
-        X = ml_df[feature_cols].fillna(0)
-        y = ml_df['bio_age_17_']
-        
-        print(f"Training Dataset Size: {len(X):,} records")
+        print(f"Training Dataset Size: {len(rows):,} records")
         print(f"Features: {len(feature_cols)}")
         print(f"Feature List: {feature_cols}\n")
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
-        )
+        eligible, weights = rows, None
+        if self.training_mode != 'full':
+            rows, weights = stratified_sample(
+                rows, state_month_strata(self.master_df, rows), self.training_rows
+            )
+            print(f"Training mode: {self.training_mode} - {len(rows):,} rows "
+                  f"stratified by state x month\n")
+        
+        if self.select_model:
+            candidate = self.run_model_selection(
+                gather_rows(matrix, rows), target[rows], self.master_df['date'].to_numpy()[rows]
+            )
+        elif self.training_mode == 'histogram':
+            candidate = HISTOGRAM_CANDIDATE
+        else:
+            candidate = DEFAULT_CANDIDATE
+        model_name = MODEL_FAMILIES[candidate['family']][1]
+        print(f"Model: {model_name} ({candidate['name']})\n")
+        
+        # Split the row indices, then gather each side once
+        train_pos, test_pos = train_test_split(np.arange(len(rows)), test_size=0.2, random_state=42)
+        X_train, y_train = gather_rows(matrix, rows[train_pos]), target[rows[train_pos]]
+        X_test, y_test = gather_rows(matrix, rows[test_pos]), target[rows[test_pos]]
         
         print(f"Training Set: {len(X_train):,} | Test Set: {len(X_test):,}\n")
         
         # Train model
-        print("Training Random Forest Regressor...")
-        rf_model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=15,
-            min_samples_split=10,
-            min_samples_leaf=5,
-            random_state=42,
-            n_jobs=-1,
-            verbose=0
+        print(f"Training {model_name}...")
+        model, fit_seconds = fit_timed(
+            candidate, X_train, y_train, None if weights is None else weights[train_pos]
         )
-        
-        rf_model.fit(X_train, y_train)
-        print("  ✓ Model training completed!\n")
+        print(f"  ✓ Model training completed in {fit_seconds:.1f}s!\n")
         
         # Make predictions
-        y_pred_train = rf_model.predict(X_train)
-        y_pred_test = rf_model.predict(X_test)
+        y_pred_train = model.predict(X_train)
+        y_pred_test = model.predict(X_test)
         
         # Evaluate model
         print("MODEL PERFORMANCE:")
@@ -563,10 +735,28 @@ class AadhaarIntelligenceSystem:
         print(f"Test MAE:     {test_mae:.2f}")
         print(f"Test R²:      {test_r2:.4f}\n")
         
+        self.model_metrics = {
+            'train_mae': float(train_mae), 'train_r2': float(train_r2),
+            'test_mae': float(test_mae), 'test_r2': float(test_r2),
+        }
+        
+        if self.compare_training and self.training_mode != 'full':
+            self.training_report = compare_training(
+                matrix, target, eligible, rows[test_pos],
+                {'mode': self.training_mode, 'train_rows': len(train_pos),
+                 'fit_seconds': fit_seconds, 'model': model},
+                candidate, DEFAULT_CANDIDATE
+            )
+            print("TRAINING TRADE-OFF (same test rows):")
+            print("-" * 40)
+            print(self.training_report.to_string(index=False, float_format=lambda v: f"{v:,.4f}"))
+            self.training_report.to_csv(self.output_dir / 'training_tradeoff_report.csv', index=False)
+            print(f"  ✓ Saved: {self.output_dir / 'training_tradeoff_report.csv'}\n")
+        
         # Feature importance
         feature_importance = pd.DataFrame({
             'Feature': feature_cols,
-            'Importance': rf_model.feature_importances_
+            'Importance': self._feature_importance(model, X_test, y_test)
         }).sort_values('Importance', ascending=False)
         
         print("FEATURE IMPORTANCE (Top 10):")
@@ -574,39 +764,162 @@ class AadhaarIntelligenceSystem:
         print(feature_importance.head(10).to_string(index=False))
         print()
         
-        # Visualize feature importance
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 6))
-        
-        # Feature importance plot
-        sns.barplot(data=feature_importance.head(10), x='Importance', y='Feature', 
-                    palette='viridis', ax=ax1)
-        ax1.set_title('Top 10 Feature Importance', fontsize=14, fontweight='bold')
-        ax1.set_xlabel('Importance Score', fontsize=12)
-        ax1.set_ylabel('Feature', fontsize=12)
-        
-        # Actual vs Predicted
+        # Actual vs Predicted sample of the test set
         sample_size = min(1000, len(y_test))
         sample_indices = np.random.choice(len(y_test), sample_size, replace=False)
-        ax2.scatter(y_test.iloc[sample_indices], y_pred_test[sample_indices], 
-                    alpha=0.5, s=10, color='#3498db')
-        ax2.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], 
-                 'r--', lw=2, label='Perfect Prediction')
-        ax2.set_xlabel('Actual Bio Updates (17+)', fontsize=12)
-        ax2.set_ylabel('Predicted Bio Updates (17+)', fontsize=12)
-        ax2.set_title(f'Actual vs Predicted (Test Set)\nR² = {test_r2:.4f}, MAE = {test_mae:.2f}', 
-                      fontsize=14, fontweight='bold')
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        model_path = self.output_dir / 'ml_model_performance.png'
-        plt.savefig(model_path, dpi=300, bbox_inches='tight')
-        print(f"  ✓ Saved: {model_path}")
-        plt.close()
+        test_sample = pd.DataFrame({
+            'actual': y_test[sample_indices],
+            'predicted': y_pred_test[sample_indices]
+        })
+        metrics = pd.DataFrame([{
+            **self.model_metrics, 'actual_min': y_test.min(), 'actual_max': y_test.max()
+        }])
+        self._report_figure(
+            'ml_model_performance',
+            feature_importance=feature_importance, model_test_sample=test_sample, model_metrics=metrics
+        )
         
         print("✓ Machine learning model completed!\n")
         
-        return rf_model, feature_cols, feature_importance
+        return model, feature_cols, feature_importance
+    
+    def run_model_selection(self, X, y, dates):
+        """
+        Cross-validate the candidate grid on time-ordered folds of the
+        training rows and pick the cheapest candidate meeting the target.
+        
+        The fold matrices are cached under <cache_dir>/model_selection; the
+        report goes to outputs/model_selection_report.csv.
+        
+        Args:
+            X (np.ndarray): Training rows
+            y (np.ndarray): Their target
+            dates (np.ndarray): Their dates
+        
+        Returns:
+            dict: The selected candidate
+        """
+        grid = self.model_grid or DEFAULT_GRID
+        print(f"MODEL SELECTION: {len(grid)} candidates, time-series cross-validation")
+        print("-" * 40)
+        fold_dir, folds = FoldCache(self.cache_dir / 'model_selection').build(X, y, dates)
+        for fold in folds:
+            print(f"  Fold {fold['fold']}: {fold['train_rows']:,} training rows, "
+                  f"tested on {fold['test_start']} to {fold['test_end']}")
+        
+        report = successive_halving(grid, fold_dir, folds, n_jobs=self.n_jobs,
+                                    tolerance=self.selection_tolerance)
+        selected = select_candidate(report)
+        final = report['round'] == report['round'].max()
+        report['selected'] = final & (report['candidate'] == selected)
+        report.to_csv(self.output_dir / 'model_selection_report.csv', index=False)
+        self.model_selection_report = report
+        
+        latest = report.drop_duplicates('candidate', keep='last')
+        print()
+        print(latest.drop(columns='family').to_string(index=False, float_format=lambda v: f"{v:,.4f}"))
+        print(f"\n  ✓ Selected: {selected} (cheapest within {self.selection_tolerance:.0%} "
+              f"of the best cross-validated MAE)")
+        print(f"  ✓ Saved: {self.output_dir / 'model_selection_report.csv'}\n")
+        return next(candidate for candidate in grid if candidate['name'] == selected)
+    
+    def _feature_importance(self, model, X_test, y_test):
+        """
+        Importance per feature: the model's own for tree ensembles, scaled
+        absolute coefficients for linear models, permutation importance on a
+        test sample otherwise.
+        """
+        if hasattr(model, 'feature_importances_'):
+            return model.feature_importances_
+        if hasattr(model, 'coef_'):
+            weights = np.abs(model.coef_) * X_test.std(axis=0)
+            return weights / max(weights.sum(), 1e-12)
+        from sklearn.inspection import permutation_importance
+        
+        sample = np.random.default_rng(42).choice(len(X_test), min(2000, len(X_test)), replace=False)
+        result = permutation_importance(model, X_test[sample], np.asarray(y_test)[sample],
+                                        n_repeats=3, random_state=42)
+        return np.clip(result.importances_mean, 0, None)
+    
+    def _training_fingerprint(self, feature_cols):
+        """
+        Fingerprint of the training population (rows with biometric
+        updates), accumulated block-wise from the feature matrix.
+        """
+        target = self.master_df['bio_age_17_'].to_numpy()
+        return fingerprint_rows(self._feature_matrix(feature_cols), eligible_rows(target), target)
+    
+    def obtain_model(self):
+        """
+        Reuse the stored model or retrain, following self.retrain.
+        
+        With retrain='auto' the stored model is reused unless its feature
+        columns differ or the fingerprint of the current training data has
+        drifted more than self.drift_threshold from the one it was trained
+        on. A newly trained model is saved to the model store.
+        
+        Returns:
+            tuple: (model, feature_cols, feature_importance)
+        """
+        feature_cols = list(FEATURE_COLUMNS)
+        reason = None
+        if self.retrain == 'always':
+            reason = 'retraining requested'
+        elif self.select_model and self.retrain == 'auto':
+            reason = 'model selection requested'
+        elif not self.model_store.exists():
+            if self.retrain == 'never':
+                raise FileNotFoundError(f"No stored model in {self.model_store.store_dir}")
+            reason = 'no stored model'
+        elif self.retrain == 'auto':
+            record = self.model_store.load_record()
+            drift = fingerprint_drift(record['fingerprint'], self._training_fingerprint(feature_cols))
+            if record['feature_cols'] != feature_cols:
+                reason = 'feature columns changed'
+            elif drift > self.drift_threshold:
+                reason = f"data drift {drift:.3f} > {self.drift_threshold}"
+            else:
+                print(f"\nStored model still valid (data drift {drift:.3f} <= {self.drift_threshold})")
+        
+        if reason is not None:
+            print(f"\nTraining new model: {reason}")
+            model, feature_cols, feature_importance = self.build_ml_model()
+            version = self.model_store.save(
+                model, feature_cols, self.training_fingerprint, self.model_metrics,
+                feature_importance.set_index('Feature')['Importance'].reindex(feature_cols).tolist()
+            )
+            self.model_version = version
+            print(f"  ✓ Stored model version: {version}\n")
+            return model, feature_cols, feature_importance
+        
+        return self.load_stored_model()
+    
+    def load_stored_model(self, version=None):
+        """
+        Load a model from the model store without retraining.
+        
+        Args:
+            version (str): Model version (default: latest)
+        
+        Returns:
+            tuple: (model, feature_cols, feature_importance)
+        """
+        record = self.model_store.load(version)
+        model, feature_cols = record['model'], record['feature_cols']
+        self.model_version = record['version']
+        self.model_metrics = record['metrics']
+        self.training_fingerprint = record['fingerprint']
+        print(f"  ✓ Loaded stored model {record['version']} "
+              f"(trained {record['created']} on {record['fingerprint']['rows']:,} records, "
+              f"test R² {record['metrics']['test_r2']:.4f})\n")
+        
+        # Permutation importances of non-tree models are stored with the version
+        importance = record.get('feature_importance') or model.feature_importances_
+        feature_importance = pd.DataFrame({
+            'Feature': feature_cols,
+            'Importance': importance
+        }).sort_values('Importance', ascending=False)
+        return model, feature_cols, feature_importance
     
     
     # =========================================================================
@@ -623,16 +936,23 @@ class AadhaarIntelligenceSystem:
         print("Generating predictions for all records...")
         
         # Prepare features
-        X_all = self.master_df[feature_cols].fillna(0)
+        X_all = self._feature_matrix(feature_cols)
         
-        # Generate predictions
-        predictions = model.predict(X_all)
+        # Generate predictions block by block into one preallocated array
+        predictions, score_report = predict_batched(
+            model, X_all, batch_rows=self.score_batch_rows, n_jobs=self.n_jobs
+        )
         
         # Add to master dataframe
         self.master_df['predicted_bio_load'] = predictions
         self.master_df['predicted_bio_load'] = self.master_df['predicted_bio_load'].clip(lower=0)
+        if self.aggregates is not None:
+            self.aggregates = add_measures(self.aggregates, self.master_df, ['predicted_bio_load'],
+                                           self._cube_cells)
+            self._cube_cells = None
         
         print(f"  ✓ Predictions generated for {len(self.master_df):,} records")
+        print(f"  ✓ {format_report(score_report)}")
         print(f"  ✓ Prediction Statistics:")
         print(f"     - Mean Predicted Load: {predictions.mean():.2f}")
         print(f"     - Median Predicted Load: {np.median(predictions):.2f}")
@@ -640,11 +960,11 @@ class AadhaarIntelligenceSystem:
         print(f"     - Min Predicted Load: {predictions.min():.2f}\n")
         
         # Create predictions summary by district
-        district_predictions = self.master_df.groupby('district').agg({
+        district_predictions = self._level_stats('district', {
             'predicted_bio_load': 'sum',
             'total_enrolments': 'sum',
             'asi': 'mean'
-        }).reset_index()
+        })
         
         district_predictions = district_predictions.sort_values('predicted_bio_load', ascending=False).head(20)
         
@@ -653,91 +973,139 @@ class AadhaarIntelligenceSystem:
         print(district_predictions.to_string(index=False))
         print()
         
-        # Visualize predictions
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 6))
-        
-        # Top districts by predicted load
-        sns.barplot(data=district_predictions, x='predicted_bio_load', y='district', 
-                    palette='Reds_r', ax=ax1)
-        ax1.set_title('Top 20 Districts by Predicted Biometric Service Load', 
-                      fontsize=14, fontweight='bold')
-        ax1.set_xlabel('Predicted Biometric Load', fontsize=12)
-        ax1.set_ylabel('District', fontsize=12)
-        
-        # Correlation: ASI vs Predicted Load
-        scatter_data = self.master_df[self.master_df['predicted_bio_load'] > 0].sample(min(5000, len(self.master_df)))
-        ax2.scatter(scatter_data['asi'], scatter_data['predicted_bio_load'], 
-                    alpha=0.3, s=20, color='#e74c3c')
-        ax2.set_xlabel('Aadhaar Stability Index (ASI)', fontsize=12)
-        ax2.set_ylabel('Predicted Biometric Load', fontsize=12)
-        ax2.set_title('ASI vs Predicted Service Load\n(Lower ASI → Higher Predicted Load)', 
-                      fontsize=14, fontweight='bold')
-        ax2.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        pred_path = self.output_dir / 'predictions_analysis.png'
-        plt.savefig(pred_path, dpi=300, bbox_inches='tight')
-        print(f"  ✓ Saved: {pred_path}")
-        plt.close()
+        # ASI vs Predicted Load sample
+        with_load = self.master_df[self.master_df['predicted_bio_load'] > 0]
+        scatter_data = with_load[['asi', 'predicted_bio_load']].sample(min(5000, len(with_load)))
+        self._report_figure(
+            'predictions_analysis',
+            district_predictions=district_predictions, prediction_sample=scatter_data
+        )
         
         print("✓ Prediction generation completed!\n")
         
         return district_predictions
     
+    def forecast_service_load(self, train=True):
+        """
+        Forecast biometric (17+) and total update load per district for the
+        next self.forecast_horizon days (see aadhaar_forecast).
+        
+        Unlike generate_predictions, which scores the recorded days, this
+        looks forward from the last day in the data. The stored forecaster
+        is reused, which only rebuilds its recent history from the cube,
+        unless self.retrain asks for a refit or it was trained more than
+        RETRAIN_AFTER_DAYS days before the last day of the data.
+        
+        Args:
+            train (bool): Fit a forecaster when there is no usable stored
+                one (False forecasts with the stored one, or skips)
+        
+        Returns:
+            pd.DataFrame | None: Forecast per district and day
+        """
+        print("\nSERVICE LOAD FORECAST")
+        print("-" * 80)
+        
+        district_date = self._cube()['district_date']
+        forecaster = self._obtain_forecaster(district_date, train)
+        if forecaster is None:
+            print("  No stored forecaster - skipped (run a training pipeline first)\n")
+            return None
+        
+        forecast = forecaster.forecast(district_date, self.forecast_horizon)
+        print(f"  ✓ {self.forecast_horizon}-day forecast for {forecast['district'].nunique():,} districts "
+              f"from {forecast['date'].min():%Y-%m-%d} to {forecast['date'].max():%Y-%m-%d}")
+        for target, metrics in forecaster.record['metrics'].items():
+            print(f"     - {target}: next-day MAE {metrics['test_mae']:.2f} "
+                  f"(same-weekday naive {metrics['naive_weekly_mae']:.2f})")
+        print()
+        
+        district_forecast = forecast.groupby(['state', 'district'], sort=False)[FORECAST_TARGETS].sum()
+        district_forecast = district_forecast.sort_values('bio_age_17_', ascending=False).head(20)
+        print(f"TOP 20 DISTRICTS BY FORECAST BIOMETRIC LOAD (NEXT {self.forecast_horizon} DAYS):")
+        print("-" * 60)
+        print(district_forecast.reset_index().to_string(index=False))
+        print()
+        
+        forecast.to_csv(self.output_dir / 'service_load_forecast.csv', index=False)
+        print(f"  ✓ Saved: {self.output_dir / 'service_load_forecast.csv'}")
+        print("✓ Service load forecast completed!\n")
+        
+        self.forecast_df = forecast
+        return forecast
+    
+    def _obtain_forecaster(self, district_date, train):
+        """Stored forecaster, or a newly fitted and stored one (see forecast_service_load)."""
+        stored = None
+        reason = None
+        if ServiceLoadForecaster.exists(self.forecast_dir):
+            stored = ServiceLoadForecaster.load(self.forecast_dir)
+        if not train or self.retrain == 'never':
+            return stored
+        
+        last_day = district_date.index.get_level_values('date').max()
+        if self.retrain == 'always':
+            reason = 'retraining requested'
+        elif stored is None:
+            reason = 'no stored forecaster'
+        elif stored.record['targets'] != FORECAST_TARGETS:
+            reason = 'forecast targets changed'
+        else:
+            behind = (last_day - pd.Timestamp(stored.record['trained_through'])).days
+            if behind > RETRAIN_AFTER_DAYS:
+                reason = f"trained {behind} days before the last day > {RETRAIN_AFTER_DAYS}"
+            else:
+                print(f"Stored forecaster still valid (trained through {stored.record['trained_through']})")
+                return stored
+        
+        print(f"Training forecaster: {reason}")
+        forecaster = ServiceLoadForecaster(FORECAST_TARGETS, self.forecast_horizon)
+        record = forecaster.fit(district_date)
+        forecaster.save(self.forecast_dir)
+        print(f"  ✓ Trained on {record['training_rows']:,} district-days through "
+              f"{record['trained_through']}, tested on the last {record['test_days']} days")
+        print(f"  ✓ Stored forecaster: {self.forecast_dir}")
+        return forecaster
+    
     
     # =========================================================================
     # SECTION 9: SAVE OUTPUTS
     # =========================================================================
     
-    def save_outputs(self):
+    def save_outputs(self, include_datasets=True):
         """
         Save all outputs including cleaned data, master dataset, and predictions.
+        
+        Args:
+            include_datasets (bool): Write the full cleaned/master/prediction CSVs;
+                when False only the summary statistics are refreshed
         """
         print("\nSECTION 9: SAVING OUTPUTS")
         print("-" * 80)
         
-        # 1. Save cleaned enrolment data
-        enrolment_path = self.output_dir / 'cleaned_enrolment_data.csv'
-        self.enrolment_df.to_csv(enrolment_path, index=False)
-        print(f"  ✓ Saved: {enrolment_path}")
-        
-        # 2. Save cleaned demographic data
-        demographic_path = self.output_dir / 'cleaned_demographic_data.csv'
-        self.demographic_df.to_csv(demographic_path, index=False)
-        print(f"  ✓ Saved: {demographic_path}")
-        
-        # 3. Save cleaned biometric data
-        biometric_path = self.output_dir / 'cleaned_biometric_data.csv'
-        self.biometric_df.to_csv(biometric_path, index=False)
-        print(f"  ✓ Saved: {biometric_path}")
-        
-        # 4. Save master dataset
-        master_path = self.output_dir / 'master_dataset_with_asi.csv'
-        self.master_df.to_csv(master_path, index=False)
-        print(f"  ✓ Saved: {master_path}")
-        
-        # 5. Save predictions only
-        predictions_cols = [
-            'date', 'state', 'district', 'pincode',
-            'total_enrolments', 'total_updates', 'asi',
-            'predicted_bio_load'
-        ]
-        predictions_df = self.master_df[predictions_cols].copy()
-        predictions_path = self.output_dir / 'predictions_biometric_load.csv'
-        predictions_df.to_csv(predictions_path, index=False)
-        print(f"  ✓ Saved: {predictions_path}")
+        if include_datasets:
+            # 1-4. Cleaned sources and master dataset
+            self._save_datasets(SOURCE_FRAMES + ['master_df'])
+        
+            # 5. Predictions: the full column set as CSV, else only the keys
+            # and the prediction (the rest joins from the master dataset)
+            predictions_df = self.master_df[prediction_columns(self.output_format, PREDICTION_COLUMNS)]
+            predictions_path = write_dataset(predictions_df, self.output_dir, PREDICTIONS_FILE,
+                                             self.output_format, self.n_jobs)
+            print(f"  ✓ Saved: {predictions_path}")
         
         # 6. Create summary statistics
+        dates = self._cube()['date'].index
         summary_stats = {
-            'Total Records': len(self.master_df),
-            'Total Districts': self.master_df['district'].nunique(),
-            'Total States': self.master_df['state'].nunique(),
-            'Total PIN Codes': self.master_df['pincode'].nunique(),
-            'Date Range': f"{self.master_df['date'].min()} to {self.master_df['date'].max()}",
-            'Total Enrolments': self.master_df['total_enrolments'].sum(),
-            'Total Updates': self.master_df['total_updates'].sum(),
-            'Average ASI': self.master_df['asi'].mean(),
-            'Total Predicted Bio Load': self.master_df['predicted_bio_load'].sum()
+            'Total Records': int(self._total('n_records')),
+            'Total Districts': self._distinct('district'),
+            'Total States': self._distinct('state'),
+            'Total PIN Codes': self._distinct('pincode'),
+            'Date Range': f"{dates.min()} to {dates.max()}",
+            'Total Enrolments': self._total('total_enrolments'),
+            'Total Updates': self._total('total_updates'),
+            'Average ASI': self._mean('asi'),
+            'Total Predicted Bio Load': self._total('predicted_bio_load')
         }
         
         summary_df = pd.DataFrame(list(summary_stats.items()), columns=['Metric', 'Value'])
@@ -745,44 +1113,147 @@ class AadhaarIntelligenceSystem:
         summary_df.to_csv(summary_path, index=False)
         print(f"  ✓ Saved: {summary_path}")
         
+        # 7. Rollup cube, for reuse by later runs and ad-hoc slicing
+        cube_dir = self.output_dir / 'rollup_cube'
+        save_aggregates(self.aggregates, cube_dir)
+        print(f"  ✓ Saved: {cube_dir}")
+        
         print("\n✓ All outputs saved successfully!\n")
     
+    def _publish_query_index(self):
+        """
+        Publish the query index of the scored master dataset.
+        
+        A running QueryService picks the new version up without a restart.
+        """
+        if not self.query_index:
+            return
+        with self._stage('publish_query_index', ['master_df']):
+            version = publish_query_index(self.master_df, self.query_index_dir)
+            print(f"  ✓ Published query index {version}: {self.query_index_dir}\n")
+    
+    
+    # =========================================================================
+    # SECTION 10: REPORT RENDERING
+    # =========================================================================
+    
+    def _report_figure(self, name, **tables):
+        """
+        Save the report tables behind a figure and draw it if plots='inline'.
+        
+        pyplot is not thread-safe (and GUI backends must run on the main
+        thread), so inline figures of stages running in scheduler worker
+        threads are queued and drawn by _draw_queued_figures once the stages
+        are done.
+        
+        Args:
+            name (str): Figure name (see aadhaar_reporting.FIGURES)
+            **tables: Report tables by name
+        """
+        for table, df in tables.items():
+            save_report_table(self.report_data_dir, table, df)
+        
+        with self._plot_lock:
+            if self.plots == 'inline' and threading.current_thread() is threading.main_thread():
+                path = render_figure(name, self.report_data_dir, self.output_dir,
+                                     dpi=self.plot_dpi, fmt=self.plot_format, data=tables)
+                print(f"  ✓ Saved: {path}")
+                return
+            if self.plots == 'inline':
+                self._queued_figures.append((name, tables))
+                print(f"  ✓ Saved report data: {', '.join(tables)} (figure drawn after the stages)")
+                return
+            if name not in self.pending_figures:
+                self.pending_figures.append(name)
+            print(f"  ✓ Saved report data: {', '.join(tables)}")
+    
+    def _draw_queued_figures(self):
+        """Draw, on the calling (main) thread, the inline figures queued by worker threads."""
+        with self._plot_lock:
+            queued, self._queued_figures = self._queued_figures, []
+        if not queued:
+            return
+        with self._stage('render_figures'):
+            for name, tables in queued:
+                path = render_figure(name, self.report_data_dir, self.output_dir,
+                                     dpi=self.plot_dpi, fmt=self.plot_format, data=tables)
+                print(f"  ✓ Saved: {path}")
+    
+    def render_reports(self, names=None):
+        """
+        Draw figures from the saved report data, one worker process per figure.
+        
+        Args:
+            names (list[str]): Figures to draw (default: those whose data was
+                produced by this run, or else every figure with saved data)
+        """
+        print("\nREPORT RENDERING")
+        print("-" * 80)
+        if names is None:
+            names = self.pending_figures or None
+        paths = render_reports(
+            self.report_data_dir, self.output_dir, names,
+            dpi=self.plot_dpi, fmt=self.plot_format, n_jobs=self.n_jobs
+        )
+        for path in paths:
+            print(f"  ✓ Saved: {path}")
+        self.pending_figures = []
+        print("✓ Report rendering completed!\n")
+    
+    def _render_deferred(self, all_figures=False):
+        """
+        Render step of plots='deferred' runs.
+        
+        Args:
+            all_figures (bool): Draw every figure with saved report data, not
+                only those produced by this run (e.g. after a resume)
+        """
+        if self.plots == 'deferred' and (self.pending_figures or all_figures):
+            if all_figures:
+                self.pending_figures = []
+            with self._stage('render_reports'):
+                self.render_reports()
+    
     
     # =========================================================================
     # MAIN EXECUTION PIPELINE
     # =========================================================================
     
-    def run_complete_pipeline(self):
+    def run_complete_pipeline(self, resume=False):
         """
         Execute the complete end-to-end pipeline.
+        
+        The sections run as a dependency graph of stages (see
+        aadhaar_scheduler): once the rollup cube is built, EDA, anomaly
+        detection, model training and the forecast run concurrently. With
+        checkpoints enabled every stage's outputs are saved to
+        outputs/checkpoints, and resume=True continues a failed run from
+        its last completed stages when the sources and settings are
+        unchanged.
+        
+        Every stage is measured; the run report is written to
+        outputs/run_reports (see aadhaar_instrumentation).
+        
+        Args:
+            resume (bool): Reuse the checkpoints of an earlier run
         """
+        self._start_run('complete', resume=resume, checkpoints=self.checkpoints)
         try:
-            # Step 1: Load data
-            self.load_all_datasets()
-            
-            # Step 2: Clean data
-            self.clean_and_standardize()
-            
-            # Step 3: Merge datasets
-            self.merge_datasets()
-            
-            # Step 4: Feature engineering
-            self.engineer_features()
-            
-            # Step 5: EDA
-            self.perform_eda()
-            
-            # Step 6: Anomaly detection
-            self.detect_anomalies()
-            
-            # Step 7: Build ML model
-            model, feature_cols, feature_importance = self.build_ml_model()
-            
-            # Step 8: Generate predictions
-            self.generate_predictions(model, feature_cols)
-            
-            # Step 9: Save outputs
-            self.save_outputs()
+            # Concurrent stages would blur each other's profiles and peaks
+            workers = 1 if self.profile_stages or self.trace_memory else self.stage_workers
+            store = CheckpointStore(self.checkpoint_dir) if self.checkpoints else None
+            if workers != 1:
+                # Training, model loading and the forecast may import sklearn at once
+                preload_estimators(['sklearn.metrics', 'sklearn.model_selection', 'sklearn.inspection'])
+            scheduler = StageScheduler(self._pipeline_stages(resume), store, workers)
+            try:
+                self.stage_report = scheduler.run(self, self._run_key(), resume=resume and store is not None,
+                                                  require=['aggregates'])
+            finally:
+                # Also draws the figures of the stages that finished before a failure
+                self._draw_queued_figures()
+            if self.stage_report['restored']:
+                print(f"✓ Resumed from checkpoints: {', '.join(self.stage_report['restored'])}\n")
             
             print("=" * 80)
             print("AADHAAR INTELLIGENCE SYSTEM - PIPELINE COMPLETED SUCCESSFULLY!")
@@ -797,16 +1268,558 @@ class AadhaarIntelligenceSystem:
             print("   6. ML model performance analysis")
             print("   7. Summary statistics")
             print("\n🎯 KEY INSIGHTS:")
-            print(f"   • Total Records Analyzed: {len(self.master_df):,}")
-            print(f"   • Average ASI: {self.master_df['asi'].mean():.4f}")
-            print(f"   • Districts Covered: {self.master_df['district'].nunique()}")
-            print(f"   • Predicted Future Bio Load: {self.master_df['predicted_bio_load'].sum():,.0f}")
+            print(f"   • Total Records Analyzed: {int(self._total('n_records')):,}")
+            print(f"   • Average ASI: {self._mean('asi'):.4f}")
+            print(f"   • Districts Covered: {self._distinct('district')}")
+            print(f"   • Predicted Future Bio Load: {self._total('predicted_bio_load'):,.0f}")
             print("\n" + "=" * 80 + "\n")
             
         except Exception as e:
+            self.run_report.fail(e)
             print(f"\n❌ ERROR: {str(e)}")
             import traceback
             traceback.print_exc()
+        finally:
+            self._finish_run()
+    
+    def _pipeline_stages(self, resume=False):
+        """
+        Stages of the complete pipeline with the attributes they read and write.
+        
+        Stages that read the master frame or the cube finish before the
+        predictions add their column to both; the outputs are saved once
+        the predictions and the forecast are done.
+        """
+        model_outputs = ['model', 'feature_cols', 'model_version', 'model_metrics', 'training_fingerprint']
+        return [
+            # Steps 1-4: Load, clean, merge and featurize
+            Stage('prepare_sources', self._prepare_sources, outputs=SOURCE_FRAMES),
+            Stage('prepare_master', self._build_master, SOURCE_FRAMES, ['master_df']),
+            # Step 5: Rollup cube and EDA
+            Stage('build_rollup_cube', partial(self._measured, 'build_rollup_cube', self.build_rollup_cube),
+                  ['master_df'], ['aggregates', '_cube_cells']),
+            Stage('perform_eda', partial(self._measured, 'perform_eda', self.perform_eda),
+                  ['aggregates']),
+            # Step 6: Anomaly detection
+            Stage('detect_anomalies', partial(self._measured, 'detect_anomalies', self.detect_anomalies),
+                  ['aggregates', 'master_df']),
+            # Step 7: Build ML model (or reuse the stored one)
+            Stage('build_ml_model', partial(self._measured, 'build_ml_model', self._obtain_model_stage),
+                  ['master_df'], model_outputs),
+            # Step 8: Forward forecast and predictions
+            Stage('forecast_service_load',
+                  partial(self._measured, 'forecast_service_load', self.forecast_service_load, frames=()),
+                  ['aggregates'], ['forecast_df']),
+            Stage('generate_predictions',
+                  partial(self._measured, 'generate_predictions', self._predict_stage, outputs=['master_df']),
+                  ['model', 'feature_cols', 'master_df', 'aggregates', '_cube_cells'],
+                  ['master_df', 'aggregates', '_cube_cells'],
+                  after=['perform_eda', 'detect_anomalies', 'forecast_service_load']),
+            # Step 9: Save outputs
+            Stage('save_outputs',
+                  partial(self._measured, 'save_outputs', self.save_outputs, frames=SOURCE_FRAMES + ['master_df']),
+                  SOURCE_FRAMES + ['master_df', 'aggregates']),
+            Stage('publish_query_index', self._publish_query_index, ['master_df']),
+            # Step 10: Draw deferred figures
+            Stage('render_reports', partial(self._render_deferred, all_figures=resume),
+                  after=['save_outputs', 'publish_query_index']),
+        ]
+    
+    def _measured(self, name, fn, frames=('master_df',), outputs=()):
+        """Run one scheduled section as a measured stage."""
+        with self._stage(name, frames, outputs):
+            fn()
+    
+    def _obtain_model_stage(self):
+        model, feature_cols, _ = self.obtain_model()
+        self.model, self.feature_cols = model, feature_cols
+    
+    def _predict_stage(self):
+        self.generate_predictions(self.model, self.feature_cols)
+    
+    def _run_key(self):
+        """
+        Identity of a complete run: the source files (name, size, mtime)
+        and every setting that changes the stage outputs.
+        """
+        files = [
+            [source, path.name, stat.st_size, stat.st_mtime_ns]
+            for source in SOURCE_SCHEMAS for path in source_files(self.base_path, source)
+            for stat in [path.stat()]
+        ]
+        settings = {
+            'dedup_policy': self.dedup_policy,
+            'normalizer': self.normalizer.fingerprint(),
+            'validator': self.validator.fingerprint() if self.validator is not None else None,
+            'retrain': self.retrain, 'drift_threshold': self.drift_threshold,
+            'select_model': self.select_model, 'model_grid': self.model_grid,
+            'selection_tolerance': self.selection_tolerance, 'training_mode': self.training_mode,
+            'training_rows': self.training_rows, 'compare_training': self.compare_training,
+            'forecast_horizon': self.forecast_horizon, 'output_format': self.output_format,
+            'plots': self.plots, 'query_index': self.query_index,
+        }
+        payload = json.dumps({'files': files, 'settings': settings}, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _prepare_master(self):
+        """
+        Stages 1-4: load and clean the sources, merge them and add features.
+        """
+        self._prepare_sources()
+        self._build_master()
+    
+    def _build_master(self):
+        """
+        Stages 3-4: merge the cleaned sources and add features.
+        """
+        with self._stage('merge_datasets', SOURCE_FRAMES, ['master_df']):
+            self.merge_datasets()
+        with self._stage('engineer_features', ['master_df'], ['master_df']):
+            self.engineer_features()
+    
+    def _prepare_sources(self):
+        """
+        Stages 1-2: load and clean the sources (from the cache if enabled).
+        """
+        if self.use_cache:
+            # Load cleaned data, parsing only new or changed files
+            with self._stage('load_cleaned_datasets', outputs=SOURCE_FRAMES):
+                self.load_cleaned_datasets()
+        else:
+            with self._stage('load_all_datasets', outputs=SOURCE_FRAMES):
+                self.load_all_datasets()
+            if self.validator is not None:
+                with self._stage('validate_datasets', SOURCE_FRAMES, SOURCE_FRAMES):
+                    self.validate_datasets()
+            with self._stage('clean_and_standardize', SOURCE_FRAMES, SOURCE_FRAMES):
+                self.clean_and_standardize()
+    
+    def run_scoring_pipeline(self, model_version=None, compiled=False):
+        """
+        Score-only run: prepare the data and predict with a stored model.
+        
+        Skips EDA, anomaly detection and model training entirely; the
+        district forecast is refreshed with the stored forecaster (except
+        in compiled mode, which does not import sklearn).
+        
+        Args:
+            model_version (str): Stored model version (default: latest)
+            compiled (bool): Score with the flat-array CompiledForest export
+                instead of unpickling the sklearn estimator
+        """
+        self._start_run('scoring', model_version=model_version, compiled=compiled)
+        try:
+            self._prepare_master()
+            
+            print("\nMODEL STORE")
+            print("-" * 80)
+            with self._stage('load_model'):
+                model, feature_cols = self._load_scoring_model(model_version, compiled)
+            self.model, self.feature_cols = model, feature_cols
+            
+            with self._stage('build_rollup_cube', ['master_df']):
+                self.build_rollup_cube()
+            with self._stage('generate_predictions', ['master_df'], ['master_df']):
+                self.generate_predictions(model, feature_cols)
+            if not compiled:
+                with self._stage('forecast_service_load'):
+                    self.forecast_service_load(train=False)
+            with self._stage('save_outputs', SOURCE_FRAMES + ['master_df']):
+                self.save_outputs()
+            self._publish_query_index()
+            self._render_deferred()
+            print("✓ Scoring pipeline completed!\n")
+            
+        except Exception as e:
+            self.run_report.fail(e)
+            print(f"\n❌ ERROR: {str(e)}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            self._finish_run()
+    
+    def _load_scoring_model(self, model_version, compiled):
+        """Stored sklearn model or its compiled export, with its feature columns."""
+        if compiled:
+            record = self.model_store.load_compiled(model_version)
+            model, feature_cols = record['model'], record['feature_cols']
+            self.model_version = record['version']
+            print(f"  ✓ Loaded compiled model {record['version']}: "
+                  f"{model.n_trees} trees, {model.n_nodes:,} nodes\n")
+        else:
+            model, feature_cols, _ = self.load_stored_model(model_version)
+        return model, feature_cols
+    
+    def run_partial_pipeline(self, until):
+        """
+        Run the pipeline up to one step and save what that step produces.
+        
+        Backs the step commands of aadhaar_cli:
+        
+            'ingest'     read the raw files (into the cleaned-source cache
+                         when use_cache is set) and report record counts
+            'clean'      ... and clean them; writes the cleaned datasets
+            'featurize'  ... merge and add features; writes the master dataset
+            'train'      ... and fit the model, or reuse the stored one
+                         following self.retrain; new models go to the model store
+        
+        Args:
+            until (str): One of PARTIAL_STEPS
+        """
+        if until not in PARTIAL_STEPS:
+            raise ValueError(f"until must be one of {PARTIAL_STEPS}, got {until!r}")
+        
+        self._start_run(until)
+        try:
+            if until == 'ingest':
+                if self.use_cache:
+                    with self._stage('load_cleaned_datasets', outputs=SOURCE_FRAMES):
+                        self.load_cleaned_datasets()
+                else:
+                    with self._stage('load_all_datasets', outputs=SOURCE_FRAMES):
+                        self.load_all_datasets()
+            elif until == 'clean':
+                self._prepare_sources()
+                with self._stage('save_outputs', SOURCE_FRAMES):
+                    self._save_datasets(SOURCE_FRAMES)
+                    print()
+            else:
+                self._prepare_master()
+                if until == 'featurize':
+                    with self._stage('save_outputs', ['master_df']):
+                        self._save_datasets(['master_df'])
+                        print()
+                else:
+                    with self._stage('build_ml_model', ['master_df']):
+                        self.model, self.feature_cols, _ = self.obtain_model()
+                    self._render_deferred()
+            print(f"✓ Pipeline step '{until}' completed!\n")
+            
+        except Exception as e:
+            self.run_report.fail(e)
+            print(f"\n❌ ERROR: {str(e)}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            self._finish_run()
+    
+    def _save_datasets(self, names):
+        """Write DataFrame attributes to their DATASET_FILES in self.output_format."""
+        for name in names:
+            path = write_dataset(getattr(self, name), self.output_dir, DATASET_FILES[name],
+                                 self.output_format, self.n_jobs)
+            print(f"  ✓ Saved: {path}")
+    
+    def run_incremental_pipeline(self, state_dir=None):
+        """
+        Append-only delta run for daily data drops.
+        
+        The first call bootstraps the state with a full (cached) run. Later
+        calls only merge, featurize and predict the (date, state, district,
+        pincode) keys touched by new, changed or deleted source files (their
+        current rows and the rows they held before), replace those rows in
+        the persisted master dataset and update the running sums and
+        means behind the EDA, anomaly and summary reports. Deltas are scored
+        with the model-store version recorded in the state; run
+        run_complete_pipeline to retrain.
+        
+        Args:
+            state_dir (str): State location (default: outputs/incremental)
+        """
+        store = IncrementalStore(Path(state_dir) if state_dir else self.output_dir / 'incremental')
+        self.use_cache = True
+        
+        if not store.exists():
+            print("No incremental state found - bootstrapping with a full run...\n")
+            self.run_complete_pipeline()
+            # A failed bootstrap run leaves no scored master dataset to persist
+            if (self.model is not None and self.master_df is not None
+                    and 'predicted_bio_load' in self.master_df):
+                store.save(
+                    self.master_df, self._cube(),
+                    self.model_version, self.feature_cols, self._processed_file_hashes()
+                )
+                print(f"✓ Incremental state saved: {store.state_dir}\n")
+            return
+        
+        self._start_run('incremental')
+        try:
+            with self._stage('load_cleaned_datasets', outputs=SOURCE_FRAMES):
+                self.load_cleaned_datasets(track_removed=True)
+            
+            print("\nINCREMENTAL UPDATE")
+            print("-" * 80)
+            with self._stage('load_state') as stage:
+                state = store.load()
+                self.model, self.feature_cols, _ = self.load_stored_model(state['model_version'])
+                stage.set_outputs({'master_df': state['master']})
+            processed = self._processed_file_hashes()
+            delta_files = [key for key, digest in processed.items()
+                           if state['processed'].get(key) != digest]
+            deleted_files = [key for key in state['processed'] if key not in processed]
+            print(f"  ✓ New or changed source files: {len(delta_files):,} | deleted: {len(deleted_files):,}")
+            
+            delta_df = None
+            with self._stage('apply_delta', SOURCE_FRAMES) as stage:
+                master_df = state['master']
+                if delta_files or deleted_files:
+                    affected = key_index(pd.concat(
+                        [self.source_cache.read_entry(key)[KEY_COLUMNS] for key in delta_files]
+                        + self.removed_keys + [self._orphaned_keys(master_df)],
+                        ignore_index=True
+                    ).dropna(subset=['date']).drop_duplicates())
+                    print(f"  ✓ Affected keys: {len(affected):,}")
+                    
+                    # Re-merge, re-featurize and re-predict the affected keys only
+                    delta_df = self._merge_frames(*[
+                        df[key_index(df).isin(affected)]
+                        for df in (self.enrolment_df, self.demographic_df, self.biometric_df)
+                    ])
+                    self._add_features(delta_df)
+                    if len(delta_df):
+                        predictions, score_report = predict_batched(
+                            self.model, feature_matrix(delta_df, self.feature_cols),
+                            batch_rows=self.score_batch_rows, n_jobs=self.n_jobs
+                        )
+                        print(f"  ✓ {format_report(score_report)}")
+                    else:
+                        # Only retractions (e.g. a deleted file)
+                        predictions = np.zeros(0)
+                    delta_df['predicted_bio_load'] = predictions
+                    delta_df['predicted_bio_load'] = delta_df['predicted_bio_load'].clip(lower=0)
+                    
+                    replaced = key_index(master_df).isin(affected)
+                    removed_df = master_df[replaced]
+                    master_df = concat_preallocated([master_df[~replaced], delta_df])
+                    state['aggregates'] = update_aggregates(state['aggregates'], removed_df, delta_df)
+                    print(f"  ✓ Replaced {replaced.sum():,} rows with {len(delta_df):,} delta rows")
+                    
+                    delta_path = self.output_dir / 'predictions_biometric_load_delta.csv'
+                    delta_df[['date', 'state', 'district', 'pincode',
+                              'total_enrolments', 'total_updates', 'asi',
+                              'predicted_bio_load']].to_csv(delta_path, index=False)
+                    print(f"  ✓ Saved: {delta_path}\n")
+                
+                stage.set_outputs({'master_df': master_df, 'delta_df': delta_df})
+            
+            self.master_df = master_df
+            self.aggregates = state['aggregates']
+            
+            with self._stage('perform_eda', ['master_df']):
+                self.perform_eda()
+            with self._stage('detect_anomalies', ['master_df']):
+                self.detect_anomalies()
+            with self._stage('forecast_service_load'):
+                self.forecast_service_load()
+            with self._stage('save_outputs', ['master_df']):
+                self.save_outputs(include_datasets=False)
+            
+            with self._stage('save_state', ['master_df']):
+                store.save(master_df, self.aggregates, self.model_version, self.feature_cols, processed)
+            self._publish_query_index()
+            self._render_deferred()
+            print(f"✓ Incremental update completed: {self._total('n_records'):,.0f} records in state\n")
+            
+        except Exception as e:
+            self.run_report.fail(e)
+            print(f"\n❌ ERROR: {str(e)}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            self._finish_run()
+    
+    def _orphaned_keys(self, master_df):
+        """
+        Keys of master rows no source holds any more.
+        
+        Catches rows of deleted or changed files whose old cache entries
+        were already replaced (e.g. by an interrupted earlier delta run).
+        """
+        current = key_index(concat_preallocated([
+            df[KEY_COLUMNS] for df in (self.enrolment_df, self.demographic_df, self.biometric_df)
+        ]))
+        return master_df.loc[~key_index(master_df).isin(current), KEY_COLUMNS]
+    
+    def run_streaming_pipeline(self, partition_by='state', chunk_rows=500_000,
+                               max_training_rows=1_000_000):
+        """
+        Bounded-memory, partition-parallel execution of the full pipeline.
+        
+        Raw files are read in chunks and spilled per partition; each
+        partition is then cleaned, merged, featurized and scored on its own
+        (see aadhaar_streaming). The model is trained on a uniform sample of
+        at most max_training_rows eligible rows, and the reports are built
+        from mergeable per-partition aggregates. Peak memory depends on
+        chunk_rows, the partition scheme and max_training_rows, not on the
+        total size of the data.
+        
+        Files and partitions are processed across a pool of self.n_jobs
+        processes (n_jobs=1 runs serially). Partial results are combined in
+        sorted partition order, so output files are identical to a serial run.
+        
+        Args:
+            partition_by (str): 'state', 'month' or 'state_month'
+            chunk_rows (int): Rows read per CSV chunk
+            max_training_rows (int): Cap on the model training sample
+        """
+        spill_dir = self.output_dir / 'spill'
+        work_dir = spill_dir / 'work'
+        self._start_run('streaming', partition_by=partition_by, chunk_rows=chunk_rows,
+                        max_training_rows=max_training_rows)
+        try:
+            print("STREAMING EXECUTION")
+            print("-" * 80)
+            print(f"Partitioning by: {partition_by} | Chunk size: {chunk_rows:,} rows")
+            print(f"Worker processes: {self.n_jobs or os.cpu_count()}\n")
+            
+            shutil.rmtree(spill_dir, ignore_errors=True)
+            work_dir.mkdir(parents=True)
+            with self._stage('spill_partitions'):
+                spill, validation = spill_partitions(
+                    self.base_path, spill_dir, partition_by, chunk_rows, n_jobs=self.n_jobs,
+                    normalizer=self.normalizer, validator=self.validator
+                )
+            labels = sorted(set().union(*(pieces.keys() for pieces in spill.values())))
+            print(f"  ✓ Spilled sources into {len(labels):,} partitions")
+            for source, report in validation.items():
+                print(f"  {SOURCE_SCHEMAS[source]['label']}")
+                self._record_validation(source, report, quarantine_pieces(spill_dir, source))
+            print()
+            
+            # Pass 1: clean -> merge -> features per partition
+            print("Featurizing partitions...")
+            with self._stage('featurize_partitions') as stage:
+                featurized = []
+                priorities = np.empty(0)
+                # Reduce the sampling priorities as partitions finish
+                for result in imap_partitions(
+                    partial(featurize_partition, spill=spill, work_dir=work_dir,
+                            sample_rows=max_training_rows, output_format=self.output_format,
+                            dedup_policy=self.dedup_policy),
+                    labels, self.n_jobs
+                ):
+                    priorities = keep_top_priorities(priorities, result.pop('priorities'),
+                                                     max_training_rows)
+                    featurized.append(result)
+                stage.set_rows(rows_out=sum(result['rows'] for result in featurized))
+            for result in featurized:
+                print(f"  ✓ {result['label']}: {result['rows']:,} master records")
+            for source, schema in SOURCE_SCHEMAS.items():
+                self.dedup_report[source] = combine_reports(
+                    result['duplicates'][source] for result in featurized
+                )
+                print(f"  ✓ {schema['label']}: {dedup_summary(self.dedup_report[source])}")
+            print()
+            
+            # Train on the merged sample
+            self.master_df = merge_training_samples(work_dir, labels, priorities, max_training_rows)
+            with self._stage('build_ml_model', ['master_df']):
+                model, feature_cols, feature_importance = self.obtain_model()
+                self.model, self.feature_cols = model, feature_cols
+            self.master_df = None
+            
+            # Pass 2: score, write and aggregate per partition
+            print("\nScoring partitions...")
+            with self._stage('score_partitions') as stage:
+                scored = map_partitions(
+                    partial(score_partition, work_dir=work_dir, output_format=self.output_format),
+                    labels, self.n_jobs,
+                    initializer=init_scoring_worker,
+                    initargs=(model, feature_cols, self.score_batch_rows)
+                )
+                self.aggregates = combine_aggregates([result['aggregates'] for result in scored])
+                stage.set_rows(rows_out=sum(result['rows'] for result in scored))
+            print(f"  ✓ Scored {sum(result['rows'] for result in scored):,} records\n")
+            
+            with self._stage('write_outputs'):
+                self._write_streamed_outputs(featurized, scored, work_dir)
+            
+            with self._stage('perform_eda'):
+                self.perform_eda()
+            with self._stage('detect_anomalies'):
+                self.detect_anomalies()
+            with self._stage('forecast_service_load'):
+                self.forecast_service_load()
+            
+            district_predictions = self._level_stats('district', {
+                'predicted_bio_load': 'sum',
+                'total_enrolments': 'sum',
+                'asi': 'mean'
+            }).sort_values('predicted_bio_load', ascending=False).head(20)
+            print("TOP 20 DISTRICTS BY PREDICTED BIOMETRIC LOAD:")
+            print("-" * 60)
+            print(district_predictions.to_string(index=False))
+            print()
+            
+            with self._stage('save_outputs'):
+                self.save_outputs(include_datasets=False)
+            self._render_deferred()
+            print("✓ Streaming pipeline completed!\n")
+            
+        except Exception as e:
+            self.run_report.fail(e)
+            print(f"\n❌ ERROR: {str(e)}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+            self._finish_run()
+    
+    def _write_streamed_outputs(self, featurized, scored, work_dir):
+        """
+        Assemble the per-partition parts into the standard output datasets.
+        """
+        outputs = [
+            (DATASET_FILES[f'{source}_df'], featurized, featurized[0]['columns'][source])
+            for source in SOURCE_SCHEMAS
+        ] + [
+            (DATASET_FILES['master_df'], scored, scored[0]['columns']),
+            (PREDICTIONS_FILE, scored, prediction_columns(self.output_format, PREDICTION_COLUMNS)),
+        ]
+        for name, results, header in outputs:
+            path = assemble_parts(work_dir, self.output_dir, name, self.output_format,
+                                  [partition_slug(result['label']) for result in results], header)
+            print(f"  ✓ Saved: {path}")
+        print()
+    
+    def _start_run(self, pipeline, **settings):
+        """Begin the run report of a pipeline run."""
+        self.run_report = RunReport(
+            pipeline, self.output_dir / 'run_reports',
+            profile=self.profile_stages, trace_memory=self.trace_memory,
+            settings={'base_path': str(self.base_path), 'n_jobs': self.n_jobs,
+                      'use_cache': self.use_cache, 'retrain': self.retrain,
+                      'output_format': self.output_format, 'dedup_policy': self.dedup_policy,
+                      'validate': self.validator is not None,
+                      **settings}
+        )
+    
+    @contextmanager
+    def _stage(self, name, inputs=(), outputs=()):
+        """
+        Measure one pipeline stage.
+        
+        Args:
+            name (str): Stage name
+            inputs (list[str]): DataFrame attributes the stage consumes
+            outputs (list[str]): DataFrame attributes the stage produces
+        """
+        with self.run_report.stage(name, self._frames(inputs)) as record:
+            yield record
+            if outputs:
+                record.set_outputs(self._frames(outputs))
+    
+    def _frames(self, names):
+        return {name: getattr(self, name) for name in names}
+    
+    def _finish_run(self):
+        """Write the run report."""
+        report_path = self.run_report.write()
+        print(f"✓ Run report saved: {report_path}\n")
+    
+    def _processed_file_hashes(self):
+        """Content hash of every source file in the cache manifest."""
+        return {key: entry['hash'] for key, entry in self.source_cache.manifest['files'].items()}
 
 
 # =============================================================================
@@ -814,10 +1827,7 @@ class AadhaarIntelligenceSystem:
 # =============================================================================
 
 if __name__ == "__main__":
-    # Initialize the system
-    base_directory = r"d:\uidai hack"
-    
-    system = AadhaarIntelligenceSystem(base_directory)
+    # Command-line entry point (see aadhaar_cli for the subcommands)
+    from aadhaar_cli import main
     
-    # Run the complete pipeline
-    system.run_complete_pipeline()
+    raise SystemExit(main())
@@ -0,0 +1,313 @@
+"""
+Aadhaar Model Selection
+=======================
+
+Time-series cross-validated comparison of candidate service-load models.
+
+Candidates come from a configurable grid (DEFAULT_GRID, or a JSON list of
+{"name", "family", "params"} objects) over RandomForest,
+HistGradientBoosting and linear baselines.
+
+    - Folds are expanding windows over the distinct days of the training
+      rows: fold i trains on every day before block i + 1 and tests on
+      that block, so no model is scored on days older than its training data.
+    - Each fold's train/test matrices are written once to a fold cache as
+      float32 .npy files (training rows pre-shuffled) and memory-mapped by
+      every candidate and worker process, so they are built once per data
+      set, not once per candidate, and shared instead of copied.
+    - Successive halving: every candidate is first fitted on a small prefix
+      of each fold's shuffled training rows; after each round the best
+      1/eta of them - plus the cheapest candidate within the accuracy
+      target, so a cheap model is never dropped for a marginally better
+      expensive one - move on to eta times more rows, until the last round
+      fits on the full folds. HistGradientBoosting candidates can early-stop on
+      their own validation split.
+    - (candidate, fold) fits of a round run across a process pool.
+
+The report holds, per candidate and round, the cross-validated MAE and R²,
+the mean fit time and the prediction latency per row. select_candidate
+picks the cheapest full-data candidate (lowest prediction latency, then
+fit time) whose MAE meets the target, instead of the most accurate one.
+"""
+
+import hashlib
+import importlib
+import json
+import math
+import os
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aadhaar_model_store import data_fingerprint
+from aadhaar_parallel import map_partitions
+
+
+MODEL_FAMILIES = {
+    'random_forest': ('sklearn.ensemble', 'RandomForestRegressor'),
+    'hist_gradient_boosting': ('sklearn.ensemble', 'HistGradientBoostingRegressor'),
+    'ridge': ('sklearn.linear_model', 'Ridge'),
+    'linear': ('sklearn.linear_model', 'LinearRegression'),
+}
+
+# The configuration build_ml_model has always trained
+DEFAULT_CANDIDATE = {
+    'name': 'rf_100_d15', 'family': 'random_forest',
+    'params': {'n_estimators': 100, 'max_depth': 15, 'min_samples_split': 10,
+               'min_samples_leaf': 5, 'random_state': 42},
+}
+DEFAULT_GRID = [
+    DEFAULT_CANDIDATE,
+    {'name': 'rf_50_d10', 'family': 'random_forest',
+     'params': {'n_estimators': 50, 'max_depth': 10, 'min_samples_leaf': 5, 'random_state': 42}},
+    {'name': 'rf_25_d8', 'family': 'random_forest',
+     'params': {'n_estimators': 25, 'max_depth': 8, 'min_samples_leaf': 10, 'random_state': 42}},
+    {'name': 'hgb_200', 'family': 'hist_gradient_boosting',
+     'params': {'max_iter': 200, 'learning_rate': 0.1, 'early_stopping': True,
+                'n_iter_no_change': 10, 'random_state': 42}},
+    {'name': 'hgb_50', 'family': 'hist_gradient_boosting',
+     'params': {'max_iter': 50, 'learning_rate': 0.2, 'max_leaf_nodes': 15,
+                'early_stopping': False, 'random_state': 42}},
+    {'name': 'ridge', 'family': 'ridge', 'params': {'alpha': 1.0}},
+    {'name': 'linear', 'family': 'linear', 'params': {}},
+]
+# Bump whenever the layout of the fold cache changes
+FOLD_CACHE_VERSION = 1
+
+
+def make_estimator(candidate, n_jobs=None):
+    """
+    Unfitted estimator of a grid candidate (sklearn is imported here).
+
+    Args:
+        candidate (dict): {'name', 'family', 'params'}
+        n_jobs (int | None): Estimator threads, for families that have them
+    """
+    module, name = MODEL_FAMILIES[candidate['family']]
+    estimator = getattr(importlib.import_module(module), name)(**candidate.get('params', {}))
+    if n_jobs is not None and 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=n_jobs)
+    return estimator
+
+
+def preload_estimators(modules=()):
+    """
+    Import joblib and the module of every model family up front.
+
+    sklearn loads its submodules lazily, so two threads unpickling or
+    building estimators at once can deadlock on the import lock of the same
+    submodule (e.g. sklearn.ensemble._forest). Call this before starting
+    threads that train or load models.
+
+    Args:
+        modules (list[str]): Further modules to import
+    """
+    for module in ['joblib', *dict.fromkeys(module for module, _ in MODEL_FAMILIES.values()), *modules]:
+        importlib.import_module(module)
+
+
+def load_grid(path):
+    """
+    Read a candidate grid from a JSON file.
+
+    Raises:
+        ValueError: On unknown families or duplicate names
+    """
+    grid = json.loads(Path(path).read_text())
+    names = [candidate['name'] for candidate in grid]
+    unknown = sorted({candidate['family'] for candidate in grid} - set(MODEL_FAMILIES))
+    if unknown:
+        raise ValueError(f"Unknown model families {unknown}; expected one of {list(MODEL_FAMILIES)}")
+    if len(set(names)) != len(names):
+        raise ValueError("Candidate names in the grid must be unique")
+    return grid
+
+
+def time_series_folds(dates, n_folds=3):
+    """
+    Expanding-window folds over the distinct days of the rows.
+
+    Args:
+        dates (array-like): Date of every row
+        n_folds (int): Number of folds (the days are cut into n_folds + 1 blocks)
+
+    Returns:
+        list[tuple[np.ndarray, np.ndarray]]: (train rows, test rows) per fold
+    """
+    days = np.asarray(dates).astype('datetime64[D]')
+    blocks = np.array_split(np.unique(days), n_folds + 1)
+    if any(len(block) == 0 for block in blocks):
+        raise ValueError(f"{n_folds} time-series folds need at least {n_folds + 1} distinct days")
+    folds = []
+    for block in blocks[1:]:
+        train = np.flatnonzero(days < block[0])
+        test = np.flatnonzero((days >= block[0]) & (days <= block[-1]))
+        folds.append((train, test))
+    return folds
+
+
+class FoldCache:
+    """
+    Fold matrices on disk, keyed by the training data and fold layout.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Args:
+            cache_dir (str | Path): Directory holding one folder per data set
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def build(self, X, y, dates, n_folds=3, seed=42):
+        """
+        Write the fold matrices unless this data set is already cached.
+
+        Returns:
+            tuple[Path, list[dict]]: Fold directory and per-fold summaries
+            {'fold', 'train_rows', 'test_rows', 'test_start', 'test_end'}
+        """
+        key = json.dumps({'version': FOLD_CACHE_VERSION, 'folds': n_folds, 'seed': seed,
+                          'fingerprint': data_fingerprint(X, y),
+                          'days': [str(np.min(dates)), str(np.max(dates))]}, sort_keys=True)
+        directory = self.cache_dir / f"folds-{hashlib.sha1(key.encode()).hexdigest()[:12]}"
+        manifest_path = directory / 'folds.json'
+        if manifest_path.exists():
+            return directory, json.loads(manifest_path.read_text())
+
+        directory.mkdir(parents=True, exist_ok=True)
+        y = np.asarray(y, dtype=np.float64)
+        dates = np.asarray(dates).astype('datetime64[D]')
+        rng = np.random.default_rng(seed)
+        summaries = []
+        for fold, (train, test) in enumerate(time_series_folds(dates, n_folds)):
+            # Shuffled once, so every budget of successive halving is a prefix
+            train = rng.permutation(train)
+            arrays = {'X_train': X[train], 'y_train': y[train], 'X_test': X[test], 'y_test': y[test]}
+            for name, array in arrays.items():
+                np.save(directory / f'fold{fold}.{name}.npy', np.ascontiguousarray(array))
+            summaries.append({
+                'fold': fold, 'train_rows': int(len(train)), 'test_rows': int(len(test)),
+                'test_start': str(dates[test].min()), 'test_end': str(dates[test].max()),
+            })
+        tmp_path = manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(summaries, indent=2))
+        tmp_path.replace(manifest_path)
+        return directory, summaries
+
+
+def load_fold(directory, fold):
+    """Memory-mapped matrices of one cached fold."""
+    return {name: np.load(Path(directory) / f'fold{fold}.{name}.npy', mmap_mode='r')
+            for name in ('X_train', 'y_train', 'X_test', 'y_test')}
+
+
+def evaluate_task(task, fold_dir, model_jobs=1):
+    """
+    Fit one candidate on a prefix of one fold and score the fold's test days.
+
+    Args:
+        task (tuple): (candidate, fold, training rows)
+        fold_dir (Path): FoldCache directory
+        model_jobs (int): Estimator threads
+
+    Returns:
+        dict: candidate, fold, train_rows, mae, r2, fit_seconds, predict_us_per_row
+    """
+    candidate, fold, rows = task
+    data = load_fold(fold_dir, fold)
+    X_train, y_train = data['X_train'][:rows], data['y_train'][:rows]
+    X_test, y_test = data['X_test'], np.asarray(data['y_test'])
+
+    model = make_estimator(candidate, n_jobs=model_jobs)
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    predicted = model.predict(X_test)
+    predict_seconds = time.perf_counter() - started
+
+    residual = y_test - predicted
+    total = ((y_test - y_test.mean()) ** 2).sum()
+    return {
+        'candidate': candidate['name'], 'fold': fold, 'train_rows': int(len(X_train)),
+        'mae': float(np.abs(residual).mean()),
+        'r2': float(1 - (residual ** 2).sum() / total) if total > 0 else 0.0,
+        'fit_seconds': fit_seconds,
+        'predict_us_per_row': predict_seconds / max(len(X_test), 1) * 1e6,
+    }
+
+
+def successive_halving(grid, fold_dir, folds, n_jobs=None, eta=3, min_rows=5_000,
+                       tolerance=0.05, max_mae=None):
+    """
+    Cross-validate the grid with successive halving over training-row budgets.
+
+    Args:
+        grid (list[dict]): Candidates
+        fold_dir (Path): FoldCache directory
+        folds (list[dict]): Fold summaries from FoldCache.build
+        n_jobs (int | None): Worker processes for the (candidate, fold) fits
+        eta (int): Candidates kept per round: the best 1/eta of them, plus
+            the cheapest one meeting the target
+        min_rows (int): Smallest per-fold training budget
+        tolerance (float): Accuracy target as allowed MAE above the best
+            candidate of the round (0.05 = within 5%)
+        max_mae (float | None): Absolute MAE target (overrides tolerance)
+
+    Returns:
+        pd.DataFrame: One row per candidate and round with round,
+        candidate, family, train_rows, cv_mae, cv_r2, fit_seconds,
+        predict_us_per_row, meets_target
+    """
+    families = {candidate['name']: candidate['family'] for candidate in grid}
+    rounds = max(1, math.ceil(math.log(max(len(grid), 1), eta)) + 1)
+    smallest = min(fold['train_rows'] for fold in folds)
+    while rounds > 1 and smallest / eta ** (rounds - 1) < min_rows:
+        rounds -= 1
+    # Fits share the cores: threads inside one estimator, or one per worker
+    pooled = (n_jobs or os.cpu_count() or 1) > 1
+    worker = partial(evaluate_task, fold_dir=fold_dir, model_jobs=1 if pooled else -1)
+
+    alive = list(grid)
+    rows = []
+    for round_index in range(rounds):
+        share = eta ** -(rounds - 1 - round_index)
+        tasks = [(candidate, fold['fold'], max(1, min(fold['train_rows'],
+                                                    max(min_rows, int(fold['train_rows'] * share)))))
+                 for candidate in alive for fold in folds]
+        results = pd.DataFrame(map_partitions(worker, tasks, n_jobs))
+        scores = results.groupby('candidate', sort=False).agg(
+            train_rows=('train_rows', 'mean'), cv_mae=('mae', 'mean'), cv_r2=('r2', 'mean'),
+            fit_seconds=('fit_seconds', 'mean'), predict_us_per_row=('predict_us_per_row', 'mean'),
+        ).reset_index()
+        target = max_mae if max_mae is not None else scores['cv_mae'].min() * (1 + tolerance)
+        scores['meets_target'] = scores['cv_mae'] <= target
+        scores.insert(0, 'round', round_index)
+        scores.insert(2, 'family', scores['candidate'].map(families))
+        rows.append(scores)
+
+        keep = set(scores.nsmallest(math.ceil(len(scores) / eta), 'cv_mae')['candidate'])
+        keep.add(select_candidate(scores))
+        alive = [candidate for candidate in alive if candidate['name'] in keep]
+    return pd.concat(rows, ignore_index=True)
+
+
+def select_candidate(report):
+    """
+    Cheapest candidate of the last (full-data) round that meets the target.
+
+    Cost is prediction latency first, fit time second; when nothing meets
+    the target the most accurate candidate is returned.
+
+    Returns:
+        str: Candidate name
+    """
+    final = report[report['round'] == report['round'].max()]
+    eligible = final[final['meets_target']]
+    if eligible.empty:
+        return final.nsmallest(1, 'cv_mae')['candidate'].iloc[0]
+    return eligible.sort_values(['predict_us_per_row', 'fit_seconds'])['candidate'].iloc[0]
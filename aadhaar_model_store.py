@@ -0,0 +1,166 @@
+"""
+Aadhaar Model Store
+===================
+
+Versioned on-disk registry of fitted service-load models.
+
+Each saved version holds the serialized estimator plus a JSON record of its
+feature columns, the fingerprint of the data it was trained on and its
+evaluation metrics. ``latest.json`` points at the current version. Tree
+ensembles are also exported as a flat-array CompiledForest (.npz), which
+loads and scores with NumPy alone; joblib (and with it sklearn) is only
+imported when an estimator is saved or unpickled.
+
+The fingerprint (row count and per-column mean/std of the training matrix
+and target) lets the pipeline decide whether a stored model is still valid
+for the current data or whether it has drifted far enough to retrain.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from aadhaar_compiled_forest import CompiledForest, compile_forest
+
+
+def data_fingerprint(X, y):
+    """
+    Summarize a training set.
+
+    Args:
+        X (np.ndarray): Feature matrix
+        y (array-like): Target values
+
+    Returns:
+        dict: {'rows', 'feature_mean', 'feature_std', 'target_mean', 'target_std'}
+    """
+    X = np.asarray(X)
+    y = np.asarray(y, dtype=np.float64)
+    return {
+        'rows': int(len(X)),
+        'feature_mean': X.mean(axis=0, dtype=np.float64).tolist() if len(X) else [],
+        'feature_std': X.std(axis=0, dtype=np.float64).tolist() if len(X) else [],
+        'target_mean': float(y.mean()) if len(y) else 0.0,
+        'target_std': float(y.std()) if len(y) else 0.0,
+    }
+
+
+def fingerprint_drift(reference, current):
+    """
+    Distance between two training-set fingerprints.
+
+    The largest of: the relative change in row count, and the shift of any
+    feature or target mean measured in reference standard deviations.
+
+    Returns:
+        float: 0 for identical data, larger means more drift
+    """
+    if len(reference['feature_mean']) != len(current['feature_mean']):
+        return float('inf')
+
+    row_change = abs(current['rows'] - reference['rows']) / max(reference['rows'], 1)
+    means = np.array(reference['feature_mean'] + [reference['target_mean']])
+    stds = np.array(reference['feature_std'] + [reference['target_std']])
+    new_means = np.array(current['feature_mean'] + [current['target_mean']])
+    shifts = np.abs(new_means - means) / np.maximum(stds, 1e-9)
+    return float(max(row_change, shifts.max(initial=0.0)))
+
+
+class ModelStore:
+    """
+    Directory of versioned model artifacts.
+    """
+
+    def __init__(self, store_dir):
+        """
+        Args:
+            store_dir (str | Path): Directory holding the model versions
+        """
+        self.store_dir = Path(store_dir)
+        self.latest_path = self.store_dir / 'latest.json'
+
+    def exists(self):
+        return self.latest_path.exists()
+
+    def save(self, model, feature_cols, fingerprint, metrics, feature_importance=None):
+        """
+        Persist a fitted model as a new version and make it the latest.
+
+        Args:
+            model: Fitted estimator
+            feature_cols (list[str]): Model input columns, in order
+            fingerprint (dict): As returned by data_fingerprint
+            metrics (dict): Evaluation metrics
+            feature_importance (list[float] | None): Importance per feature,
+                for models without feature_importances_
+
+        Returns:
+            str: Version identifier
+        """
+        import joblib
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:8]
+        version = f"{datetime.now():%Y%m%dT%H%M%S}-{digest}"
+
+        model_file = f'model-{version}.joblib'
+        joblib.dump(model, self.store_dir / model_file)
+        try:
+            compiled_file = f'model-{version}.npz'
+            compile_forest(model).save(self.store_dir / compiled_file)
+        except (AttributeError, ValueError):
+            compiled_file = None
+        record = {
+            'version': version,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'model_file': model_file,
+            'compiled_file': compiled_file,
+            'model_class': type(model).__name__,
+            'feature_cols': list(feature_cols),
+            'fingerprint': fingerprint,
+            'metrics': metrics,
+            'feature_importance': feature_importance,
+        }
+        (self.store_dir / f'model-{version}.json').write_text(json.dumps(record, indent=2))
+
+        tmp_path = self.latest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({'version': version}))
+        tmp_path.replace(self.latest_path)
+        return version
+
+    def load_record(self, version=None):
+        """
+        Metadata of a version (default: latest), without loading the model.
+        """
+        if version is None:
+            version = json.loads(self.latest_path.read_text())['version']
+        return json.loads((self.store_dir / f'model-{version}.json').read_text())
+
+    def load(self, version=None):
+        """
+        Load a model version (default: latest).
+
+        Returns:
+            dict: The version record plus the estimator under 'model'
+        """
+        import joblib
+
+        record = self.load_record(version)
+        record['model'] = joblib.load(self.store_dir / record['model_file'])
+        return record
+
+    def load_compiled(self, version=None):
+        """
+        Load the CompiledForest export of a version (default: latest).
+
+        Returns:
+            dict: The version record plus the compiled forest under 'model'
+        """
+        record = self.load_record(version)
+        if not record.get('compiled_file'):
+            raise FileNotFoundError(f"Model {record['version']} has no compiled export")
+        record['model'] = CompiledForest.load(self.store_dir / record['compiled_file'])
+        return record
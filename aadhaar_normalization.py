@@ -0,0 +1,225 @@
+"""
+Aadhaar Region Normalization
+============================
+
+Dictionary-level cleaning of the state, district and pincode key columns.
+
+A few million rows carry only a few thousand distinct region names, so each
+column is reduced to its distinct values first (the categories of a
+categorical column, or a factorization of any other column), every distinct
+value is cleaned once, and the row codes are remapped in a single NumPy
+take. Cleaning a value:
+
+    - collapses runs of whitespace and strips the ends
+    - looks the case-folded result up in an alias map (variant spellings
+      and renamed regions: "Orissa" -> "Odisha")
+    - otherwise title-cases it, keeping "and", "of" and "the" lower-case
+      after the first word, so "ANDHRA PRADESH", "andhra  pradesh" and
+      "Andhra Pradesh" all become one region
+
+PIN codes are normalized to six-digit strings ("110001"); anything else
+("0", "11001", "N/A") becomes missing.
+
+A RegionNormalizer memoizes cleaned values, so the dictionaries are shared
+across the three sources and across the files of one run. The alias maps
+are configurable through a JSON file:
+
+    {"state": {"Orissa": "Odisha"}, "district": {"Gurgaon": "Gurugram"}}
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_STATE_ALIASES = {
+    'Andaman & Nicobar Islands': 'Andaman and Nicobar Islands',
+    'Chhatisgarh': 'Chhattisgarh',
+    'Dadra & Nagar Haveli': 'Dadra and Nagar Haveli',
+    'Daman & Diu': 'Daman and Diu',
+    'Jammu & Kashmir': 'Jammu and Kashmir',
+    'NCT of Delhi': 'Delhi',
+    'Orissa': 'Odisha',
+    'Pondicherry': 'Puducherry',
+    'Tamilnadu': 'Tamil Nadu',
+    'The Dadra and Nagar Haveli and Daman and Diu': 'Dadra and Nagar Haveli and Daman and Diu',
+    'Uttaranchal': 'Uttarakhand',
+    'West Bangal': 'West Bengal',
+    'Westbengal': 'West Bengal',
+}
+DEFAULT_DISTRICT_ALIASES = {}
+LOWERCASE_WORDS = {'and', 'of', 'the'}
+PINCODE_PATTERN = re.compile(r'[1-9][0-9]{5}')
+_WORD_START = re.compile(r"(?<![\w'])([^\W\d_])")
+
+
+def _alias_key(value):
+    return ' '.join(value.split()).casefold()
+
+
+def canonical_name(value, aliases):
+    """
+    Canonical spelling of one region name.
+
+    Args:
+        value: Raw name
+        aliases (dict[str, str]): Case-folded, whitespace-collapsed variant
+            -> canonical name
+
+    Returns:
+        str | None: Canonical name (None for blank values)
+    """
+    if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+        return None
+    text = ' '.join(str(value).split())
+    if not text:
+        return None
+    key = text.casefold()
+    if key in aliases:
+        return aliases[key]
+
+    words = _WORD_START.sub(lambda match: match.group(1).upper(), key).split(' ')
+    return ' '.join(
+        [words[0]] + [word.lower() if word.lower() in LOWERCASE_WORDS else word for word in words[1:]]
+    )
+
+
+def canonical_pincode(value):
+    """Six-digit string form of a PIN code, or None when it is not one."""
+    if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+        return None
+    text = str(value).strip()
+    if text.endswith('.0'):
+        text = text[:-2]
+    return text if PINCODE_PATTERN.fullmatch(text) else None
+
+
+def distinct_values(series):
+    """Row codes (-1 for missing) and distinct values of a column."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series)
+    return codes, uniques
+
+
+def _remap(codes, cleaned):
+    """
+    Re-encode row codes through the cleaned distinct values.
+
+    Returns:
+        tuple[np.ndarray, pd.Index]: New row codes (-1 for missing) over the
+        sorted distinct cleaned values
+    """
+    cleaned = pd.Index(cleaned, dtype=object)
+    new_codes, categories = pd.factorize(cleaned, sort=True)
+    lookup = np.append(new_codes, -1)
+    return lookup[np.where(codes >= 0, codes, len(cleaned))], pd.Index(categories, dtype=object)
+
+
+class RegionNormalizer:
+    """
+    Memoized canonicalization of state, district and pincode values.
+    """
+
+    def __init__(self, state_aliases=None, district_aliases=None):
+        """
+        Args:
+            state_aliases (dict[str, str] | None): Variant -> canonical state
+                name (default: DEFAULT_STATE_ALIASES)
+            district_aliases (dict[str, str] | None): Variant -> canonical
+                district name (default: DEFAULT_DISTRICT_ALIASES)
+        """
+        aliases = {
+            'state': DEFAULT_STATE_ALIASES if state_aliases is None else state_aliases,
+            'district': DEFAULT_DISTRICT_ALIASES if district_aliases is None else district_aliases,
+        }
+        self.aliases = {
+            col: {_alias_key(variant): ' '.join(name.split()) for variant, name in mapping.items()}
+            for col, mapping in aliases.items()
+        }
+        self._memo = {'state': {}, 'district': {}, 'pincode': {}}
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load the alias maps from a JSON file; missing keys keep the defaults.
+
+        Args:
+            path (str | Path): JSON file with optional "state" and "district" maps
+        """
+        config = json.loads(Path(path).read_text())
+        return cls(state_aliases=config.get('state'), district_aliases=config.get('district'))
+
+    def fingerprint(self):
+        """Stable hash of the alias maps, for cache invalidation."""
+        payload = json.dumps(self.aliases, sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+    def __getstate__(self):
+        # Workers of a process pool start with an empty memo
+        return {'aliases': self.aliases, '_memo': {col: {} for col in self._memo}}
+
+    def canonical_values(self, col, values):
+        """Cleaned form of each distinct value, memoized per column."""
+        memo = self._memo[col]
+        if col == 'pincode':
+            clean = canonical_pincode
+        else:
+            aliases = self.aliases[col]
+            clean = lambda value: canonical_name(value, aliases)  # noqa: E731
+
+        cleaned = []
+        for value in values:
+            if value not in memo:
+                memo[value] = clean(value)
+            cleaned.append(memo[value])
+        return cleaned
+
+    def normalize_names(self, series, col):
+        """
+        Canonical state or district names of a column.
+
+        Args:
+            series (pd.Series): Raw names (any dtype)
+            col (str): 'state' or 'district'
+
+        Returns:
+            pd.Series: Categorical over the sorted canonical names
+        """
+        codes, values = distinct_values(series)
+        codes, categories = _remap(codes, self.canonical_values(col, values))
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=categories), index=series.index, name=series.name
+        )
+
+    def normalize_pincodes(self, series):
+        """
+        Six-digit string PIN codes of a column; invalid values become missing.
+
+        Returns:
+            pd.Series: object dtype
+        """
+        codes, values = distinct_values(series)
+        cleaned = np.array(self.canonical_values('pincode', values) + [None], dtype=object)
+        return pd.Series(
+            cleaned[np.where(codes >= 0, codes, len(values))], index=series.index, name=series.name
+        )
+
+    def normalize(self, df):
+        """
+        Normalize the state, district and pincode columns of a frame in place.
+
+        Returns:
+            pd.DataFrame: df
+        """
+        df['state'] = self.normalize_names(df['state'], 'state')
+        df['district'] = self.normalize_names(df['district'], 'district')
+        df['pincode'] = self.normalize_pincodes(df['pincode'])
+        return df
+
+
+DEFAULT_NORMALIZER = RegionNormalizer()
@@ -0,0 +1,54 @@
+"""
+Aadhaar Parallel Map
+====================
+
+Order-preserving map of a function over work items, serially or across a
+process pool. Kept free of the pipeline modules (standard library only) so
+lightweight entry points such as report rendering can fan out without
+importing ingestion, merging or scoring.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def imap_partitions(fn, items, n_jobs=None, initializer=None, initargs=()):
+    """
+    Apply fn to every item, serially or across a process pool, lazily.
+
+    Results are yielded in the order of items regardless of completion
+    order, so the caller can reduce them as they arrive instead of holding
+    all of them. With n_jobs=1 everything runs in the calling process.
+
+    Args:
+        fn (callable): Module-level function (must be picklable)
+        items (list): Work items
+        n_jobs (int | None): Worker processes; None uses one per CPU core
+        initializer (callable | None): Run once per worker before any item
+        initargs (tuple): Arguments of initializer
+
+    Yields:
+        fn(item) for every item
+    """
+    workers = min(len(items), n_jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            yield fn(item)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                             initargs=initargs) as pool:
+        yield from pool.map(fn, items)
+
+
+def map_partitions(fn, items, n_jobs=None, initializer=None, initargs=()):
+    """
+    Apply fn to every item, serially or across a process pool.
+
+    Same arguments as imap_partitions.
+
+    Returns:
+        list: fn(item) for every item, in the order of items
+    """
+    return list(imap_partitions(fn, items, n_jobs, initializer, initargs))
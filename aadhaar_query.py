@@ -0,0 +1,386 @@
+"""
+Aadhaar Query Service
+=====================
+
+Millisecond answers to "ASI and predicted bio load of state / district /
+pincode X between dates A and B" without re-running the pipeline.
+
+build_query_index turns a scored master dataset into one index per level:
+
+    all        one entity (the whole dataset)
+    state      keyed by state
+    district   keyed by (state, district), so same-named districts of
+               different states stay apart
+    pincode    keyed by pincode
+
+Each level holds, per entity, the dates on which it has records and running
+(prefix) sums of the record count and every measure over those dates. A
+date-range query is two binary searches within the entity's dates and one
+subtraction of prefix-sum rows, independent of the range length. Entities
+are stored back to back (CSR layout), so inactive days cost no space.
+
+publish_query_index writes the index as a versioned .npz file and then
+atomically repoints latest.json at it. QueryService checks latest.json at
+most once per reload interval and swaps in a newly published index without
+a restart, so a pipeline run can refresh a running service.
+
+The service needs NumPy and the standard library only. It is used
+in-process (QueryService.query) or over HTTP on localhost (serve):
+
+    GET /query?level=district&state=Bihar&district=Patna&start=2025-03-01&end=2025-03-31
+    GET /keys?level=state
+    GET /health
+"""
+
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+
+QUERY_LEVELS = {
+    'all': [],
+    'state': ['state'],
+    'district': ['state', 'district'],
+    'pincode': ['pincode'],
+}
+QUERY_MEASURES = [
+    'total_enrolments', 'total_demo_updates', 'total_bio_updates', 'total_updates',
+    'predicted_bio_load', 'asi',
+]
+MEAN_MEASURES = ['asi']
+EPOCH = date(1970, 1, 1)
+MISSING_PINCODE = -1
+KEEP_VERSIONS = 2
+
+
+def build_query_index(master_df):
+    """
+    Per-level prefix sums over date of the query measures.
+
+    Args:
+        master_df (pd.DataFrame): Master rows with features and predictions
+
+    Returns:
+        dict[str, np.ndarray]: Flat arrays '<level>.<name>' ready for np.savez
+    """
+    import pandas as pd
+
+    days = master_df['date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    first_day = int(days.min())
+    span = int(days.max()) - first_day + 1
+    values = np.column_stack(
+        [np.ones(len(master_df))] + [master_df[col].to_numpy(dtype=np.float64) for col in QUERY_MEASURES]
+    )
+
+    arrays = {}
+    for level, key_cols in QUERY_LEVELS.items():
+        entity = np.zeros(len(master_df), dtype=np.int64)
+        dictionaries = []
+        for col in key_cols:
+            codes, uniques = pd.factorize(master_df[col], sort=True, use_na_sentinel=False)
+            entity = entity * len(uniques) + codes
+            dictionaries.append(np.asarray(uniques))
+        entity_codes, entity = np.unique(entity, return_inverse=True)
+        n_entities = len(entity_codes)
+
+        # (entity, day) cells, ordered by entity then day
+        cells, cell_of_row = np.unique(entity * span + (days - first_day), return_inverse=True)
+        sums = np.column_stack([
+            np.bincount(cell_of_row, weights=values[:, j], minlength=len(cells))
+            for j in range(values.shape[1])
+        ])
+        cell_entity = cells // span
+
+        arrays[f'{level}.offsets'] = np.searchsorted(cell_entity, np.arange(n_entities + 1))
+        arrays[f'{level}.days'] = (cells % span + first_day).astype(np.int32)
+        arrays[f'{level}.prefix'] = np.vstack([np.zeros(values.shape[1]), np.cumsum(sums, axis=0)])
+
+        # Key values of every entity, decoded from the mixed-radix code
+        remaining = entity_codes
+        for col, uniques in reversed(list(zip(key_cols, dictionaries))):
+            keys = uniques[remaining % len(uniques)]
+            remaining = remaining // len(uniques)
+            if col == 'pincode':
+                # Rows whose PIN code was blanked as malformed share the key -1
+                missing = pd.isna(keys)
+                pincodes = np.full(len(keys), MISSING_PINCODE, dtype=np.int64)
+                pincodes[~missing] = keys[~missing].astype(np.int64)
+                arrays[f'{level}.key.{col}'] = pincodes
+            else:
+                arrays[f'{level}.key.{col}'] = keys.astype(str)
+    return arrays
+
+
+def publish_query_index(master_df, index_dir):
+    """
+    Build the query index and make it the current one.
+
+    The index file is written under a new version name before latest.json
+    is replaced, so a running QueryService never sees a partial index.
+    Older versions beyond the last KEEP_VERSIONS are removed.
+
+    Args:
+        master_df (pd.DataFrame): Master rows with features and predictions
+        index_dir (str | Path): Directory served by QueryService
+
+    Returns:
+        str: Published version
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    version = f"{datetime.now():%Y%m%dT%H%M%S%f}"
+    index_file = f'query_index-{version}.npz'
+    np.savez(index_dir / index_file, **build_query_index(master_df))
+
+    manifest = {
+        'version': version,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'index_file': index_file,
+        'rows': int(len(master_df)),
+        'measures': QUERY_MEASURES,
+    }
+    tmp_path = index_dir / 'latest.tmp'
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    tmp_path.replace(index_dir / 'latest.json')
+
+    for old in sorted(index_dir.glob('query_index-*.npz'))[:-KEEP_VERSIONS]:
+        old.unlink()
+    return version
+
+
+def _parse_day(value):
+    """Day number of an ISO date (str, date or None)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return (value - EPOCH).days
+
+
+def _format_day(day):
+    return (EPOCH + timedelta(days=int(day))).isoformat()
+
+
+class QueryIndex:
+    """
+    One loaded index version.
+    """
+
+    def __init__(self, path, manifest):
+        self.version = manifest['version']
+        self.manifest = manifest
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+
+        self.levels = {}
+        for level, key_cols in QUERY_LEVELS.items():
+            keys = [arrays[f'{level}.key.{col}'].tolist() for col in key_cols]
+            self.levels[level] = {
+                'offsets': arrays[f'{level}.offsets'],
+                'days': arrays[f'{level}.days'],
+                'prefix': arrays[f'{level}.prefix'],
+                'keys': list(zip(*keys)) if key_cols else [()],
+                'lookup': {key: code for code, key in enumerate(zip(*keys))} if key_cols else {(): 0},
+            }
+        # District names that occur in a single state resolve without the state
+        districts = {}
+        for state, district in self.levels['district']['keys']:
+            districts.setdefault(district, []).append(state)
+        self.district_states = districts
+
+    def entity(self, level, key):
+        """
+        Entity code of a key.
+
+        Args:
+            level (str): One of QUERY_LEVELS
+            key (dict): Key column -> value; a district without its state is
+                accepted when the name is unique
+
+        Raises:
+            KeyError: Unknown key, or district name shared by several states
+        """
+        if level not in QUERY_LEVELS:
+            raise KeyError(f"Unknown level {level!r}; expected one of {list(QUERY_LEVELS)}")
+        key = dict(key)
+        if level == 'district' and key.get('state') is None and 'district' in key:
+            states = self.district_states.get(key['district'], [])
+            if not states:
+                raise KeyError(f"No district {key['district']!r} in the index")
+            if len(states) > 1:
+                raise KeyError(f"District {key['district']!r} exists in several states: "
+                               f"{', '.join(states)}; pass state as well")
+            key['state'] = states[0]
+
+        missing = [col for col in QUERY_LEVELS[level] if key.get(col) is None]
+        if missing:
+            raise KeyError(f"Level {level!r} needs {', '.join(missing)}")
+        values = tuple(int(key[col]) if col == 'pincode' else str(key[col])
+                       for col in QUERY_LEVELS[level])
+        try:
+            return self.levels[level]['lookup'][values]
+        except KeyError:
+            raise KeyError(f"No {level} {values if len(values) > 1 else values[0]!r} in the index") from None
+
+    def query(self, level, start=None, end=None, **key):
+        """
+        Totals and means of one entity over an inclusive date range.
+
+        Returns:
+            dict: level, key, first/last active date in range, records, the
+            summed measures and the mean ASI
+        """
+        code = self.entity(level, key)
+        table = self.levels[level]
+        lo, hi = table['offsets'][code], table['offsets'][code + 1]
+        days = table['days'][lo:hi]
+        start_day, end_day = _parse_day(start), _parse_day(end)
+        first = lo + (0 if start_day is None else int(np.searchsorted(days, start_day, 'left')))
+        last = lo + (len(days) if end_day is None else int(np.searchsorted(days, end_day, 'right')))
+
+        totals = table['prefix'][max(last, first)] - table['prefix'][first]
+        records = int(totals[0])
+        result = {
+            'level': level,
+            'key': dict(zip(QUERY_LEVELS[level], table['keys'][code])),
+            'start': start if start is None else str(start),
+            'end': end if end is None else str(end),
+            'first_date': _format_day(table['days'][first]) if last > first else None,
+            'last_date': _format_day(table['days'][last - 1]) if last > first else None,
+            'records': records,
+        }
+        for col, total in zip(QUERY_MEASURES, totals[1:]):
+            if col in MEAN_MEASURES:
+                result[col] = float(total / records) if records else None
+            else:
+                result[col] = float(total)
+        return result
+
+    def keys(self, level):
+        """All keys of a level as dicts."""
+        if level not in QUERY_LEVELS:
+            raise KeyError(f"Unknown level {level!r}; expected one of {list(QUERY_LEVELS)}")
+        return [dict(zip(QUERY_LEVELS[level], key)) for key in self.levels[level]['keys']]
+
+
+class QueryService:
+    """
+    Query front end over the latest published index, with hot reload.
+    """
+
+    def __init__(self, index_dir, reload_interval=1.0):
+        """
+        Args:
+            index_dir (str | Path): Directory written by publish_query_index
+            reload_interval (float): Seconds between checks for a newer index
+        """
+        self.index_dir = Path(index_dir)
+        self.reload_interval = reload_interval
+        self.index = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """
+        Load the index latest.json points at, if it is not loaded yet.
+
+        Returns:
+            bool: True if a new version was loaded
+        """
+        with self._lock:
+            self._checked = time.monotonic()
+            manifest_path = self.index_dir / 'latest.json'
+            if not manifest_path.exists():
+                raise FileNotFoundError(f"No query index published in {self.index_dir}")
+            manifest = json.loads(manifest_path.read_text())
+            if self.index is not None and manifest['version'] == self.index.version:
+                return False
+            self.index = QueryIndex(self.index_dir / manifest['index_file'], manifest)
+            return True
+
+    def current(self):
+        """The loaded index, reloaded first if a newer one may be published."""
+        if time.monotonic() - self._checked >= self.reload_interval:
+            self.reload()
+        return self.index
+
+    def query(self, level='all', start=None, end=None, **key):
+        """
+        ASI and load totals of one state/district/pincode over a date range.
+
+        Args:
+            level (str): 'all', 'state', 'district' or 'pincode'
+            start, end (str | date | None): Inclusive ISO date bounds (open if None)
+            **key: state=, district=, pincode= as the level requires
+
+        Returns:
+            dict: See QueryIndex.query
+        """
+        return self.current().query(level, start=start, end=end, **key)
+
+    def keys(self, level):
+        return self.current().keys(level)
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            if url.path == '/query':
+                body = self.service.query(**params)
+            elif url.path == '/keys':
+                body = self.service.keys(params.get('level', 'state'))
+            elif url.path == '/health':
+                index = self.service.current()
+                body = {'status': 'ok', 'version': index.version, 'rows': index.manifest['rows']}
+            else:
+                return self._send(404, {'error': f"Unknown path {url.path}"})
+        except KeyError as exc:
+            return self._send(404, {'error': exc.args[0]})
+        except (TypeError, ValueError) as exc:
+            return self._send(400, {'error': str(exc)})
+        self._send(200, body)
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(index_dir, host='127.0.0.1', port=8765, reload_interval=1.0):
+    """
+    Serve queries over HTTP until interrupted.
+
+    Args:
+        index_dir (str | Path): Directory written by publish_query_index
+        host (str): Interface to bind (localhost by default)
+        port (int): TCP port
+        reload_interval (float): Seconds between checks for a newer index
+    """
+    handler = type('QueryHandler', (_QueryHandler,), {
+        'service': QueryService(index_dir, reload_interval)
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"✓ Serving {index_dir} on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,279 @@
+"""
+Aadhaar Report Rendering
+========================
+
+Figures of the EDA, model and prediction sections, rendered from saved
+report data instead of from inside the compute path.
+
+Each pipeline section writes the small tables behind its figures (district,
+state and date statistics, feature importance, a test-set sample, district
+predictions, ...) as CSV files to a report-data directory. The functions
+here read those tables back and draw the figures, so rendering can happen
+
+    - inline, right after the section (the classic behaviour),
+    - deferred, as a separate step after the run, one process per figure, or
+    - never, for headless batch runs that only need the data outputs.
+
+matplotlib and seaborn are imported on first use, so a headless run never
+loads them.
+"""
+
+import warnings
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aadhaar_parallel import map_partitions
+
+
+PLOT_MODES = ['inline', 'deferred', 'none']
+
+# Figure name -> report tables it is drawn from
+FIGURES = {
+    'eda_comprehensive_analysis': ['district_stats', 'date_stats', 'update_totals'],
+    'state_wise_analysis': ['state_stats'],
+    'ml_model_performance': ['feature_importance', 'model_test_sample', 'model_metrics'],
+    'predictions_analysis': ['district_predictions', 'prediction_sample'],
+}
+DATE_TABLES = {'date_stats': ['date']}
+
+_PLOTTING = {}
+
+
+def _plotting():
+    """Import pyplot and seaborn on first use and apply the report style."""
+    if not _PLOTTING:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        # seaborn deprecation notices for the palette-only bar charts
+        warnings.filterwarnings('ignore', category=FutureWarning)
+        sns.set_style("whitegrid")
+        plt.rcParams['figure.figsize'] = (14, 8)
+        plt.rcParams['font.size'] = 10
+        _PLOTTING.update(plt=plt, sns=sns)
+    return _PLOTTING['plt'], _PLOTTING['sns']
+
+
+def save_report_table(report_dir, name, df):
+    """
+    Write one report table as <report_dir>/<name>.csv.
+
+    Returns:
+        Path: The written file
+    """
+    report_dir = Path(report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    path = report_dir / f'{name}.csv'
+    df.to_csv(path, index=False)
+    return path
+
+
+def load_report_table(report_dir, name):
+    """Read a table written by save_report_table."""
+    return pd.read_csv(Path(report_dir) / f'{name}.csv', parse_dates=DATE_TABLES.get(name, False))
+
+
+def available_figures(report_dir):
+    """Figures whose report tables are all present in report_dir."""
+    report_dir = Path(report_dir)
+    return [name for name, tables in FIGURES.items()
+            if all((report_dir / f'{table}.csv').exists() for table in tables)]
+
+
+# =============================================================================
+# FIGURES
+# =============================================================================
+
+def render_eda(data):
+    plt, sns = _plotting()
+    district_stats = data['district_stats']
+    date_stats = data['date_stats']
+    update_totals = data['update_totals']
+
+    fig = plt.figure(figsize=(20, 12))
+
+    # 1. District-wise Enrolment Bar Chart
+    ax1 = fig.add_subplot(2, 3, 1)
+    sns.barplot(data=district_stats, x='total_enrolments', y='district', palette='viridis', ax=ax1)
+    ax1.set_title('Top 20 Districts by Total Enrolments', fontsize=14, fontweight='bold')
+    ax1.set_xlabel('Total Enrolments', fontsize=12)
+    ax1.set_ylabel('District', fontsize=12)
+    ax1.ticklabel_format(style='plain', axis='x')
+
+    # 2. Biometric Updates by District
+    ax2 = fig.add_subplot(2, 3, 2)
+    sns.barplot(data=district_stats, x='total_bio_updates', y='district', palette='Reds_r', ax=ax2)
+    ax2.set_title('Top 20 Districts by Biometric Updates', fontsize=14, fontweight='bold')
+    ax2.set_xlabel('Total Biometric Updates', fontsize=12)
+    ax2.set_ylabel('District', fontsize=12)
+    ax2.ticklabel_format(style='plain', axis='x')
+
+    # 3. Demographic Updates by District
+    ax3 = fig.add_subplot(2, 3, 3)
+    sns.barplot(data=district_stats, x='total_demo_updates', y='district', palette='Blues_r', ax=ax3)
+    ax3.set_title('Top 20 Districts by Demographic Updates', fontsize=14, fontweight='bold')
+    ax3.set_xlabel('Total Demographic Updates', fontsize=12)
+    ax3.set_ylabel('District', fontsize=12)
+    ax3.ticklabel_format(style='plain', axis='x')
+
+    # 4. Date-wise Total Aadhaar Activity
+    ax4 = fig.add_subplot(2, 3, 4)
+    ax4.plot(date_stats['date'], date_stats['total_enrolments'], label='Enrolments', linewidth=2)
+    ax4.plot(date_stats['date'], date_stats['total_updates'], label='Updates', linewidth=2)
+    ax4.set_title('Date-wise Aadhaar Activity Trend', fontsize=14, fontweight='bold')
+    ax4.set_xlabel('Date', fontsize=12)
+    ax4.set_ylabel('Count', fontsize=12)
+    ax4.legend()
+    ax4.grid(True, alpha=0.3)
+    plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
+
+    # 5. ASI Comparison Across Districts
+    ax5 = fig.add_subplot(2, 3, 5)
+    asi_sorted = district_stats.sort_values('asi', ascending=False).head(20)
+    colors = ['green' if x > 0.7 else 'orange' if x > 0.5 else 'red' for x in asi_sorted['asi']]
+    sns.barplot(data=asi_sorted, x='asi', y='district', palette=colors, ax=ax5)
+    ax5.set_title('Aadhaar Stability Index (ASI) by District', fontsize=14, fontweight='bold')
+    ax5.set_xlabel('ASI (Higher = More Stable)', fontsize=12)
+    ax5.set_ylabel('District', fontsize=12)
+    ax5.axvline(x=0.7, color='green', linestyle='--', alpha=0.5, label='High Stability')
+    ax5.axvline(x=0.5, color='orange', linestyle='--', alpha=0.5, label='Medium Stability')
+    ax5.legend()
+
+    # 6. Update Distribution
+    ax6 = fig.add_subplot(2, 3, 6)
+    ax6.pie(update_totals['Count'], labels=update_totals['Type'], autopct='%1.1f%%',
+            colors=['#3498db', '#e74c3c'], startangle=90, textprops={'fontsize': 12})
+    ax6.set_title('Distribution of Update Types', fontsize=14, fontweight='bold')
+    return fig
+
+
+def render_state_analysis(data):
+    plt, _ = _plotting()
+    state_stats = data['state_stats']
+
+    fig, ax = plt.subplots(figsize=(14, 8))
+    x = np.arange(len(state_stats))
+    width = 0.35
+
+    ax.bar(x - width/2, state_stats['total_enrolments'], width, label='Enrolments', color='#2ecc71')
+    ax.bar(x + width/2, state_stats['total_updates'], width, label='Updates', color='#e74c3c')
+
+    ax.set_xlabel('State', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Count', fontsize=12, fontweight='bold')
+    ax.set_title('State-wise Enrolments vs Updates (Top 15 States)', fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(state_stats['state'], rotation=45, ha='right')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def render_model_performance(data):
+    plt, sns = _plotting()
+    feature_importance = data['feature_importance']
+    sample = data['model_test_sample']
+    metrics = data['model_metrics'].iloc[0]
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 6))
+
+    # Feature importance plot
+    sns.barplot(data=feature_importance.head(10), x='Importance', y='Feature',
+                palette='viridis', ax=ax1)
+    ax1.set_title('Top 10 Feature Importance', fontsize=14, fontweight='bold')
+    ax1.set_xlabel('Importance Score', fontsize=12)
+    ax1.set_ylabel('Feature', fontsize=12)
+
+    # Actual vs Predicted
+    ax2.scatter(sample['actual'], sample['predicted'], alpha=0.5, s=10, color='#3498db')
+    ax2.plot([metrics['actual_min'], metrics['actual_max']], [metrics['actual_min'], metrics['actual_max']],
+             'r--', lw=2, label='Perfect Prediction')
+    ax2.set_xlabel('Actual Bio Updates (17+)', fontsize=12)
+    ax2.set_ylabel('Predicted Bio Updates (17+)', fontsize=12)
+    ax2.set_title(f"Actual vs Predicted (Test Set)\nR² = {metrics['test_r2']:.4f}, MAE = {metrics['test_mae']:.2f}",
+                  fontsize=14, fontweight='bold')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+    return fig
+
+
+def render_predictions(data):
+    plt, sns = _plotting()
+    district_predictions = data['district_predictions']
+    scatter_data = data['prediction_sample']
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 6))
+
+    # Top districts by predicted load
+    sns.barplot(data=district_predictions, x='predicted_bio_load', y='district',
+                palette='Reds_r', ax=ax1)
+    ax1.set_title('Top 20 Districts by Predicted Biometric Service Load',
+                  fontsize=14, fontweight='bold')
+    ax1.set_xlabel('Predicted Biometric Load', fontsize=12)
+    ax1.set_ylabel('District', fontsize=12)
+
+    # Correlation: ASI vs Predicted Load
+    ax2.scatter(scatter_data['asi'], scatter_data['predicted_bio_load'],
+                alpha=0.3, s=20, color='#e74c3c')
+    ax2.set_xlabel('Aadhaar Stability Index (ASI)', fontsize=12)
+    ax2.set_ylabel('Predicted Biometric Load', fontsize=12)
+    ax2.set_title('ASI vs Predicted Service Load\n(Lower ASI → Higher Predicted Load)',
+                  fontsize=14, fontweight='bold')
+    ax2.grid(True, alpha=0.3)
+    return fig
+
+
+RENDERERS = {
+    'eda_comprehensive_analysis': render_eda,
+    'state_wise_analysis': render_state_analysis,
+    'ml_model_performance': render_model_performance,
+    'predictions_analysis': render_predictions,
+}
+
+
+def render_figure(name, report_dir, output_dir, dpi=300, fmt='png', data=None):
+    """
+    Draw one figure from its report tables and save it.
+
+    Args:
+        name (str): Key of FIGURES
+        report_dir (str | Path): Directory with the report tables
+        output_dir (str | Path): Directory to save the figure to
+        dpi (int): Resolution of raster formats
+        fmt (str): Image format understood by matplotlib (png, svg, pdf, ...)
+        data (dict | None): Tables already in memory (skips reading report_dir)
+
+    Returns:
+        Path: The saved figure
+    """
+    plt, _ = _plotting()
+    if data is None:
+        data = {table: load_report_table(report_dir, table) for table in FIGURES[name]}
+    fig = RENDERERS[name](data)
+    fig.tight_layout()
+    path = Path(output_dir) / f'{name}.{fmt}'
+    fig.savefig(path, dpi=dpi, format=fmt, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+
+def render_reports(report_dir, output_dir, names=None, dpi=300, fmt='png', n_jobs=1):
+    """
+    Render several figures, optionally one per worker process.
+
+    Args:
+        report_dir (str | Path): Directory with the report tables
+        output_dir (str | Path): Directory to save the figures to
+        names (list[str] | None): Figures to draw (default: all with data)
+        dpi (int): Resolution of raster formats
+        fmt (str): Image format
+        n_jobs (int | None): Worker processes (1 renders in this process)
+
+    Returns:
+        list[Path]: Saved figures, in the order of names
+    """
+    names = available_figures(report_dir) if names is None else list(names)
+    worker = partial(render_figure, report_dir=report_dir, output_dir=output_dir, dpi=dpi, fmt=fmt)
+    return map_partitions(worker, names, n_jobs)
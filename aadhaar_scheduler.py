@@ -0,0 +1,283 @@
+"""
+Aadhaar Stage Scheduler
+=======================
+
+Dependency-ordered execution of pipeline stages with checkpoints and resume.
+
+Each stage declares the system attributes it reads (inputs) and writes
+(outputs). A stage depends on the latest earlier stage producing each of
+its inputs, plus the stages named in 'after' (ordering for side effects
+such as shared output files). Stages are declared in an order that
+respects their dependencies, so the declaration order is a valid run
+order and cycles cannot be expressed. Stages whose dependencies are done
+run concurrently in a thread pool: EDA, anomaly detection and model
+training all read only the master dataset and its cube, so they overlap.
+
+After a stage succeeds, its outputs are pickled to the checkpoint store:
+
+    checkpoints/
+        manifest.json               run key and completed stages
+        <stage>/<attribute>.pkl
+
+A resumed run with the same run key (a hash of the source files and the
+settings) skips every completed stage whose dependencies are skipped too,
+and loads from the checkpoints only the attributes the remaining stages
+read. A different run key, or a run without resume, discards them.
+"""
+
+import json
+import pickle
+import shutil
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+
+CHECKPOINT_VERSION = 1
+
+
+class Stage:
+    """
+    One schedulable pipeline stage.
+    """
+
+    def __init__(self, name, fn, inputs=(), outputs=(), after=()):
+        """
+        Args:
+            name (str): Unique stage name (also the checkpoint folder)
+            fn (callable): Runs the stage; takes no arguments and works on
+                the attributes of the scheduled object
+            inputs (list[str]): Attributes the stage reads
+            outputs (list[str]): Attributes the stage writes (checkpointed)
+            after (list[str]): Earlier stages to wait for besides the
+                producers of the inputs
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+
+
+class CheckpointStore:
+    """
+    Pickled stage outputs and a manifest of the completed stages.
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str | Path): Checkpoint directory
+        """
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / 'manifest.json'
+        self.manifest = {'version': CHECKPOINT_VERSION, 'run_key': None, 'stages': {}}
+        self._lock = threading.Lock()
+
+    def open(self, run_key, resume=False):
+        """
+        Start a run: keep the checkpoints of the same run when resuming,
+        otherwise discard them.
+
+        Returns:
+            set[str]: Stages completed by the earlier run
+        """
+        manifest = None
+        if resume and self.manifest_path.exists():
+            manifest = json.loads(self.manifest_path.read_text())
+            if manifest.get('version') != CHECKPOINT_VERSION or manifest.get('run_key') != run_key:
+                manifest = None
+        if manifest is None:
+            self.clear()
+            manifest = {'version': CHECKPOINT_VERSION, 'run_key': run_key, 'stages': {}}
+        self.manifest = manifest
+        self._write_manifest()
+        return set(manifest['stages'])
+
+    def clear(self):
+        """Remove every checkpoint."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def discard(self, names):
+        """Forget the checkpoints of stages that are about to run again."""
+        with self._lock:
+            for name in names:
+                if self.manifest['stages'].pop(name, None) is not None:
+                    shutil.rmtree(self.directory / name, ignore_errors=True)
+            self._write_manifest()
+
+    def save(self, name, values):
+        """
+        Checkpoint the outputs of a completed stage.
+
+        Args:
+            name (str): Stage name
+            values (dict[str, object]): Output attribute -> value
+        """
+        stage_dir = self.directory / name
+        stage_dir.mkdir(parents=True, exist_ok=True)
+        for attr, value in values.items():
+            tmp_path = stage_dir / f'{attr}.tmp'
+            with open(tmp_path, 'wb') as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(stage_dir / f'{attr}.pkl')
+        with self._lock:
+            self.manifest['stages'][name] = {
+                'outputs': list(values),
+                'completed': datetime.now().isoformat(timespec='seconds'),
+            }
+            self._write_manifest()
+
+    def load(self, name, attr):
+        """Checkpointed value of one output of a stage."""
+        with open(self.directory / name / f'{attr}.pkl', 'rb') as handle:
+            return pickle.load(handle)
+
+    def _write_manifest(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self.manifest, indent=2, sort_keys=True))
+        tmp_path.replace(self.manifest_path)
+
+
+class StageScheduler:
+    """
+    Runs a list of stages as a dependency graph over one object's attributes.
+    """
+
+    def __init__(self, stages, store=None, max_workers=None):
+        """
+        Args:
+            stages (list[Stage]): Stages in dependency-respecting order
+            store (CheckpointStore | None): Checkpoints (None: no
+                checkpoints, every stage runs)
+            max_workers (int | None): Stages running at once (None: as
+                many as are ready)
+
+        Raises:
+            ValueError: On duplicate stage names or an 'after' naming a
+                stage that is not declared earlier
+        """
+        self.stages = list(stages)
+        self.store = store
+        self.max_workers = max_workers or len(self.stages) or 1
+        self.dependencies = {}
+        # stage -> {input attribute: producing stage}
+        self.sources = {}
+
+        producers = {}
+        for stage in self.stages:
+            if stage.name in self.dependencies:
+                raise ValueError(f"Duplicate stage name {stage.name!r}")
+            unknown = [name for name in stage.after if name not in self.dependencies]
+            if unknown:
+                raise ValueError(f"Stage {stage.name!r} runs after undeclared stages {unknown}")
+            self.sources[stage.name] = {attr: producers[attr] for attr in stage.inputs if attr in producers}
+            self.dependencies[stage.name] = set(stage.after) | set(self.sources[stage.name].values())
+            for attr in stage.outputs:
+                producers[attr] = stage.name
+
+    def plan(self, completed):
+        """
+        Stages that must run, given the stages completed earlier.
+
+        A stage runs when it did not complete, when one of its dependencies
+        runs, or when it overwrites an attribute that a running stage reads
+        from an earlier producer (so every restored value is consistent).
+
+        Returns:
+            set[str]: Names of the stages to run
+        """
+        order = {stage.name: index for index, stage in enumerate(self.stages)}
+        pending = {stage.name for stage in self.stages if stage.name not in completed}
+        changed = True
+        while changed:
+            changed = False
+            for stage in self.stages:
+                if stage.name in pending:
+                    continue
+                overwrites = any(
+                    attr in stage.outputs and order[producer] < order[stage.name]
+                    for name in pending for attr, producer in self.sources[name].items()
+                )
+                if overwrites or self.dependencies[stage.name] & pending:
+                    pending.add(stage.name)
+                    changed = True
+        return pending
+
+    def run(self, owner, run_key=None, resume=False, require=()):
+        """
+        Run the stages on an object, restoring completed ones when resuming.
+
+        The first failing stage stops new stages from starting; stages
+        already running finish (and are checkpointed) before the error is
+        re-raised, so a resumed run continues from there.
+
+        Args:
+            owner: Object whose attributes the stages read and write
+            run_key (str | None): Identity of the run's inputs and settings
+            resume (bool): Reuse the checkpoints of the same run key
+            require (list[str]): Attributes the caller reads after the run
+                (restored from their last producer even if no stage runs)
+
+        Returns:
+            dict: {'ran': [...], 'restored': [...]} stage names
+        """
+        completed = self.store.open(run_key, resume) if self.store is not None else set()
+        pending = self.plan(completed)
+        restored = [stage.name for stage in self.stages if stage.name not in pending]
+        if self.store is not None:
+            self.store.discard(pending)
+            for attr, producer in self._restore_points(pending, require).items():
+                setattr(owner, attr, self.store.load(producer, attr))
+
+        done = set(restored)
+        ran = []
+        submitted = set()
+        running = {}
+        failure = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                if failure is None:
+                    for stage in self.stages:
+                        if (stage.name in pending and stage.name not in submitted
+                                and self.dependencies[stage.name] <= done
+                                and len(running) < self.max_workers):
+                            submitted.add(stage.name)
+                            running[pool.submit(self._execute, stage, owner)] = stage
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        failure = failure or exc
+                        continue
+                    done.add(stage.name)
+                    ran.append(stage.name)
+
+        if failure is not None:
+            raise failure
+        return {'ran': ran, 'restored': restored}
+
+    def _restore_points(self, pending, require=()):
+        """Attribute -> completed stage to load it from, for the stages to run."""
+        order = {stage.name: index for index, stage in enumerate(self.stages)}
+        wanted = [self.sources[stage.name].items() for stage in self.stages if stage.name in pending]
+        last = {attr: stage.name for stage in self.stages for attr in stage.outputs}
+        wanted.append([(attr, last[attr]) for attr in require if attr in last])
+
+        points = {}
+        for sources in wanted:
+            for attr, producer in sources:
+                if producer not in pending and order[producer] > order.get(points.get(attr), -1):
+                    points[attr] = producer
+        return points
+
+    def _execute(self, stage, owner):
+        stage.fn()
+        if self.store is not None:
+            self.store.save(stage.name, {attr: getattr(owner, attr) for attr in stage.outputs})
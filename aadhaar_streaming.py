@@ -0,0 +1,333 @@
+"""
+Aadhaar Streaming (Out-of-Core) Execution
+=========================================
+
+Bounded-memory building blocks for run_streaming_pipeline.
+
+    1. Spill: every CSV drop is read in chunks of ``chunk_rows`` rows,
+       validated (failing rows are quarantined), cleaned and split by
+       partition (state, month or state+month). Each piece is
+       written to a small Parquet file in the spill directory.
+    2. Featurize: each partition's three sources are loaded, deduplicated,
+       merged and featurized on their own. Because the partition label is
+       derived from the merge keys, no key ever spans two partitions.
+    3. Score: each featurized partition is scored, written out and reduced
+       to mergeable aggregates.
+
+Output parts are written per partition by the workers and assembled by
+aadhaar_writers.assemble_parts in any of its output formats.
+
+Peak memory is bounded by the chunk size and the largest partition, not by
+the total dataset size; finer partition schemes lower it further.
+
+Every step is independent per file or per partition, so map_partitions
+(aadhaar_parallel) can fan them out across a process pool. Results are always collected and
+combined in sorted partition order, which makes the outputs of a parallel
+run byte-identical to those of a serial (n_jobs=1) run.
+"""
+
+import hashlib
+import re
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aadhaar_dedup import DEFAULT_DEDUP_POLICY, deduplicate
+from aadhaar_features import add_features, feature_matrix
+from aadhaar_incremental import compute_aggregates
+from aadhaar_ingestion import (
+    SOURCE_SCHEMAS, clean_source_frame, concat_preallocated,
+    empty_source_frame, read_source_chunks, source_files
+)
+from aadhaar_merge import merge_sources
+from aadhaar_parallel import map_partitions
+from aadhaar_scoring import SCORE_BATCH_ROWS, predict_batched
+from aadhaar_validation import combine_validation_reports
+from aadhaar_writers import prediction_columns, write_part
+
+
+PARTITION_SCHEMES = ['state', 'month', 'state_month']
+PREDICTION_COLUMNS = [
+    'date', 'state', 'district', 'pincode',
+    'total_enrolments', 'total_updates', 'asi',
+    'predicted_bio_load'
+]
+
+# Per-process state set up by a pool initializer (e.g. the fitted model)
+_WORKER_STATE = {}
+
+
+def partition_labels(df, partition_by):
+    """
+    Partition label of every row of a cleaned source frame.
+
+    Args:
+        df (pd.DataFrame): Cleaned source rows
+        partition_by (str): One of PARTITION_SCHEMES
+
+    Returns:
+        pd.Series: String labels aligned with df
+    """
+    if partition_by not in PARTITION_SCHEMES:
+        raise ValueError(f"partition_by must be one of {PARTITION_SCHEMES}, got {partition_by!r}")
+
+    state = df['state'].astype(object).fillna('unknown').astype(str)
+    month = df['date'].dt.strftime('%Y-%m').fillna('undated')
+    if partition_by == 'state':
+        return state
+    if partition_by == 'month':
+        return month
+    return state + '|' + month
+
+
+def partition_slug(label):
+    """
+    File-system safe, collision-free name for a partition label.
+    """
+    readable = re.sub(r'[^0-9A-Za-z]+', '_', label).strip('_')[:40]
+    digest = hashlib.md5(label.encode('utf-8')).hexdigest()[:8]
+    return f"{readable}-{digest}"
+
+
+def spill_file(task, spill_dir, partition_by, chunk_rows, normalizer=None, validator=None):
+    """
+    Read, validate, clean and partition one source file chunk by chunk.
+
+    Pieces are named <partition>.<file index>.<chunk index> so that loading
+    them back in name order preserves the keep-first deduplication order.
+
+    Args:
+        task (tuple[str, int, Path]): (source, file index, file path)
+        spill_dir (Path): Directory to write the pieces to
+        partition_by (str): One of PARTITION_SCHEMES
+        chunk_rows (int): Maximum rows held in memory per chunk
+        normalizer (RegionNormalizer | None): Region alias maps
+        validator (RuleSet | None): Validation rules; failing rows of every
+            chunk are written to <spill_dir>/quarantine
+
+    Returns:
+        tuple[str, dict[str, list[Path]], list[dict]]: Source, label ->
+        piece files, and the validation report of every chunk
+    """
+    source, file_index, path = task
+    source_dir = Path(spill_dir) / source
+    pieces = {}
+    reports = []
+    for chunk_index, chunk in enumerate(read_source_chunks(path, source, chunk_rows)):
+        if validator is not None:
+            chunk, quarantine, report = validator.validate(chunk, source)
+            reports.append(report)
+            if len(quarantine):
+                quarantine.to_parquet(
+                    Path(spill_dir) / 'quarantine' / f"{source}.{file_index:05d}.{chunk_index:06d}.parquet",
+                    index=False
+                )
+        chunk = clean_source_frame(chunk, source, normalizer)
+        for label, part in chunk.groupby(partition_labels(chunk, partition_by), sort=False):
+            piece = source_dir / f"{partition_slug(label)}.{file_index:05d}.{chunk_index:06d}.parquet"
+            part.to_parquet(piece, index=False)
+            pieces.setdefault(label, []).append(piece)
+    return source, pieces, reports
+
+
+def spill_partitions(base_path, spill_dir, partition_by, chunk_rows, n_jobs=None, normalizer=None,
+                     validator=None):
+    """
+    Spill every source file into partition pieces, one file per task.
+
+    Args:
+        base_path (str | Path): Base directory containing the data folders
+        spill_dir (Path): Directory to write the pieces to
+        partition_by (str): One of PARTITION_SCHEMES
+        chunk_rows (int): Maximum rows held in memory per chunk
+        n_jobs (int | None): Worker processes
+        normalizer (RegionNormalizer | None): Region alias maps
+        validator (RuleSet | None): Validation rules applied to every chunk
+
+    Returns:
+        tuple[dict, dict]: source -> label -> piece files, and source ->
+        combined validation report (empty without a validator)
+    """
+    (Path(spill_dir) / 'quarantine').mkdir(parents=True, exist_ok=True)
+    tasks = []
+    for source in SOURCE_SCHEMAS:
+        (Path(spill_dir) / source).mkdir(parents=True, exist_ok=True)
+        tasks.extend((source, index, path) for index, path in enumerate(source_files(base_path, source)))
+
+    spill = {source: {} for source in SOURCE_SCHEMAS}
+    reports = {source: [] for source in SOURCE_SCHEMAS}
+    worker = partial(spill_file, spill_dir=spill_dir, partition_by=partition_by, chunk_rows=chunk_rows,
+                     normalizer=normalizer, validator=validator)
+    for source, pieces, chunk_reports in map_partitions(worker, tasks, n_jobs):
+        for label, files in pieces.items():
+            spill[source].setdefault(label, []).extend(files)
+        reports[source].extend(chunk_reports)
+    validation = {source: combine_validation_reports(chunk_reports)
+                  for source, chunk_reports in reports.items()} if validator is not None else {}
+    return spill, validation
+
+
+def quarantine_pieces(spill_dir, source):
+    """Quarantined rows of a source written by spill_file, in file/chunk order."""
+    return [pd.read_parquet(piece)
+            for piece in sorted((Path(spill_dir) / 'quarantine').glob(f'{source}.*.parquet'))]
+
+
+def load_partition_source(spill, source, label, dedup_policy=DEFAULT_DEDUP_POLICY):
+    """
+    Load and deduplicate one source of one partition.
+
+    Returns:
+        tuple[pd.DataFrame, dict]: Cleaned frame and deduplication report
+    """
+    pieces = sorted(spill[source].get(label, []))
+    df = (concat_preallocated([pd.read_parquet(piece) for piece in pieces]) if pieces
+          else empty_source_frame(source))
+    return deduplicate(df, dedup_policy)
+
+
+def featurize_partition(label, spill, work_dir, sample_rows, seed=42, output_format='csv',
+                        dedup_policy=DEFAULT_DEDUP_POLICY):
+    """
+    Clean → merge → featurize one partition and persist the result.
+
+    Also draws this partition's share of the training sample: every
+    eligible row (bio_age_17_ > 0) gets a random priority from a generator
+    seeded by the partition label, and the ``sample_rows`` highest
+    priorities are written to the work directory. Only the priorities are
+    returned; the caller keeps the global top priorities as partitions
+    finish (keep_top_priorities) and reads back just the rows above the
+    final threshold (merge_training_samples). This gives a uniform sample
+    that does not depend on the order in which partitions are processed,
+    with O(sample_rows) memory in the parent.
+
+    Args:
+        label (str): Partition label
+        spill (dict): As returned by spill_partitions
+        work_dir (Path): Directory for per-partition outputs
+        sample_rows (int): Maximum training rows kept from this partition
+        seed (int): Base seed of the sampling priorities
+        output_format (str): Format of the cleaned-source parts (aadhaar_writers)
+        dedup_policy (str): One of aadhaar_dedup.DEDUP_POLICIES
+
+    Returns:
+        dict: {'label', 'rows', 'duplicates', 'columns', 'priorities'},
+        with 'duplicates' the deduplication report of every source and
+        'priorities' those of the sampled rows
+    """
+    slug = partition_slug(label)
+    work_dir = Path(work_dir)
+    cleaned = {}
+    duplicates = {}
+    for source in SOURCE_SCHEMAS:
+        cleaned[source], duplicates[source] = load_partition_source(spill, source, label, dedup_policy)
+        write_part(cleaned[source], work_dir, f'cleaned_{source}_data', output_format, slug)
+
+    master_df = merge_sources(list(cleaned.values()))
+    add_features(master_df)
+    master_df.to_parquet(work_dir / f"featured.{slug}.parquet", index=False)
+
+    eligible = master_df[master_df['bio_age_17_'] > 0]
+    label_seed = int(hashlib.md5(label.encode('utf-8')).hexdigest()[:8], 16)
+    rng = np.random.default_rng([seed, label_seed])
+    eligible = eligible.assign(_priority=rng.random(len(eligible)))
+    sample = eligible.nlargest(sample_rows, '_priority')
+    sample.to_parquet(work_dir / f"sample.{slug}.parquet", index=False)
+
+    return {
+        'label': label,
+        'rows': len(master_df),
+        'duplicates': duplicates,
+        'columns': {source: list(df.columns) for source, df in cleaned.items()},
+        'priorities': sample['_priority'].to_numpy(),
+    }
+
+
+def init_scoring_worker(model, feature_cols, batch_rows=SCORE_BATCH_ROWS):
+    """
+    Pool initializer: ship the fitted model to a worker once.
+
+    Partitions are scored in blocks of batch_rows on a single thread, the
+    pool already provides the parallelism.
+    """
+    _WORKER_STATE['model'] = model
+    _WORKER_STATE['feature_cols'] = feature_cols
+    _WORKER_STATE['batch_rows'] = batch_rows
+
+
+def score_partition(label, work_dir, output_format='csv'):
+    """
+    Score one featurized partition, write its outputs and aggregate it.
+
+    Uses the model installed by init_scoring_worker. The master and
+    prediction parts are written in output_format (aadhaar_writers).
+
+    Returns:
+        dict: {'label', 'rows', 'columns', 'aggregates'}
+    """
+    slug = partition_slug(label)
+    work_dir = Path(work_dir)
+    featured_path = work_dir / f"featured.{slug}.parquet"
+    master_df = pd.read_parquet(featured_path)
+
+    if len(master_df):
+        model, feature_cols = _WORKER_STATE['model'], _WORKER_STATE['feature_cols']
+        predictions, _ = predict_batched(model, feature_matrix(master_df, feature_cols),
+                                         batch_rows=_WORKER_STATE['batch_rows'])
+    else:
+        predictions = np.zeros(0)
+    master_df['predicted_bio_load'] = predictions
+    master_df['predicted_bio_load'] = master_df['predicted_bio_load'].clip(lower=0)
+
+    write_part(master_df, work_dir, 'master_dataset_with_asi', output_format, slug)
+    write_part(master_df[prediction_columns(output_format, PREDICTION_COLUMNS)], work_dir,
+               'predictions_biometric_load', output_format, slug)
+    featured_path.unlink()
+
+    return {
+        'label': label,
+        'rows': len(master_df),
+        'columns': list(master_df.columns),
+        'aggregates': compute_aggregates(master_df),
+    }
+
+
+def keep_top_priorities(priorities, new, sample_rows):
+    """
+    Running set of the ``sample_rows`` highest sampling priorities.
+
+    Args:
+        priorities (np.ndarray): Top priorities kept so far
+        new (np.ndarray): Priorities of a newly featurized partition
+
+    Returns:
+        np.ndarray: At most sample_rows priorities (unordered)
+    """
+    combined = np.concatenate([priorities, new])
+    if len(combined) > sample_rows:
+        combined = np.partition(combined, len(combined) - sample_rows)[-sample_rows:]
+    return combined
+
+
+def merge_training_samples(work_dir, labels, priorities, sample_rows):
+    """
+    Read back the ``sample_rows`` highest-priority rows of the partition samples.
+
+    Only rows at or above the lowest kept priority are loaded, one
+    partition sample at a time.
+
+    Args:
+        work_dir (Path): Directory the partition samples were written to
+        labels (list[str]): Partition labels
+        priorities (np.ndarray): As kept by keep_top_priorities
+        sample_rows (int): Training rows to keep
+    """
+    threshold = priorities.min() if len(priorities) else np.inf
+    samples = []
+    for label in labels:
+        sample = pd.read_parquet(Path(work_dir) / f"sample.{partition_slug(label)}.parquet")
+        samples.append(sample[sample['_priority'] >= threshold])
+    sample = pd.concat(samples, ignore_index=True).nlargest(sample_rows, '_priority')
+    return sample.drop(columns='_priority').reset_index(drop=True)
@@ -0,0 +1,209 @@
+"""
+Aadhaar Scalable Model Training
+===============================
+
+Training-set construction for build_ml_model that stays cheap as the
+master history grows.
+
+    - Rows are selected as integer indices into the float32 feature matrix
+      built by engineer_features; the train and test matrices are gathered
+      block by block straight into C-ordered float32 arrays (the layout the
+      tree models use internally), so neither a filtered frame copy nor a
+      masked copy of the full matrix, nor a conversion copy inside fit, is
+      ever made.
+    - Sampled mode draws at most ``max_rows`` training rows, stratified by
+      state x month: every stratum keeps its share of the eligible rows
+      (and at least ``min_per_stratum`` of them, or less when that many
+      per stratum would not fit in ``max_rows``), and each sampled row is
+      weighted by the inverse of its stratum's sampling rate, so small
+      states and quiet months are neither lost nor over-weighted.
+    - Histogram mode trains HistGradientBoosting on the (sampled) rows: it
+      bins every feature into at most 255 quantile bins held as uint8, so
+      each boosting iteration scans compact histograms instead of sorting
+      float columns.
+
+The data fingerprint used to detect drift is accumulated block-wise over
+the eligible rows, without materializing them. compare_training reports
+the accuracy/time trade-off of the chosen mode against a full-data fit.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from aadhaar_model_selection import make_estimator
+
+
+TRAINING_MODES = ['full', 'sampled', 'histogram']
+DEFAULT_TRAINING_ROWS = 2_000_000
+MIN_PER_STRATUM = 100
+GATHER_BLOCK_ROWS = 1 << 16
+
+HISTOGRAM_CANDIDATE = {
+    'name': 'hgb_hist', 'family': 'hist_gradient_boosting',
+    'params': {'max_iter': 200, 'learning_rate': 0.1, 'max_bins': 255,
+               'early_stopping': True, 'n_iter_no_change': 10, 'random_state': 42},
+}
+
+
+def eligible_rows(target):
+    """Rows with biometric updates (the training population)."""
+    return np.flatnonzero(np.asarray(target) > 0)
+
+
+def state_month_strata(df, rows):
+    """
+    Stratum code (state x month) of each of the given rows.
+
+    Categorical state columns reuse their codes; only the selected rows are
+    converted.
+    """
+    state = df['state']
+    if isinstance(state.dtype, pd.CategoricalDtype):
+        codes = state.cat.codes.to_numpy()[rows].astype(np.int64)
+    else:
+        codes = pd.factorize(state.to_numpy()[rows])[0].astype(np.int64)
+    month = df['month'].to_numpy()[rows].astype(np.int64)
+    return codes * 12 + (month - 1)
+
+
+def stratified_sample(rows, strata, max_rows, min_per_stratum=MIN_PER_STRATUM, seed=42):
+    """
+    Proportional stratified sample of rows, without replacement.
+
+    Args:
+        rows (np.ndarray): Candidate row indices
+        strata (np.ndarray): Stratum code of each candidate (non-negative)
+        max_rows (int): Maximum sample size
+        min_per_stratum (int): Rows kept from every stratum (or all of it),
+            lowered to max_rows // strata when the floors alone would not fit
+        seed (int): Random seed
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Sampled rows (ascending) and their
+        weights (inverse sampling rate of the stratum, mean 1)
+    """
+    if len(rows) <= max_rows:
+        return rows, np.ones(len(rows))
+
+    _, strata = np.unique(strata, return_inverse=True)
+    counts = np.bincount(strata)
+    # Per-stratum floor first, then the remaining budget in proportion to
+    # what is left of each stratum, so the quotas never exceed max_rows
+    floor = np.minimum(counts, min(min_per_stratum, max_rows // len(counts)))
+    rest = counts - floor
+    quota = floor + np.floor(rest * ((max_rows - floor.sum()) / rest.sum())).astype(np.int64)
+
+    # Within each stratum, keep the rows with the smallest random keys
+    keys = np.random.default_rng(seed).random(len(rows))
+    order = np.lexsort((keys, strata))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(len(order)) - starts[strata[order]]
+    chosen = np.sort(order[rank < quota[strata[order]]])
+
+    weights = counts[strata[chosen]] / quota[strata[chosen]]
+    return rows[chosen], weights / weights.mean()
+
+
+def gather_rows(matrix, rows, dtype=np.float32):
+    """
+    Copy the given rows of a (column-major) matrix into a new C-ordered array.
+
+    Rows are gathered in blocks, so the only temporaries are block-sized.
+    """
+    out = np.empty((len(rows), matrix.shape[1]), dtype=dtype)
+    for start in range(0, len(rows), GATHER_BLOCK_ROWS):
+        stop = min(start + GATHER_BLOCK_ROWS, len(rows))
+        out[start:stop] = matrix[rows[start:stop]]
+    return out
+
+
+def fingerprint_rows(matrix, rows, target):
+    """
+    data_fingerprint of matrix[rows] and target[rows], accumulated block-wise.
+
+    Returns:
+        dict: {'rows', 'feature_mean', 'feature_std', 'target_mean', 'target_std'}
+    """
+    n_rows, n_cols = len(rows), matrix.shape[1]
+    sums, squares = np.zeros(n_cols), np.zeros(n_cols)
+    for start in range(0, n_rows, GATHER_BLOCK_ROWS):
+        block = matrix[rows[start:start + GATHER_BLOCK_ROWS]].astype(np.float64)
+        sums += block.sum(axis=0)
+        squares += (block ** 2).sum(axis=0)
+    y = np.asarray(target, dtype=np.float64)[rows]
+    if not n_rows:
+        return {'rows': 0, 'feature_mean': [], 'feature_std': [], 'target_mean': 0.0, 'target_std': 0.0}
+    mean = sums / n_rows
+    return {
+        'rows': int(n_rows),
+        'feature_mean': mean.tolist(),
+        'feature_std': np.sqrt(np.maximum(squares / n_rows - mean ** 2, 0)).tolist(),
+        'target_mean': float(y.mean()),
+        'target_std': float(y.std()),
+    }
+
+
+def fit_timed(candidate, X, y, sample_weight=None, n_jobs=-1):
+    """
+    Fit a candidate, returning the model and the fit time in seconds.
+    """
+    model = make_estimator(candidate, n_jobs=n_jobs)
+    started = time.perf_counter()
+    model.fit(X, y, sample_weight=sample_weight)
+    return model, time.perf_counter() - started
+
+
+def evaluate(model, X, y):
+    """MAE, R² and prediction time of a fitted model on (X, y)."""
+    started = time.perf_counter()
+    predicted = model.predict(X)
+    seconds = time.perf_counter() - started
+    y = np.asarray(y, dtype=np.float64)
+    residual = y - predicted
+    total = ((y - y.mean()) ** 2).sum()
+    return {
+        'test_mae': float(np.abs(residual).mean()),
+        'test_r2': float(1 - (residual ** 2).sum() / total) if total > 0 else 0.0,
+        'predict_seconds': seconds,
+    }
+
+
+def compare_training(matrix, target, rows, test_rows, chosen, candidate, full_candidate):
+    """
+    Accuracy/time of the chosen training set against a full-data fit.
+
+    Both are scored on the same test rows; the full-data reference trains on
+    every eligible row outside them.
+
+    Args:
+        matrix (np.ndarray): Feature matrix
+        target (np.ndarray): Target of every row
+        rows (np.ndarray): Eligible rows
+        test_rows (np.ndarray): Held-out rows
+        chosen (dict): {'mode', 'train_rows', 'fit_seconds', 'model'} of the
+            model already fitted by the pipeline
+        candidate (dict): Grid candidate of the chosen model
+        full_candidate (dict): Candidate of the full-data reference
+
+    Returns:
+        pd.DataFrame: mode, model, train_rows, train_matrix_mb,
+        fit_seconds, test_mae, test_r2, predict_seconds
+    """
+    X_test, y_test = gather_rows(matrix, test_rows), target[test_rows]
+    full_rows = np.setdiff1d(rows, test_rows, assume_unique=True)
+    X_full = gather_rows(matrix, full_rows)
+    full_model, full_seconds = fit_timed(full_candidate, X_full, target[full_rows])
+
+    report = []
+    for mode, name, model, n_rows, seconds in [
+        ('full', full_candidate['name'], full_model, len(full_rows), full_seconds),
+        (chosen['mode'], candidate['name'], chosen['model'], chosen['train_rows'], chosen['fit_seconds']),
+    ]:
+        report.append({
+            'mode': mode, 'model': name, 'train_rows': int(n_rows),
+            'train_matrix_mb': n_rows * matrix.shape[1] * 4 / 2**20,
+            'fit_seconds': seconds, **evaluate(model, X_test, y_test),
+        })
+    return pd.DataFrame(report)
@@ -0,0 +1,271 @@
+"""
+Aadhaar Data Validation
+=======================
+
+Declarative, vectorized validation of raw source frames before cleaning.
+
+A rule set is a list of rules, each with an ID that is reported for the
+rows that break it. Every rule evaluates to one boolean mask over the
+frame (or streaming chunk), so a whole rule set costs one pass per column
+it touches. Name and PIN code rules are checked once per distinct value
+and mapped back to the rows through their codes. Rule types:
+
+    columns        the key and count columns of the source are present
+                   (otherwise every row fails this rule alone)
+    date           the date parses as DD-MM-YYYY
+    date_range     the date lies within [min, max] ('today' allowed)
+    numeric        the count columns are numbers (blank counts pass as 0)
+    non_negative   the count columns are not negative
+    pincode        the PIN code has six digits
+    required       the column is not blank
+    member         the canonical value (see aadhaar_normalization) is one
+                   of 'values'; rules without values are skipped
+
+Rows breaking any rule are quarantined with a 'violations' column listing
+the rule IDs ("DATE_RANGE;PINCODE_FORMAT"); valid rows continue to
+clean_source_frame with their dates and counts already parsed. A custom
+rule set is a JSON list of rules in the same form as DEFAULT_RULES.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aadhaar_ingestion import DATE_FORMAT, KEY_COLUMNS, SOURCE_SCHEMAS, empty_source_frame
+from aadhaar_normalization import DEFAULT_NORMALIZER, canonical_name, distinct_values
+
+
+KNOWN_STATES = [
+    'Andaman and Nicobar Islands', 'Andhra Pradesh', 'Arunachal Pradesh', 'Assam', 'Bihar',
+    'Chandigarh', 'Chhattisgarh', 'Dadra and Nagar Haveli', 'Dadra and Nagar Haveli and Daman and Diu',
+    'Daman and Diu', 'Delhi', 'Goa', 'Gujarat', 'Haryana', 'Himachal Pradesh', 'Jammu and Kashmir',
+    'Jharkhand', 'Karnataka', 'Kerala', 'Ladakh', 'Lakshadweep', 'Madhya Pradesh', 'Maharashtra',
+    'Manipur', 'Meghalaya', 'Mizoram', 'Nagaland', 'Odisha', 'Puducherry', 'Punjab', 'Rajasthan',
+    'Sikkim', 'Tamil Nadu', 'Telangana', 'Tripura', 'Uttar Pradesh', 'Uttarakhand', 'West Bengal',
+]
+
+DEFAULT_RULES = [
+    {'id': 'SCHEMA_COLUMNS', 'type': 'columns'},
+    {'id': 'DATE_FORMAT', 'type': 'date'},
+    {'id': 'DATE_RANGE', 'type': 'date_range', 'min': '2010-01-01', 'max': 'today'},
+    {'id': 'COUNT_NUMERIC', 'type': 'numeric'},
+    {'id': 'COUNT_NON_NEGATIVE', 'type': 'non_negative'},
+    {'id': 'PINCODE_FORMAT', 'type': 'pincode'},
+    {'id': 'STATE_REQUIRED', 'type': 'required', 'column': 'state'},
+    {'id': 'DISTRICT_REQUIRED', 'type': 'required', 'column': 'district'},
+    {'id': 'STATE_KNOWN', 'type': 'member', 'column': 'state', 'values': KNOWN_STATES},
+    {'id': 'DISTRICT_KNOWN', 'type': 'member', 'column': 'district', 'values': None},
+]
+RULE_TYPES = ['columns', 'date', 'date_range', 'numeric', 'non_negative', 'pincode', 'required', 'member']
+
+
+def load_rules(path):
+    """Read a JSON rule set (a list of rules like DEFAULT_RULES)."""
+    return json.loads(Path(path).read_text())
+
+
+def _timestamp(value):
+    return pd.Timestamp.today().normalize() if value == 'today' else pd.Timestamp(value)
+
+
+def quarantine_path(output_dir, source):
+    """Location of a source's quarantine file."""
+    return Path(output_dir) / 'quarantine' / f'{source}_quarantine.csv'
+
+
+def write_quarantine(frames, path):
+    """
+    Write the quarantined rows of a source, or remove a stale file.
+
+    Returns:
+        int: Rows written
+    """
+    frames = [frame for frame in frames if len(frame)]
+    path = Path(path)
+    if not frames:
+        path.unlink(missing_ok=True)
+        return 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    quarantine = pd.concat(frames, ignore_index=True)
+    quarantine.to_csv(path, index=False)
+    return len(quarantine)
+
+
+def combine_validation_reports(reports):
+    """Add up the reports of several validate calls (e.g. files or chunks)."""
+    combined = {'rows': 0, 'valid': 0, 'quarantined': 0, 'violations': {}}
+    for report in reports:
+        for key in ('rows', 'valid', 'quarantined'):
+            combined[key] += report[key]
+        for rule_id, count in report['violations'].items():
+            combined['violations'][rule_id] = combined['violations'].get(rule_id, 0) + count
+    return combined
+
+
+def validation_summary(report):
+    """One-line summary of a validation report."""
+    broken = ', '.join(f"{rule_id} {count:,}" for rule_id, count in report['violations'].items())
+    return f"Quarantined {report['quarantined']:,} of {report['rows']:,} records" + (
+        f" ({broken})" if broken else ""
+    )
+
+
+class RuleSet:
+    """
+    A validated list of rules, evaluated as vectorized masks.
+    """
+
+    def __init__(self, rules=None, normalizer=None):
+        """
+        Args:
+            rules (list[dict] | None): Rules (default: DEFAULT_RULES)
+            normalizer (RegionNormalizer | None): Canonicalizes names for
+                membership rules (default: DEFAULT_NORMALIZER)
+        """
+        self.rules = [dict(rule) for rule in (DEFAULT_RULES if rules is None else rules)]
+        seen = set()
+        for rule in self.rules:
+            if rule.get('type') not in RULE_TYPES:
+                raise ValueError(f"Rule {rule.get('id')!r}: type must be one of {RULE_TYPES}")
+            if not rule.get('id') or rule['id'] in seen:
+                raise ValueError(f"Rule IDs must be present and unique, got {rule.get('id')!r}")
+            seen.add(rule['id'])
+        self.normalizer = normalizer or DEFAULT_NORMALIZER
+        self._members = {
+            rule['id']: {canonical_name(value, self.normalizer.aliases[rule['column']])
+                         for value in rule['values']}
+            for rule in self.rules if rule['type'] == 'member' and rule.get('values')
+        }
+
+    def fingerprint(self):
+        """Stable hash of the rules, for cache invalidation."""
+        payload = json.dumps(self.rules, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+    def _value_mask(self, series, col, predicate):
+        """
+        Row mask of a predicate evaluated once per distinct canonical value.
+
+        Missing values are passed to the predicate as None.
+        """
+        codes, values = distinct_values(series)
+        canonical = self.normalizer.canonical_values(col, values) + [None]
+        per_value = np.array([bool(predicate(value)) for value in canonical])
+        return per_value[np.where(codes >= 0, codes, len(values))]
+
+    def evaluate(self, df, source):
+        """
+        Evaluate every rule on a raw source frame.
+
+        Args:
+            df (pd.DataFrame): Raw frame with normalized column names
+            source (str): Key of SOURCE_SCHEMAS
+
+        Returns:
+            tuple[dict[str, np.ndarray], dict[str, pd.Series]]: Failure mask
+            per rule ID and the parsed date/count columns
+        """
+        count_columns = SOURCE_SCHEMAS[source]['count_columns']
+        n_rows = len(df)
+        missing = [col for col in KEY_COLUMNS + count_columns if col not in df.columns]
+        if missing:
+            schema_rules = [rule['id'] for rule in self.rules if rule['type'] == 'columns']
+            return {(schema_rules or ['SCHEMA_COLUMNS'])[0]: np.ones(n_rows, dtype=bool)}, {}
+
+        parsed = {}
+        dates = df['date']
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, format=DATE_FORMAT, errors='coerce')
+        parsed['date'] = dates
+
+        counts = {}
+        for col in count_columns:
+            values = df[col]
+            counts[col] = values if pd.api.types.is_numeric_dtype(values) else pd.to_numeric(
+                values, errors='coerce'
+            )
+        parsed.update(counts)
+
+        masks = {}
+        for rule in self.rules:
+            kind = rule['type']
+            if kind == 'columns':
+                continue
+            if kind == 'date':
+                mask = dates.isna().to_numpy()
+            elif kind == 'date_range':
+                low, high = _timestamp(rule.get('min', '1900-01-01')), _timestamp(rule.get('max', 'today'))
+                mask = (dates.notna() & ((dates < low) | (dates > high))).to_numpy()
+            elif kind == 'numeric':
+                mask = np.zeros(n_rows, dtype=bool)
+                for col, values in counts.items():
+                    bad = (values.isna() & df[col].notna()).to_numpy()
+                    if bad.any():
+                        # Blank cells are counts of 0, not malformed values
+                        bad[bad] = df[col][bad].astype(str).str.strip().ne('').to_numpy()
+                        mask |= bad
+            elif kind == 'non_negative':
+                mask = np.zeros(n_rows, dtype=bool)
+                for values in counts.values():
+                    mask |= (values < 0).to_numpy()
+            elif kind == 'pincode':
+                mask = self._value_mask(df['pincode'], 'pincode', lambda value: value is None)
+            elif kind == 'required':
+                mask = self._value_mask(df[rule['column']], rule['column'], lambda value: value is None)
+            else:
+                members = self._members.get(rule['id'])
+                if not members:
+                    continue
+                mask = self._value_mask(
+                    df[rule['column']], rule['column'],
+                    lambda value: value is not None and value not in members
+                )
+            masks[rule['id']] = np.asarray(mask, dtype=bool)
+        return masks, parsed
+
+    def validate(self, df, source):
+        """
+        Split a raw source frame into valid and quarantined rows.
+
+        Args:
+            df (pd.DataFrame): Raw frame with normalized column names
+            source (str): Key of SOURCE_SCHEMAS
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame, dict]: Valid rows (dates and
+            counts parsed), quarantined rows as strings with their
+            'violations', and {'rows', 'valid', 'quarantined', 'violations'}
+        """
+        masks, parsed = self.evaluate(df, source)
+        rule_ids = list(masks)
+        failing = np.zeros(len(df), dtype=bool)
+        patterns = np.zeros(len(df), dtype=np.int64)
+        for bit, rule_id in enumerate(rule_ids):
+            failing |= masks[rule_id]
+            patterns |= masks[rule_id].astype(np.int64) << bit
+
+        # One label per distinct combination of broken rules
+        rows = np.flatnonzero(failing)
+        codes, combinations = pd.factorize(patterns[rows])
+        labels = np.array(
+            [';'.join(rule_id for bit, rule_id in enumerate(rule_ids) if combination >> bit & 1)
+             for combination in combinations],
+            dtype=object
+        )
+        quarantine = df.iloc[rows].astype('string').assign(violations=labels[codes])
+
+        if parsed:
+            valid = df.assign(**parsed)[~failing]
+        else:
+            valid = empty_source_frame(source)
+
+        report = {
+            'rows': len(df),
+            'valid': len(df) - len(rows),
+            'quarantined': len(rows),
+            'violations': {rule_id: int(mask.sum()) for rule_id, mask in masks.items() if mask.any()},
+        }
+        return valid, quarantine.reset_index(drop=True), report
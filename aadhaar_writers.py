@@ -0,0 +1,335 @@
+"""
+Aadhaar Output Writers
+======================
+
+Pluggable writers for the large output datasets (cleaned sources, master
+dataset, predictions):
+
+    csv       plain CSV, one file (the historical layout)
+    csv.gz    gzip-compressed CSV, one file; row blocks are formatted and
+              compressed in parallel and written as consecutive gzip
+              members, which every gzip reader (and pandas) reads as one
+              stream
+    parquet   a directory partitioned by state and month
+              (<name>.parquet/state=<state>/period=<YYYY-MM>/<part>.parquet,
+              state URI-encoded), zstd-compressed, string columns
+              dictionary-encoded; partitions are written in parallel and
+              readers load only the ones they filter on
+    feather   one Arrow IPC file, zstd-compressed, string columns
+              dictionary-encoded
+
+In every format but csv, predictions are stored as the slim
+SLIM_PREDICTION_COLUMNS set; the other columns are joined from the master
+dataset on PREDICTION_KEYS instead of being written twice.
+
+The streaming pipeline writes one part per pipeline partition from its
+workers (write_part) and assembles them once (assemble_parts): CSV and gzip
+parts are concatenated byte for byte, Parquet parts are already partition
+files of the final directory, and Feather parts are streamed batch by
+batch into the final file (with plain string columns, as the IPC file
+format allows only one dictionary per column).
+"""
+
+import gzip
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+
+OUTPUT_FORMATS = ['csv', 'csv.gz', 'parquet', 'feather']
+FORMAT_SUFFIXES = {'csv': '.csv', 'csv.gz': '.csv.gz', 'parquet': '.parquet', 'feather': '.feather'}
+PARTITION_COLUMNS = ['state', 'period']
+PREDICTION_KEYS = ['date', 'state', 'district', 'pincode']
+SLIM_PREDICTION_COLUMNS = PREDICTION_KEYS + ['predicted_bio_load']
+CSV_BLOCK_ROWS = 1 << 18
+GZIP_LEVEL = 1
+COMPRESSION = 'zstd'
+
+
+def output_path(output_dir, name, fmt):
+    """Path of a dataset (a directory for parquet)."""
+    return Path(output_dir) / f'{name}{FORMAT_SUFFIXES[fmt]}'
+
+
+def prediction_columns(fmt, full_columns):
+    """Columns of the predictions dataset in a format."""
+    return list(full_columns) if fmt == 'csv' else list(SLIM_PREDICTION_COLUMNS)
+
+
+def _workers(n_jobs):
+    return n_jobs if n_jobs and n_jobs > 0 else (os.cpu_count() or 1)
+
+
+def _dictionary_encoded(df):
+    """Shallow copy with the string columns as categoricals (used categories only)."""
+    encoded = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            encoded[col] = df[col].cat.remove_unused_categories()
+        elif pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+            encoded[col] = df[col].astype('category')
+    return df.assign(**encoded) if encoded else df
+
+
+def _remove_path(path):
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+# =============================================================================
+# FORMATS
+# =============================================================================
+
+def write_csv_gz(df, path, n_jobs=None, header=True):
+    """
+    Write df as gzip-compressed CSV, one gzip member per block of rows.
+
+    Blocks are formatted and compressed in a thread pool (zlib releases the
+    GIL) and written in order.
+    """
+    starts = range(0, max(len(df), 1), CSV_BLOCK_ROWS)
+
+    def compress(start):
+        block = df.iloc[start:start + CSV_BLOCK_ROWS]
+        text = block.to_csv(index=False, header=header and start == 0)
+        return gzip.compress(text.encode('utf-8'), compresslevel=GZIP_LEVEL, mtime=0)
+
+    with open(path, 'wb') as out, ThreadPoolExecutor(_workers(n_jobs)) as pool:
+        for member in pool.map(compress, starts):
+            out.write(member)
+
+
+def write_feather(df, path):
+    """Write df as one zstd-compressed Feather (Arrow IPC) file."""
+    _dictionary_encoded(df).reset_index(drop=True).to_feather(path, compression=COMPRESSION)
+
+
+def partition_groups(df):
+    """
+    Rows of every (state, month) partition of df.
+
+    Returns:
+        list[tuple[str, str, np.ndarray]]: state, period (YYYY-MM) and row
+        positions, in sorted partition order
+    """
+    state_codes, states = pd.factorize(df['state'].astype(str), sort=True)
+    months = df['date'].to_numpy().astype('datetime64[M]')
+    month_values, month_codes = np.unique(months, return_inverse=True)
+    periods = [str(value) if not np.isnat(value) else 'unknown' for value in month_values]
+
+    codes = state_codes.astype(np.int64) * len(month_values) + month_codes
+    order = np.argsort(codes, kind='stable')
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    groups = []
+    for rows in np.split(order, bounds) if len(order) else []:
+        code = codes[rows[0]]
+        groups.append((states[code // len(month_values)], periods[code % len(month_values)], rows))
+    return groups
+
+
+def write_parquet_partitions(df, directory, n_jobs=None, part='part-0'):
+    """
+    Write df into a state/month partitioned Parquet directory.
+
+    The partition columns are encoded in the paths, not in the files.
+    Files of an existing directory are kept unless they share the part name,
+    so several writers can fill one directory with distinct parts.
+
+    Returns:
+        int: Number of partition files written
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    directory = Path(directory)
+    groups = partition_groups(df)
+    data = df.drop(columns='state')
+
+    def write(group):
+        state, period, rows = group
+        folder = directory / f"state={quote(state, safe='')}" / f'period={period}'
+        folder.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(_dictionary_encoded(data.iloc[rows]), preserve_index=False)
+        pq.write_table(table, folder / f'{part}.parquet', compression=COMPRESSION)
+
+    with ThreadPoolExecutor(_workers(n_jobs)) as pool:
+        list(pool.map(write, groups))
+    return len(groups)
+
+
+def write_dataset(df, output_dir, name, fmt='csv', n_jobs=None):
+    """
+    Write a dataset in one of OUTPUT_FORMATS, replacing a previous copy.
+
+    Args:
+        df (pd.DataFrame): Data
+        output_dir (Path): Output directory
+        name (str): Dataset name (file name without suffix)
+        fmt (str): Output format
+        n_jobs (int | None): Writer threads (default: all cores)
+
+    Returns:
+        Path: The written file or directory
+    """
+    path = output_path(output_dir, name, fmt)
+    _remove_path(path)
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+    elif fmt == 'csv.gz':
+        write_csv_gz(df, path, n_jobs)
+    elif fmt == 'parquet':
+        write_parquet_partitions(df, path, n_jobs)
+    elif fmt == 'feather':
+        write_feather(df, path)
+    else:
+        raise ValueError(f"fmt must be one of {OUTPUT_FORMATS}, got {fmt!r}")
+    return path
+
+
+def read_dataset(output_dir, name, fmt='csv', states=None, periods=None, columns=None):
+    """
+    Read a dataset written by write_dataset.
+
+    With parquet, only the partitions of the given states/periods
+    (YYYY-MM) are read; for the other formats they filter after reading.
+
+    Returns:
+        pd.DataFrame: The (filtered) dataset
+    """
+    path = output_path(output_dir, name, fmt)
+    if fmt == 'parquet':
+        filters = [(col, 'in', list(values)) for col, values in
+                   (('state', states), ('period', periods)) if values is not None]
+        return pd.read_parquet(path, columns=columns, filters=filters or None)
+
+    if fmt == 'feather':
+        df = pd.read_feather(path, columns=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns, parse_dates=['date'])
+    if states is not None:
+        df = df[df['state'].isin(states)]
+    if periods is not None:
+        df = df[df['date'].dt.strftime('%Y-%m').isin(periods)]
+    return df.reset_index(drop=True)
+
+
+# =============================================================================
+# STREAMED PARTS
+# =============================================================================
+
+def part_path(part_dir, name, fmt, slug):
+    """Location of one pipeline partition's part of a dataset."""
+    if fmt == 'parquet':
+        return Path(part_dir) / f'{name}.parquet'
+    suffix = {'csv': '.csv', 'csv.gz': '.csv.gz', 'feather': '.arrow'}[fmt]
+    return Path(part_dir) / f'{name}.{slug}{suffix}'
+
+
+def write_part(df, part_dir, name, fmt, slug):
+    """
+    Write one pipeline partition's rows of a dataset (without a header).
+
+    Runs inside a streaming worker, so it writes single-threaded.
+    """
+    path = part_path(part_dir, name, fmt, slug)
+    if fmt == 'csv':
+        df.to_csv(path, index=False, header=False)
+    elif fmt == 'csv.gz':
+        write_csv_gz(df, path, n_jobs=1, header=False)
+    elif fmt == 'parquet':
+        write_parquet_partitions(df, path, n_jobs=1, part=slug)
+    else:
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Categoricals hold partition-specific dictionaries; store their values
+        table = table.cast(pa.schema([
+            field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+            for field in table.schema
+        ]))
+        with pa.OSFile(str(path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def concat_csv_parts(header, parts, destination):
+    """
+    Concatenate header-less CSV parts into one file, in the order given,
+    and delete the parts.
+
+    Args:
+        header (list[str]): Column names
+        parts (list[Path]): Part files
+        destination (Path): Output CSV
+    """
+    with open(destination, 'w', newline='', encoding='utf-8') as out:
+        out.write(','.join(header) + '\n')
+        for part in parts:
+            with open(part, 'r', newline='', encoding='utf-8') as handle:
+                shutil.copyfileobj(handle, out)
+            Path(part).unlink()
+
+
+def assemble_parts(part_dir, output_dir, name, fmt, slugs, header):
+    """
+    Combine the parts written by write_part into the final dataset,
+    in the order of slugs, and delete them.
+
+    Args:
+        part_dir (Path): Directory of the parts
+        output_dir (Path): Output directory
+        name (str): Dataset name
+        fmt (str): Output format
+        slugs (list[str]): Partition slugs
+        header (list[str]): Column names
+
+    Returns:
+        Path: The written file or directory
+    """
+    path = output_path(output_dir, name, fmt)
+    _remove_path(path)
+    parts = [part_path(part_dir, name, fmt, slug) for slug in slugs]
+
+    if fmt == 'csv':
+        concat_csv_parts(header, parts, path)
+    elif fmt == 'csv.gz':
+        with open(path, 'wb') as out:
+            out.write(gzip.compress((','.join(header) + '\n').encode('utf-8'),
+                                    compresslevel=GZIP_LEVEL, mtime=0))
+            for part in parts:
+                with open(part, 'rb') as handle:
+                    shutil.copyfileobj(handle, out)
+                part.unlink()
+    elif fmt == 'parquet':
+        if parts[0].exists():
+            shutil.move(str(parts[0]), str(path))
+        else:
+            path.mkdir()
+    else:
+        import pyarrow as pa
+
+        writer = schema = None
+        options = pa.ipc.IpcWriteOptions(compression=COMPRESSION)
+        try:
+            for index, part in enumerate(parts):
+                with pa.OSFile(str(part)) as source:
+                    table = pa.ipc.open_file(source).read_all()
+                part.unlink()
+                # Empty partitions may carry null-typed columns; skip them
+                # unless every partition is empty
+                if not table.num_rows and (writer is not None or index < len(parts) - 1):
+                    continue
+                if writer is None:
+                    schema = table.schema
+                    writer = pa.ipc.new_file(str(path), schema, options=options)
+                writer.write_table(table.cast(schema))
+        finally:
+            if writer is not None:
+                writer.close()
+    return path
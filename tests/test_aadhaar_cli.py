@@ -0,0 +1,23 @@
+import json
+from types import SimpleNamespace
+
+from aadhaar_cli import _exit_code
+from aadhaar_instrumentation import RunReport
+
+
+def test_exit_code_fails_on_error_between_stages(tmp_path):
+    report = RunReport('complete', tmp_path)
+    with report.stage('prepare_sources'):
+        pass
+    assert _exit_code(SimpleNamespace(run_report=report)) == 0
+
+    try:
+        raise KeyError('aggregates')
+    except KeyError as exc:
+        report.fail(exc)
+
+    assert _exit_code(SimpleNamespace(run_report=report)) == 1
+    written = json.loads(report.write().read_text())
+    assert written['status'] == 'error'
+    assert written['failed_stage'] is None
+    assert written['error'] == "KeyError: 'aggregates'"
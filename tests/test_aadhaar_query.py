@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from aadhaar_query import MISSING_PINCODE, QUERY_MEASURES, QueryService, build_query_index, publish_query_index
+
+
+def _master(pincodes):
+    n_rows = len(pincodes)
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2025-03-01', '2025-03-02', '2025-03-02'][:n_rows]),
+        'state': pd.Categorical(['Bihar'] * n_rows),
+        'district': pd.Categorical(['Patna'] * n_rows),
+        'pincode': pd.Series(pincodes, dtype=object),
+    })
+    for col in QUERY_MEASURES:
+        df[col] = 1.0
+    return df
+
+
+def test_build_query_index_keeps_rows_with_missing_pincode():
+    arrays = build_query_index(_master(['800001', None, '800001']))
+
+    keys = arrays['pincode.key.pincode']
+    assert keys.dtype == np.int64
+    assert sorted(keys.tolist()) == [MISSING_PINCODE, 800001]
+    assert arrays['all.prefix'][-1][0] == 3
+
+
+def test_query_by_pincode_with_missing_pincodes_published(tmp_path):
+    publish_query_index(_master(['800001', np.nan, '800001']), tmp_path)
+
+    result = QueryService(tmp_path).query('pincode', pincode='800001')
+    assert result['records'] == 2
+    assert result['first_date'] == '2025-03-01'
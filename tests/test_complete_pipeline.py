@@ -0,0 +1,23 @@
+from aadhaar_benchmark import generate_synthetic_data
+from aadhaar_intelligence_system import AadhaarIntelligenceSystem
+
+
+def _tiny_dataset(path):
+    generate_synthetic_data(path, rows=3_000, n_pincodes=40, n_days=90, n_states=4,
+                            n_districts=8, file_rows=1_500, seed=1)
+
+
+def test_complete_pipeline_runs_twice_with_concurrent_stages(tmp_path):
+    _tiny_dataset(tmp_path)
+
+    # The second run reuses the stored model: unpickling it overlaps the forecast
+    for _ in range(2):
+        system = AadhaarIntelligenceSystem(tmp_path, plots='none')
+        system.run_complete_pipeline()
+        assert system.run_report.error is None
+
+        statuses = {stage['stage']: stage['status'] for stage in system.run_report.stages}
+        assert statuses['build_ml_model'] == 'ok'
+        assert statuses['forecast_service_load'] == 'ok'
+        assert set(statuses.values()) == {'ok'}
+        assert system.stage_report['restored'] == []